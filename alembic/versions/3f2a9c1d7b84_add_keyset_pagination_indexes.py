@@ -0,0 +1,32 @@
+"""Add (created_at, id) indexes for keyset pagination
+
+Revision ID: 3f2a9c1d7b84
+Revises: add_missing_fields
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7b84'
+down_revision: Union[str, None] = 'add_missing_fields'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_projects_created_at_project_id', 'projects', ['created_at', 'project_id'], unique=False)
+    op.create_index('ix_members_created_at_member_id', 'members', ['created_at', 'member_id'], unique=False)
+    op.create_index('ix_blogs_created_at_blog_id', 'blogs', ['created_at', 'blog_id'], unique=False)
+    op.create_index('ix_assets_created_at_asset_id', 'assets', ['created_at', 'asset_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_assets_created_at_asset_id', table_name='assets')
+    op.drop_index('ix_blogs_created_at_blog_id', table_name='blogs')
+    op.drop_index('ix_members_created_at_member_id', table_name='members')
+    op.drop_index('ix_projects_created_at_project_id', table_name='projects')
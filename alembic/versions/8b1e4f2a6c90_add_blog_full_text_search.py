@@ -0,0 +1,36 @@
+"""Add generated tsvector column and GIN index for blog search
+
+Revision ID: 8b1e4f2a6c90
+Revises: 3f2a9c1d7b84
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e4f2a6c90'
+down_revision: Union[str, None] = '3f2a9c1d7b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # search_vector is intentionally not a mapped column (see app/models/blog.py),
+    # autogenerate will not pick it up
+    op.execute("""
+        ALTER TABLE blogs ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(content, '')), 'B') ||
+            setweight(json_to_tsvector('english', coalesce(tags, '[]'::json), '["string"]'), 'C')
+        ) STORED
+    """)
+    op.create_index('ix_blogs_search_vector', 'blogs', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_blogs_search_vector', table_name='blogs')
+    op.drop_column('blogs', 'search_vector')
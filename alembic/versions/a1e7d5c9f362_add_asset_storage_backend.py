@@ -0,0 +1,28 @@
+"""Add storage backend to assets
+
+Revision ID: a1e7d5c9f362
+Revises: f4c8a2d6b913
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1e7d5c9f362'
+down_revision: Union[str, None] = 'f4c8a2d6b913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('assets', sa.Column('storage_backend', sa.String(length=20), nullable=True))
+    # Every file stored before this revision is in Cloudinary
+    op.execute("UPDATE assets SET storage_backend = 'cloudinary' WHERE cloudinary_public_id IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.drop_column('assets', 'storage_backend')
@@ -0,0 +1,47 @@
+"""Add upload_jobs queue table
+
+Revision ID: a9d3c6e1f047
+Revises: f7c1d2e8a5b6
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3c6e1f047'
+down_revision: Union[str, None] = 'f7c1d2e8a5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('upload_jobs',
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'DONE', 'FAILED', name='uploadjobstatus'), nullable=False),
+    sa.Column('spool_path', sa.String(length=500), nullable=False),
+    sa.Column('original_filename', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=True),
+    sa.Column('file_size', sa.BigInteger(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('asset_id', sa.Integer(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('run_after', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['asset_id'], ['assets.asset_id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index(op.f('ix_upload_jobs_job_id'), 'upload_jobs', ['job_id'], unique=False)
+    op.create_index('ix_upload_jobs_status_job_id', 'upload_jobs', ['status', 'job_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_upload_jobs_status_job_id', table_name='upload_jobs')
+    op.drop_index(op.f('ix_upload_jobs_job_id'), table_name='upload_jobs')
+    op.drop_table('upload_jobs')
+    sa.Enum(name='uploadjobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,30 @@
+"""Add content_hash to assets and upload_jobs for upload deduplication
+
+Revision ID: b6e2f9a4c318
+Revises: a9d3c6e1f047
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2f9a4c318'
+down_revision: Union[str, None] = 'a9d3c6e1f047'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('assets', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_assets_content_hash'), 'assets', ['content_hash'], unique=False)
+    op.add_column('upload_jobs', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('upload_jobs', 'content_hash')
+    op.drop_index(op.f('ix_assets_content_hash'), table_name='assets')
+    op.drop_column('assets', 'content_hash')
@@ -0,0 +1,35 @@
+"""Add pg_trgm GIN indexes for asset search
+
+Revision ID: c4d7e9a1b253
+Revises: 8b1e4f2a6c90
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7e9a1b253'
+down_revision: Union[str, None] = '8b1e4f2a6c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ('filename', 'original_filename', 'description')
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        op.create_index(
+            f'ix_assets_{column}_trgm', 'assets', [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    for column in reversed(SEARCH_COLUMNS):
+        op.drop_index(f'ix_assets_{column}_trgm', table_name='assets')
+    # pg_trgm is left installed, other objects may depend on it
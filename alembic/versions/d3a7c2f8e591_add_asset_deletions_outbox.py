@@ -0,0 +1,39 @@
+"""Add asset_deletions outbox table
+
+Revision ID: d3a7c2f8e591
+Revises: b6e2f9a4c318
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a7c2f8e591'
+down_revision: Union[str, None] = 'b6e2f9a4c318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('asset_deletions',
+    sa.Column('deletion_id', sa.Integer(), nullable=False),
+    sa.Column('public_id', sa.String(length=255), nullable=False),
+    sa.Column('resource_type', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('run_after', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('deletion_id')
+    )
+    op.create_index(op.f('ix_asset_deletions_deletion_id'), 'asset_deletions', ['deletion_id'], unique=False)
+    op.create_index(op.f('ix_asset_deletions_run_after'), 'asset_deletions', ['run_after'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_asset_deletions_run_after'), table_name='asset_deletions')
+    op.drop_index(op.f('ix_asset_deletions_deletion_id'), table_name='asset_deletions')
+    op.drop_table('asset_deletions')
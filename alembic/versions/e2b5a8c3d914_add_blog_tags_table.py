@@ -0,0 +1,44 @@
+"""Add normalized blog_tags table
+
+Revision ID: e2b5a8c3d914
+Revises: c4d7e9a1b253
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b5a8c3d914'
+down_revision: Union[str, None] = 'c4d7e9a1b253'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('blog_tags',
+    sa.Column('blog_id', sa.Integer(), nullable=False),
+    sa.Column('tag', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['blog_id'], ['blogs.blog_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('blog_id', 'tag')
+    )
+    op.create_index(op.f('ix_blog_tags_tag'), 'blog_tags', ['tag'], unique=False)
+
+    # Backfill from blogs.tags, normalized like app.services.blog_service.normalize_tags()
+    op.execute("""
+        INSERT INTO blog_tags (blog_id, tag)
+        SELECT DISTINCT blogs.blog_id, left(lower(trim(t.tag)), 100)
+        FROM blogs,
+             json_array_elements_text(
+                 CASE WHEN json_typeof(blogs.tags) = 'array' THEN blogs.tags ELSE '[]'::json END
+             ) AS t(tag)
+        WHERE trim(t.tag) <> ''
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_blog_tags_tag'), table_name='blog_tags')
+    op.drop_table('blog_tags')
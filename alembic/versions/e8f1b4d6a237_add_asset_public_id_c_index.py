@@ -0,0 +1,26 @@
+"""Add byte-order index on assets.cloudinary_public_id for reconciliation
+
+Revision ID: e8f1b4d6a237
+Revises: d3a7c2f8e591
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8f1b4d6a237'
+down_revision: Union[str, None] = 'd3a7c2f8e591'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_assets_cloudinary_public_id_c', 'assets', [sa.text('cloudinary_public_id COLLATE "C"')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_assets_cloudinary_public_id_c', table_name='assets')
@@ -0,0 +1,27 @@
+"""Add storage backend to asset_deletions
+
+Revision ID: f4c8a2d6b913
+Revises: e8f1b4d6a237
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c8a2d6b913'
+down_revision: Union[str, None] = 'e8f1b4d6a237'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows queued before this revision were all Cloudinary files
+    op.add_column('asset_deletions', sa.Column('backend', sa.String(length=20), server_default='cloudinary', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('asset_deletions', 'backend')
@@ -0,0 +1,28 @@
+"""Add composite indexes for member directory filters and facets
+
+Revision ID: f7c1d2e8a5b6
+Revises: e2b5a8c3d914
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c1d2e8a5b6'
+down_revision: Union[str, None] = 'e2b5a8c3d914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_members_team_type_role_experience', 'members', ['team_type', 'role', 'experience'], unique=False)
+    op.create_index('ix_members_role_experience', 'members', ['role', 'experience'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_members_role_experience', table_name='members')
+    op.drop_index('ix_members_team_type_role_experience', table_name='members')
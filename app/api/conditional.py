@@ -0,0 +1,79 @@
+"""
+ETag / Last-Modified validators and conditional GET handling
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from app.database.base import DBSession
+from app.services.version_service import AsyncVersionService
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive timestamps, they are stored as UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def build_validators(version: Tuple, scope: str) -> Dict[str, str]:
+    """
+    Turn a version watermark into ETag and Last-Modified headers
+
+    scope distinguishes representations sharing one watermark, e.g. the
+    query string of a list page.
+    """
+    payload = json.dumps([scope, *version], default=str)
+    headers = {"ETag": f'"{hashlib.sha1(payload.encode()).hexdigest()}"'}
+
+    timestamps = [_as_utc(value) for value in version if isinstance(value, datetime)]
+    if timestamps:
+        headers["Last-Modified"] = format_datetime(max(timestamps).replace(microsecond=0), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, validators: Mapping[str, str]) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when no ETag was sent"""
+    etag = validators.get("ETag")
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # If-None-Match uses the weak comparison
+        return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+    last_modified = validators.get("Last-Modified")
+    if_modified_since = request.headers.get("if-modified-since")
+    if last_modified is None or if_modified_since is None:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def not_modified_response(validators: Mapping[str, str]) -> Response:
+    headers = {name: validators[name] for name in ("ETag", "Last-Modified") if validators.get(name)}
+    return Response(status_code=304, headers=headers)
+
+
+async def detail_validators(db: DBSession, entity: str, row_id: int) -> Optional[Dict[str, str]]:
+    """Validators of a detail response, None when the row does not exist"""
+    version = await AsyncVersionService.get_detail_version(db, entity, row_id)
+    if version is None:
+        return None
+    return build_validators(version, f"{entity}:{row_id}")
+
+
+async def collection_validators(db: DBSession, entity: str, request: Request) -> Dict[str, str]:
+    """Validators of a list response from the table-wide count/max watermark"""
+    version = await AsyncVersionService.get_collection_version(db, entity)
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return build_validators(version, f"{entity}:{request.url.path}?{query}")
@@ -2,91 +2,226 @@
 Asset API endpoints
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
-from sqlalchemy.orm import Session
+from typing import Any, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, UploadFile, File
+from fastapi.responses import JSONResponse
 
-from app.database.base import get_db
-from app.services.asset_service import AssetService
+from app.config import settings
+from app.database.base import DBSession, get_db, get_read_db
+from app.api.conditional import (
+    collection_validators,
+    detail_validators,
+    is_not_modified,
+    not_modified_response
+)
+from app.api.responses import cached_response, detail_response, export_response, list_response
+from app.services.fieldsets import parse_fields
+from app.services.asset_service import AsyncAssetService
+from app.services.cloudinary_service import CloudinaryService
+from app.services.upload_job_service import AsyncUploadJobService
 from app.schemas.asset import (
     AssetResponse, 
     AssetDetailResponse, 
     AssetCreate, 
     AssetUpdate,
-    FileUploadResponse
+    FileUploadResponse,
+    SignedUploadParams,
+    SignedUploadRegistration,
+    SignedUploadRequest
 )
+from app.schemas.bulk import BulkCreateResponse
+from app.schemas.upload_job import UploadJobResponse
+from app.storage import get_storage
 
 router = APIRouter()
 
 
+def require_cloudinary_storage() -> None:
+    if get_storage().name != "cloudinary":
+        raise HTTPException(status_code=501, detail="Direct uploads need the Cloudinary storage backend")
+
+
 @router.get("/", response_model=List[AssetResponse])
-def get_assets(
+async def get_assets(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. title,created_at"),
     asset_type: str = Query(None, description="Filter by asset type"),
-    search: str = Query(None, description="Search by filename"),
-    db: Session = Depends(get_db)
+    search: str = Query(None, description="Search by filename or description, ranked by similarity"),
+    db: DBSession = Depends(get_read_db)
 ):
     """Get all assets with pagination and optional filters"""
+    cached = await cached_response("assets:list", request)
+    if cached is not None:
+        return cached
+
+    field_list = parse_fields(fields, AssetResponse)
+    validators = await collection_validators(db, "asset", request)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
     if search:
-        assets = AssetService.search_assets(db, search, skip=skip, limit=limit)
-    elif asset_type:
-        assets = AssetService.get_assets_by_type(db, asset_type, skip=skip, limit=limit)
+        assets, total = await AsyncAssetService.search_assets(
+            db, search, skip=skip, limit=limit, fields=field_list
+        )
+        return await list_response(
+            "assets:list", request, assets, AssetResponse, "asset_id",
+            fields=field_list, validators=validators, total=total
+        )
+
+    if asset_type:
+        assets = await AsyncAssetService.get_assets_by_type(
+            db, asset_type, skip=skip, limit=limit, cursor=cursor, fields=field_list
+        )
     else:
-        assets = AssetService.get_assets(db, skip=skip, limit=limit)
-    return assets
+        assets = await AsyncAssetService.get_assets(
+            db, skip=skip, limit=limit, cursor=cursor, fields=field_list
+        )
+
+    return await list_response(
+        "assets:list", request, assets, AssetResponse, "asset_id",
+        limit, field_list, validators
+    )
+
+
+@router.get("/export")
+async def export_assets(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    db: DBSession = Depends(get_read_db)
+):
+    """Stream every asset as NDJSON or CSV"""
+    return export_response(db, "asset", export_format)
+
+
+@router.get("/files/{public_id:path}", response_class=Response)
+async def get_file(public_id: str, request: Request):
+    """Serve a file of the local storage backend, honouring Range requests"""
+    return get_storage().serve(public_id, request)
+
+
+@router.get("/jobs/{job_id}", response_model=UploadJobResponse)
+async def get_upload_job(job_id: int, db: DBSession = Depends(get_db)):
+    """Poll the status of an asynchronous upload"""
+    job = await AsyncUploadJobService.get_job(db, job_id, response_model=UploadJobResponse)
+    if not job:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+    return job
 
 
 @router.get("/{asset_id}", response_model=AssetDetailResponse)
-def get_asset(asset_id: int, db: Session = Depends(get_db)):
+async def get_asset(asset_id: int, request: Request, db: DBSession = Depends(get_read_db)):
     """Get asset by ID with related data"""
-    asset = AssetService.get_asset_by_id(db, asset_id)
+    cached = await cached_response("assets:detail", request)
+    if cached is not None:
+        return cached
+
+    validators = await detail_validators(db, "asset", asset_id)
+    if validators is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
+    asset = await AsyncAssetService.get_asset_detail(
+        db, asset_id, response_model=AssetDetailResponse
+    )
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
-    return asset
+    return await detail_response("assets:detail", request, asset, validators)
 
 
-@router.post("/upload", response_model=FileUploadResponse, status_code=201)
+@router.post(
+    "/upload",
+    response_model=FileUploadResponse,
+    status_code=201,
+    responses={
+        200: {"model": FileUploadResponse, "description": "Identical file uploaded before, existing asset returned"},
+        202: {"model": UploadJobResponse, "description": "Upload queued (async=true)"}
+    }
+)
 async def upload_file(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    run_async: bool = Query(False, alias="async", description="Queue the upload and return a job to poll"),
+    db: DBSession = Depends(get_db)
 ):
-    """Upload file to Cloudinary and create asset record"""
-    asset = await AssetService.upload_and_create_asset(db, file)
+    """Upload file to the storage backend and create asset record"""
+    if run_async:
+        job = await AsyncUploadJobService.enqueue_upload(db, file)
+        return JSONResponse(
+            UploadJobResponse.model_validate(job).model_dump(mode="json"),
+            status_code=202,
+            headers={"Location": f"{settings.API_V1_STR}/assets/jobs/{job.job_id}"}
+        )
+
+    asset, created = await AsyncAssetService.upload_and_create_asset(db, file)
+    if not created:
+        # Identical content was uploaded before, the new copy is not kept
+        return JSONResponse(
+            FileUploadResponse(message="File already uploaded", asset=asset).model_dump(mode="json")
+        )
     return FileUploadResponse(
         message="File uploaded successfully",
         asset=asset
     )
 
 
+@router.post("/upload/sign", response_model=SignedUploadParams)
+async def sign_upload(upload_request: SignedUploadRequest):
+    """Issue signed parameters for uploading a file straight from the browser to Cloudinary"""
+    require_cloudinary_storage()
+    return CloudinaryService.sign_upload(upload_request.asset_type)
+
+
+@router.post("/register", response_model=AssetResponse, status_code=201)
+async def register_upload(registration: SignedUploadRegistration, db: DBSession = Depends(get_db)):
+    """Create the asset record of a signed direct upload from Cloudinary's upload response"""
+    require_cloudinary_storage()
+    asset = await AsyncAssetService.register_signed_upload(db, registration)
+    return asset
+
+
 @router.post("/", response_model=AssetResponse, status_code=201)
-def create_asset(asset_data: AssetCreate, db: Session = Depends(get_db)):
+async def create_asset(asset_data: AssetCreate, db: DBSession = Depends(get_db)):
     """Create asset record for already uploaded file"""
-    asset = AssetService.create_asset(db, asset_data)
+    asset = await AsyncAssetService.create_asset(db, asset_data)
     return asset
 
 
+@router.post("/bulk", response_model=BulkCreateResponse[AssetResponse], status_code=201)
+async def bulk_create_assets(
+    response: Response,
+    items: List[Any] = Body(..., description="Asset payloads, validated one by one"),
+    db: DBSession = Depends(get_db)
+):
+    """Create many assets in one INSERT; invalid items are reported by index and skipped"""
+    created, errors = await AsyncAssetService.bulk_create_assets(db, items)
+    if errors:
+        response.status_code = 207
+    return {"created": created, "errors": errors}
+
+
 @router.patch("/{asset_id}", response_model=AssetResponse)
-def update_asset(
+async def update_asset(
     asset_id: int, 
     asset_data: AssetUpdate, 
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Update asset metadata"""
-    asset = AssetService.update_asset(db, asset_id, asset_data)
+    asset = await AsyncAssetService.update_asset(db, asset_id, asset_data)
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
     return asset
 
 
 @router.delete("/{asset_id}")
-def delete_asset(
+async def delete_asset(
     asset_id: int, 
     delete_from_cloudinary: bool = Query(True, description="Also delete from Cloudinary"),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Delete asset and optionally remove from Cloudinary"""
-    success = AssetService.delete_asset(db, asset_id, delete_from_cloudinary)
+    success = await AsyncAssetService.delete_asset(db, asset_id, delete_from_cloudinary)
     if not success:
         raise HTTPException(status_code=404, detail="Asset not found")
     return {"message": "Asset deleted successfully"}
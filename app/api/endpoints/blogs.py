@@ -2,93 +2,213 @@
 Blog API endpoints
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-
-from app.database.base import get_db
-from app.services.blog_service import BlogService
+from typing import Any, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+
+from app.database.base import DBSession, get_db, get_read_db
+from app.api.conditional import (
+    collection_validators,
+    detail_validators,
+    is_not_modified,
+    not_modified_response
+)
+from app.api.responses import (
+    cached_response,
+    detail_response,
+    export_response,
+    json_response,
+    list_response
+)
+from app.services.fieldsets import parse_fields
+from app.services.blog_service import AsyncBlogService
 from app.schemas.blog import (
     BlogResponse, 
     BlogDetailResponse, 
     BlogCreate, 
-    BlogUpdate
+    BlogUpdate,
+    BlogTagCount
 )
-from app.schemas.asset import AssetAttachRequest
+from app.schemas.asset import AssetAttachRequest, AssetLinkResponse
+from app.schemas.bulk import BulkCreateResponse
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[BlogResponse])
-def get_blogs(
+async def get_blogs(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. title,created_at"),
     project_id: int = Query(None, description="Filter by project ID"),
-    db: Session = Depends(get_db)
+    tag: Optional[str] = Query(None, description="Filter by tag, case-insensitive"),
+    db: DBSession = Depends(get_read_db)
 ):
-    """Get all blogs with pagination and optional project filter"""
+    """Get all blogs with pagination and optional project and tag filters"""
+    cached = await cached_response("blogs:list", request)
+    if cached is not None:
+        return cached
+
+    field_list = parse_fields(fields, BlogResponse)
+    validators = await collection_validators(db, "blog", request)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
     if project_id:
-        blogs = BlogService.get_blogs_by_project(db, project_id)
-    else:
-        blogs = BlogService.get_blogs(db, skip=skip, limit=limit)
-    return blogs
+        blogs = await AsyncBlogService.get_blogs_by_project(
+            db, project_id, fields=field_list, tag=tag
+        )
+        return await list_response(
+            "blogs:list", request, blogs, BlogResponse, "blog_id",
+            fields=field_list, validators=validators
+        )
+
+    blogs = await AsyncBlogService.get_blogs(
+        db, skip=skip, limit=limit, cursor=cursor, fields=field_list, tag=tag
+    )
+    return await list_response(
+        "blogs:list", request, blogs, BlogResponse, "blog_id",
+        limit, field_list, validators
+    )
+
+
+@router.get("/tags", response_model=List[BlogTagCount])
+async def get_blog_tags(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000, description="Number of tags to return"),
+    db: DBSession = Depends(get_read_db)
+):
+    """Get blog tags with their number of blogs, most used first"""
+    cached = await cached_response("blogs:tags", request)
+    if cached is not None:
+        return cached
+
+    validators = await collection_validators(db, "blog", request)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
+    counts = await AsyncBlogService.get_tag_counts(db, limit=limit)
+    content = [BlogTagCount(tag=tag, count=count) for tag, count in counts]
+    # Every blog write invalidates blog:list, which is all the counts depend on
+    return await json_response("blogs:tags", request, content, {"blog:list"}, validators)
+
+
+@router.get("/search", response_model=List[BlogResponse])
+async def search_blogs(
+    request: Request,
+    q: str = Query(..., min_length=1, description="Search terms, e.g. fastapi tutorial"),
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Number of records to return"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. title,created_at"),
+    db: DBSession = Depends(get_read_db)
+):
+    """Full-text search over blog title, content and tags, best matches first"""
+    cached = await cached_response("blogs:search", request)
+    if cached is not None:
+        return cached
+
+    field_list = parse_fields(fields, BlogResponse)
+    validators = await collection_validators(db, "blog", request)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
+    blogs = await AsyncBlogService.search_blogs(db, q, skip=skip, limit=limit, fields=field_list)
+    return await list_response(
+        "blogs:search", request, blogs, BlogResponse, "blog_id",
+        fields=field_list, validators=validators
+    )
+
+
+@router.get("/export")
+async def export_blogs(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    db: DBSession = Depends(get_read_db)
+):
+    """Stream every blog as NDJSON or CSV"""
+    return export_response(db, "blog", export_format)
 
 
 @router.get("/{blog_id}", response_model=BlogDetailResponse)
-def get_blog(blog_id: int, db: Session = Depends(get_db)):
+async def get_blog(blog_id: int, request: Request, db: DBSession = Depends(get_read_db)):
     """Get blog by ID with related data"""
-    blog = BlogService.get_blog_by_id(db, blog_id)
+    cached = await cached_response("blogs:detail", request)
+    if cached is not None:
+        return cached
+
+    validators = await detail_validators(db, "blog", blog_id)
+    if validators is None:
+        raise HTTPException(status_code=404, detail="Blog not found")
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
+    blog = await AsyncBlogService.get_blog_detail(
+        db, blog_id, response_model=BlogDetailResponse
+    )
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
-    return blog
+    return await detail_response("blogs:detail", request, blog, validators)
 
 
 @router.post("/", response_model=BlogResponse, status_code=201)
-def create_blog(blog_data: BlogCreate, db: Session = Depends(get_db)):
+async def create_blog(blog_data: BlogCreate, db: DBSession = Depends(get_db)):
     """Create new blog"""
-    blog = BlogService.create_blog(db, blog_data)
+    blog = await AsyncBlogService.create_blog(db, blog_data)
     return blog
 
 
+@router.post("/bulk", response_model=BulkCreateResponse[BlogResponse], status_code=201)
+async def bulk_create_blogs(
+    response: Response,
+    items: List[Any] = Body(..., description="Blog payloads, validated one by one"),
+    db: DBSession = Depends(get_db)
+):
+    """Create many blogs in one INSERT; invalid items are reported by index and skipped"""
+    created, errors = await AsyncBlogService.bulk_create_blogs(db, items)
+    if errors:
+        response.status_code = 207
+    return {"created": created, "errors": errors}
+
+
 @router.patch("/{blog_id}", response_model=BlogResponse)
-def update_blog(
+async def update_blog(
     blog_id: int, 
     blog_data: BlogUpdate, 
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Update blog"""
-    blog = BlogService.update_blog(db, blog_id, blog_data)
+    blog = await AsyncBlogService.update_blog(db, blog_id, blog_data)
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
     return blog
 
 
 @router.delete("/{blog_id}")
-def delete_blog(blog_id: int, db: Session = Depends(get_db)):
+async def delete_blog(blog_id: int, db: DBSession = Depends(get_db)):
     """Delete blog"""
-    success = BlogService.delete_blog(db, blog_id)
+    success = await AsyncBlogService.delete_blog(db, blog_id)
     if not success:
         raise HTTPException(status_code=404, detail="Blog not found")
     return {"message": "Blog deleted successfully"}
 
 
-@router.post("/{blog_id}/assets/attach", response_model=BlogDetailResponse)
-def attach_assets_to_blog(
+@router.post("/{blog_id}/assets/attach", response_model=AssetLinkResponse)
+async def attach_assets_to_blog(
     blog_id: int,
     request: AssetAttachRequest,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Attach assets to blog"""
-    blog = BlogService.attach_assets_to_blog(db, blog_id, request.asset_ids)
-    return blog
+    asset_ids = await AsyncBlogService.attach_assets_to_blog(db, blog_id, request.asset_ids)
+    return AssetLinkResponse(asset_ids=asset_ids)
 
 
-@router.post("/{blog_id}/assets/detach", response_model=BlogDetailResponse)
-def detach_assets_from_blog(
+@router.post("/{blog_id}/assets/detach", response_model=AssetLinkResponse)
+async def detach_assets_from_blog(
     blog_id: int,
     request: AssetAttachRequest,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Detach assets from blog"""
-    blog = BlogService.detach_assets_from_blog(db, blog_id, request.asset_ids)
-    return blog
+    asset_ids = await AsyncBlogService.detach_assets_from_blog(db, blog_id, request.asset_ids)
+    return AssetLinkResponse(asset_ids=asset_ids)
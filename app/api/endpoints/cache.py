@@ -0,0 +1,22 @@
+"""
+Response cache API endpoints
+"""
+
+from fastapi import APIRouter
+
+from app.cache import response_cache
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def get_cache_stats():
+    """Get response cache hit/miss counters"""
+    return response_cache.stats()
+
+
+@router.delete("/")
+def clear_cache():
+    """Drop every cached response"""
+    response_cache.clear()
+    return {"message": "Cache cleared successfully"}
@@ -0,0 +1,25 @@
+"""
+Landing page API endpoints
+"""
+
+from fastapi import APIRouter, Depends, Request, Response
+
+from app.api.conditional import is_not_modified, not_modified_response
+from app.database.base import DBSession, get_db
+from app.schemas.landing import LandingResponse
+from app.services.landing_service import landing_snapshot
+
+router = APIRouter()
+
+
+@router.get("/", response_model=LandingResponse)
+async def get_landing(request: Request, db: DBSession = Depends(get_db)):
+    """Get projects, members, blogs and assets for the landing page in one payload"""
+    # Rebuilds are rare and outlive the write that triggered them, so they
+    # read from the primary rather than a possibly lagging replica. Sessions
+    # connect lazily, a snapshot hit never checks out a connection.
+    body, etag = await landing_snapshot.get(db)
+    validators = {"ETag": etag}
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+    return Response(body, media_type="application/json", headers=validators)
@@ -2,93 +2,217 @@
 Member API endpoints
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-
-from app.database.base import get_db
-from app.services.member_service import MemberService
+from typing import Any, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+
+from app.database.base import DBSession, get_db, get_read_db
+from app.api.conditional import (
+    collection_validators,
+    detail_validators,
+    is_not_modified,
+    not_modified_response
+)
+from app.api.responses import (
+    cached_response,
+    detail_response,
+    export_response,
+    json_response,
+    list_response
+)
+from app.services.fieldsets import parse_fields, select_fields
+from app.services.pagination import next_cursor
+from app.services.member_service import AsyncMemberService
 from app.schemas.member import (
     MemberResponse, 
     MemberDetailResponse, 
     MemberCreate, 
-    MemberUpdate
+    MemberUpdate,
+    MemberFilters,
+    MemberDirectoryResponse
 )
-from app.schemas.asset import AssetAttachRequest
+from app.schemas.asset import AssetAttachRequest, AssetLinkResponse
+from app.schemas.bulk import BulkCreateResponse
 
 router = APIRouter()
 
 
+def member_filters(
+    team_type: Optional[str] = Query(None, description="Filter by team type"),
+    role: Optional[str] = Query(None, description="Filter by role"),
+    min_experience: Optional[int] = Query(None, ge=0, description="Minimum years of experience"),
+    max_experience: Optional[int] = Query(None, ge=0, description="Maximum years of experience")
+) -> MemberFilters:
+    """Directory filters from the query string, validated as regular query parameters"""
+    return MemberFilters(
+        team_type=team_type, role=role,
+        min_experience=min_experience, max_experience=max_experience
+    )
+
+
 @router.get("/", response_model=List[MemberResponse])
-def get_members(
+async def get_members(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. title,created_at"),
     project_id: int = Query(None, description="Filter by project ID"),
-    db: Session = Depends(get_db)
+    filters: MemberFilters = Depends(member_filters),
+    db: DBSession = Depends(get_read_db)
 ):
-    """Get all members with pagination and optional project filter"""
+    """Get all members with pagination and optional project, team, role and experience filters"""
+    cached = await cached_response("members:list", request)
+    if cached is not None:
+        return cached
+
+    field_list = parse_fields(fields, MemberResponse)
+    validators = await collection_validators(db, "member", request)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
     if project_id:
-        members = MemberService.get_members_by_project(db, project_id)
-    else:
-        members = MemberService.get_members(db, skip=skip, limit=limit)
-    return members
+        members = await AsyncMemberService.get_members_by_project(
+            db, project_id, fields=field_list, filters=filters
+        )
+        return await list_response(
+            "members:list", request, members, MemberResponse, "member_id",
+            fields=field_list, validators=validators
+        )
+
+    members = await AsyncMemberService.get_members(
+        db, skip=skip, limit=limit, cursor=cursor, fields=field_list, filters=filters
+    )
+    return await list_response(
+        "members:list", request, members, MemberResponse, "member_id",
+        limit, field_list, validators
+    )
+
+
+@router.get("/directory", response_model=MemberDirectoryResponse)
+async def get_member_directory(
+    request: Request,
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(24, ge=1, le=1000, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor; replaces skip"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. member_name,role"),
+    filters: MemberFilters = Depends(member_filters),
+    db: DBSession = Depends(get_read_db)
+):
+    """Get one page of filtered members with team type, role and experience facet counts"""
+    cached = await cached_response("members:directory", request)
+    if cached is not None:
+        return cached
+
+    field_list = parse_fields(fields, MemberResponse)
+    validators = await collection_validators(db, "member", request)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
+    members = await AsyncMemberService.get_members(
+        db, skip=skip, limit=limit, cursor=cursor, fields=field_list, filters=filters
+    )
+    facets, total = await AsyncMemberService.get_member_facets(db, filters)
+    content = {
+        "items": select_fields(members, field_list) if field_list else [
+            MemberResponse.model_validate(member) for member in members
+        ],
+        "total": total,
+        "facets": facets,
+        "next_cursor": next_cursor(members, "member_id", limit),
+    }
+    tags = {"member:list", *(f"member:{member.member_id}" for member in members)}
+    return await json_response("members:directory", request, content, tags, validators)
+
+
+@router.get("/export")
+async def export_members(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    db: DBSession = Depends(get_read_db)
+):
+    """Stream every member as NDJSON or CSV"""
+    return export_response(db, "member", export_format)
 
 
 @router.get("/{member_id}", response_model=MemberDetailResponse)
-def get_member(member_id: int, db: Session = Depends(get_db)):
+async def get_member(member_id: int, request: Request, db: DBSession = Depends(get_read_db)):
     """Get member by ID with related data"""
-    member = MemberService.get_member_by_id(db, member_id)
+    cached = await cached_response("members:detail", request)
+    if cached is not None:
+        return cached
+
+    validators = await detail_validators(db, "member", member_id)
+    if validators is None:
+        raise HTTPException(status_code=404, detail="Member not found")
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
+    member = await AsyncMemberService.get_member_detail(
+        db, member_id, response_model=MemberDetailResponse
+    )
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
-    return member
+    return await detail_response("members:detail", request, member, validators)
 
 
 @router.post("/", response_model=MemberResponse, status_code=201)
-def create_member(member_data: MemberCreate, db: Session = Depends(get_db)):
+async def create_member(member_data: MemberCreate, db: DBSession = Depends(get_db)):
     """Create new member"""
-    member = MemberService.create_member(db, member_data)
+    member = await AsyncMemberService.create_member(db, member_data)
     return member
 
 
+@router.post("/bulk", response_model=BulkCreateResponse[MemberResponse], status_code=201)
+async def bulk_create_members(
+    response: Response,
+    items: List[Any] = Body(..., description="Member payloads, validated one by one"),
+    db: DBSession = Depends(get_db)
+):
+    """Create many members in one INSERT; invalid items are reported by index and skipped"""
+    created, errors = await AsyncMemberService.bulk_create_members(db, items)
+    if errors:
+        response.status_code = 207
+    return {"created": created, "errors": errors}
+
+
 @router.patch("/{member_id}", response_model=MemberResponse)
-def update_member(
+async def update_member(
     member_id: int, 
     member_data: MemberUpdate, 
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Update member"""
-    member = MemberService.update_member(db, member_id, member_data)
+    member = await AsyncMemberService.update_member(db, member_id, member_data)
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
     return member
 
 
 @router.delete("/{member_id}")
-def delete_member(member_id: int, db: Session = Depends(get_db)):
+async def delete_member(member_id: int, db: DBSession = Depends(get_db)):
     """Delete member"""
-    success = MemberService.delete_member(db, member_id)
+    success = await AsyncMemberService.delete_member(db, member_id)
     if not success:
         raise HTTPException(status_code=404, detail="Member not found")
     return {"message": "Member deleted successfully"}
 
 
-@router.post("/{member_id}/assets/attach", response_model=MemberDetailResponse)
-def attach_assets_to_member(
+@router.post("/{member_id}/assets/attach", response_model=AssetLinkResponse)
+async def attach_assets_to_member(
     member_id: int,
     request: AssetAttachRequest,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Attach assets to member"""
-    member = MemberService.attach_assets_to_member(db, member_id, request.asset_ids)
-    return member
+    asset_ids = await AsyncMemberService.attach_assets_to_member(db, member_id, request.asset_ids)
+    return AssetLinkResponse(asset_ids=asset_ids)
 
 
-@router.post("/{member_id}/assets/detach", response_model=MemberDetailResponse)
-def detach_assets_from_member(
+@router.post("/{member_id}/assets/detach", response_model=AssetLinkResponse)
+async def detach_assets_from_member(
     member_id: int,
     request: AssetAttachRequest,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Detach assets from member"""
-    member = MemberService.detach_assets_from_member(db, member_id, request.asset_ids)
-    return member
+    asset_ids = await AsyncMemberService.detach_assets_from_member(db, member_id, request.asset_ids)
+    return AssetLinkResponse(asset_ids=asset_ids)
@@ -2,89 +2,148 @@
 Project API endpoints
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-
-from app.database.base import get_db
-from app.services.project_service import ProjectService
+from typing import Any, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+
+from app.database.base import DBSession, get_db, get_read_db
+from app.api.conditional import (
+    collection_validators,
+    detail_validators,
+    is_not_modified,
+    not_modified_response
+)
+from app.api.responses import cached_response, detail_response, export_response, list_response
+from app.services.fieldsets import parse_fields
+from app.services.project_service import AsyncProjectService
 from app.schemas.project import (
     ProjectResponse, 
     ProjectDetailResponse, 
     ProjectCreate, 
     ProjectUpdate
 )
-from app.schemas.asset import AssetAttachRequest
+from app.schemas.asset import AssetAttachRequest, AssetLinkResponse
+from app.schemas.bulk import BulkCreateResponse
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[ProjectResponse])
-def get_projects(
+async def get_projects(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return, e.g. title,created_at"),
+    db: DBSession = Depends(get_read_db)
 ):
     """Get all projects with pagination"""
-    projects = ProjectService.get_projects(db, skip=skip, limit=limit)
-    return projects
+    cached = await cached_response("projects:list", request)
+    if cached is not None:
+        return cached
+
+    field_list = parse_fields(fields, ProjectResponse)
+    validators = await collection_validators(db, "project", request)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
+    projects = await AsyncProjectService.get_projects(
+        db, skip=skip, limit=limit, cursor=cursor, fields=field_list
+    )
+    return await list_response(
+        "projects:list", request, projects, ProjectResponse, "project_id",
+        limit, field_list, validators
+    )
+
+
+@router.get("/export")
+async def export_projects(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    db: DBSession = Depends(get_read_db)
+):
+    """Stream every project as NDJSON or CSV"""
+    return export_response(db, "project", export_format)
 
 
 @router.get("/{project_id}", response_model=ProjectDetailResponse)
-def get_project(project_id: int, db: Session = Depends(get_db)):
+async def get_project(project_id: int, request: Request, db: DBSession = Depends(get_read_db)):
     """Get project by ID with related data"""
-    project = ProjectService.get_project_by_id(db, project_id)
+    cached = await cached_response("projects:detail", request)
+    if cached is not None:
+        return cached
+
+    validators = await detail_validators(db, "project", project_id)
+    if validators is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
+    project = await AsyncProjectService.get_project_detail(
+        db, project_id, response_model=ProjectDetailResponse
+    )
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    return await detail_response("projects:detail", request, project, validators)
 
 
 @router.post("/", response_model=ProjectResponse, status_code=201)
-def create_project(project_data: ProjectCreate, db: Session = Depends(get_db)):
+async def create_project(project_data: ProjectCreate, db: DBSession = Depends(get_db)):
     """Create new project"""
-    project = ProjectService.create_project(db, project_data)
+    project = await AsyncProjectService.create_project(db, project_data)
     return project
 
 
+@router.post("/bulk", response_model=BulkCreateResponse[ProjectResponse], status_code=201)
+async def bulk_create_projects(
+    response: Response,
+    items: List[Any] = Body(..., description="Project payloads, validated one by one"),
+    db: DBSession = Depends(get_db)
+):
+    """Create many projects in one INSERT; invalid items are reported by index and skipped"""
+    created, errors = await AsyncProjectService.bulk_create_projects(db, items)
+    if errors:
+        response.status_code = 207
+    return {"created": created, "errors": errors}
+
+
 @router.patch("/{project_id}", response_model=ProjectResponse)
-def update_project(
+async def update_project(
     project_id: int, 
     project_data: ProjectUpdate, 
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Update project"""
-    project = ProjectService.update_project(db, project_id, project_data)
+    project = await AsyncProjectService.update_project(db, project_id, project_data)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 
 @router.delete("/{project_id}")
-def delete_project(project_id: int, db: Session = Depends(get_db)):
+async def delete_project(project_id: int, db: DBSession = Depends(get_db)):
     """Delete project"""
-    success = ProjectService.delete_project(db, project_id)
+    success = await AsyncProjectService.delete_project(db, project_id)
     if not success:
         raise HTTPException(status_code=404, detail="Project not found")
     return {"message": "Project deleted successfully"}
 
 
-@router.post("/{project_id}/assets/attach", response_model=ProjectDetailResponse)
-def attach_assets_to_project(
+@router.post("/{project_id}/assets/attach", response_model=AssetLinkResponse)
+async def attach_assets_to_project(
     project_id: int,
     request: AssetAttachRequest,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Attach assets to project"""
-    project = ProjectService.attach_assets_to_project(db, project_id, request.asset_ids)
-    return project
+    asset_ids = await AsyncProjectService.attach_assets_to_project(db, project_id, request.asset_ids)
+    return AssetLinkResponse(asset_ids=asset_ids)
 
 
-@router.post("/{project_id}/assets/detach", response_model=ProjectDetailResponse)
-def detach_assets_from_project(
+@router.post("/{project_id}/assets/detach", response_model=AssetLinkResponse)
+async def detach_assets_from_project(
     project_id: int,
     request: AssetAttachRequest,
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db)
 ):
     """Detach assets from project"""
-    project = ProjectService.detach_assets_from_project(db, project_id, request.asset_ids)
-    return project
+    asset_ids = await AsyncProjectService.detach_assets_from_project(db, project_id, request.asset_ids)
+    return AssetLinkResponse(asset_ids=asset_ids)
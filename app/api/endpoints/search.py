@@ -0,0 +1,29 @@
+"""
+Search API endpoints
+"""
+
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Query
+
+from app.database.base import DBSession, get_db
+from app.schemas.search import SuggestResponse
+from app.services.suggest_service import suggest_index
+
+router = APIRouter()
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100, description="Typed prefix"),
+    limit: int = Query(10, ge=1, le=50, description="Number of suggestions to return"),
+    entity: Optional[List[Literal["project", "member", "blog", "asset"]]] = Query(
+        None, description="Restrict suggestions to these entities, repeatable"
+    ),
+    db: DBSession = Depends(get_db)
+):
+    """Typeahead suggestions across project names, member names, blog titles and asset filenames"""
+    # Lookups are served from memory; the session is only used to re-read
+    # rows changed since the last call, from the primary so a write is
+    # never indexed from a lagging replica. Sessions connect lazily.
+    suggestions = await suggest_index.suggest(db, q, limit, entity)
+    return SuggestResponse(query=q, suggestions=suggestions)
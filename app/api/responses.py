@@ -0,0 +1,118 @@
+"""
+Shared helpers for building cached read and export responses
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+
+from app.api.conditional import is_not_modified, not_modified_response
+from app.cache import response_cache
+from app.cache.response_cache import ENTITY_SCHEMAS, collect_tags
+from app.database.base import DBSession, wrote_recently
+from app.services.export_service import EXPORT_FORMATS, ExportService
+from app.services.fieldsets import select_fields
+from app.services.pagination import next_cursor
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def _entity_for(schema: Type[BaseModel]) -> str:
+    return next(entity for model, entity, _ in ENTITY_SCHEMAS if issubclass(schema, model))
+
+
+async def cached_response(route: str, request: Request) -> Optional[Response]:
+    """
+    Serve a request from the response cache, as a 304 when the client copy is current
+
+    Clients inside their read-your-writes window skip the cache, an entry
+    may predate their write.
+    """
+    if wrote_recently(request):
+        return None
+    cached = await response_cache.get(route, request)
+    if cached is not None and is_not_modified(request, cached.headers):
+        return not_modified_response(cached.headers)
+    return cached
+
+
+async def list_response(
+    route: str,
+    request: Request,
+    items: List[Any],
+    schema: Type[BaseModel],
+    id_attr: str,
+    limit: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    validators: Optional[Dict[str, str]] = None,
+    total: Optional[int] = None
+) -> Response:
+    """
+    Finish a list endpoint and store the serialized page in the response cache
+
+    Paged results (limit given) get an X-Next-Cursor header, a known total
+    match count an X-Total-Count header. With a sparse fieldset only the
+    requested fields are serialized and schema validation is skipped, since
+    the rows are intentionally incomplete.
+    """
+    entity = _entity_for(schema)
+    tags = {f"{entity}:list"}
+    tags.update(f"{entity}:{getattr(item, id_attr)}" for item in items)
+
+    if fields:
+        body = json.dumps(
+            jsonable_encoder(select_fields(items, fields)), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+    else:
+        body = _list_adapter(schema).dump_json([schema.model_validate(item) for item in items])
+
+    headers = dict(validators or {})
+    cursor_value = next_cursor(items, id_attr, limit) if limit else None
+    if cursor_value:
+        headers["X-Next-Cursor"] = cursor_value
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+
+    return await response_cache.store(route, request, body, tags, headers)
+
+
+async def json_response(
+    route: str,
+    request: Request,
+    content: Any,
+    tags: Iterable[str],
+    validators: Optional[Dict[str, str]] = None
+) -> Response:
+    """Finish an endpoint returning plain JSON data and store it in the response cache"""
+    body = json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return await response_cache.store(route, request, body, tags, validators)
+
+
+async def detail_response(
+    route: str, request: Request, item: BaseModel, validators: Optional[Dict[str, str]] = None
+) -> Response:
+    """Finish a detail endpoint and store the serialized body in the response cache"""
+    body = item.model_dump_json().encode("utf-8")
+    return await response_cache.store(route, request, body, collect_tags(item), validators)
+
+
+def export_response(db: DBSession, entity: str, export_format: str) -> StreamingResponse:
+    """
+    Stream a whole table as NDJSON or CSV
+
+    The session dependency is only closed once the response has been sent,
+    so the generator can keep fetching batches while the body streams.
+    """
+    return StreamingResponse(
+        ExportService.stream(db, entity, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{entity}s.{export_format}"'}
+    )
@@ -4,7 +4,7 @@ Main API router that includes all endpoint routers
 
 from fastapi import APIRouter
 
-from app.api.endpoints import projects, members, blogs, assets
+from app.api.endpoints import projects, members, blogs, assets, cache, landing, search
 
 # Create main API router
 api_router = APIRouter()
@@ -14,3 +14,6 @@ api_router.include_router(projects.router, prefix="/projects", tags=["projects"]
 api_router.include_router(members.router, prefix="/members", tags=["members"])
 api_router.include_router(blogs.router, prefix="/blogs", tags=["blogs"])
 api_router.include_router(assets.router, prefix="/assets", tags=["assets"])
+api_router.include_router(landing.router, prefix="/landing", tags=["landing"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(cache.router, prefix="/cache", tags=["cache"])
@@ -0,0 +1,25 @@
+# Cache package
+from app.cache.backends import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from app.cache.response_cache import ResponseCache, collect_tags
+from app.config import settings
+from app.services.events import subscribe
+
+
+def build_backend() -> CacheBackend:
+    """Create the backend selected by CACHE_BACKEND"""
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend.from_url(settings.CACHE_REDIS_URL)
+    return MemoryCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache(build_backend())
+subscribe(response_cache.on_change)
+
+__all__ = [
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+    "ResponseCache",
+    "collect_tags",
+    "response_cache",
+]
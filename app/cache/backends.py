@@ -0,0 +1,147 @@
+"""
+Storage backends for the response cache
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+
+class CacheBackend:
+    """Interface of a key/value store with TTLs and tag based invalidation"""
+
+    # Calls do network I/O, async callers run them in the threadpool
+    blocking = False
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop every entry stored with one of the tags"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Bounded in-process LRU with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend speaking the Redis protocol, shared by all workers
+
+    Works with a redis-py client or anything exposing the same get/set/
+    delete/sadd/smembers/expire/ttl/scan_iter/pipeline methods. Each tag is
+    a Redis set holding the keys stored under it. set() and invalidate()
+    take two pipelined round trips however many tags are involved.
+    """
+
+    blocking = True
+
+    def __init__(self, client: Any, prefix: str = "pixerse:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisCacheBackend":
+        import redis
+
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int, tags: Iterable[str] = ()) -> None:
+        full_key = self.prefix + key
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        pipe = self.client.pipeline()
+        pipe.set(full_key, value, ex=ttl)
+        for tag_key in tag_keys:
+            pipe.sadd(tag_key, full_key)
+        for tag_key in tag_keys:
+            pipe.ttl(tag_key)
+        tag_ttls = pipe.execute()[1 + len(tag_keys):]
+
+        # A tag set must outlive every key it points to
+        extend = [tag_key for tag_key, tag_ttl in zip(tag_keys, tag_ttls) if tag_ttl < ttl]
+        if extend:
+            pipe = self.client.pipeline()
+            for tag_key in extend:
+                pipe.expire(tag_key, ttl)
+            pipe.execute()
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        if not tag_keys:
+            return
+        pipe = self.client.pipeline()
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        keys = set().union(*pipe.execute())
+        self.client.delete(*keys, *tag_keys)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
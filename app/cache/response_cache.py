@@ -0,0 +1,170 @@
+"""
+Response cache for the read endpoints
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from app.cache.backends import CacheBackend
+from app.config import settings
+from app.schemas.asset import AssetResponse
+from app.schemas.blog import BlogResponse
+from app.schemas.member import MemberResponse
+from app.schemas.project import ProjectResponse
+
+logger = logging.getLogger(__name__)
+
+# Response schema -> (entity, id attribute) used to tag cached payloads
+ENTITY_SCHEMAS = (
+    (ProjectResponse, "project", "project_id"),
+    (MemberResponse, "member", "member_id"),
+    (BlogResponse, "blog", "blog_id"),
+    (AssetResponse, "asset", "asset_id"),
+)
+
+
+def collect_tags(payload: Any, tags: Optional[Set[str]] = None) -> Set[str]:
+    """Tag a payload with every entity row it embeds, e.g. {"project:1", "asset:7"}"""
+    tags = set() if tags is None else tags
+    if isinstance(payload, list):
+        for item in payload:
+            collect_tags(item, tags)
+    elif isinstance(payload, BaseModel):
+        for schema, entity, id_attr in ENTITY_SCHEMAS:
+            if isinstance(payload, schema):
+                tags.add(f"{entity}:{getattr(payload, id_attr)}")
+        for name in type(payload).model_fields:
+            value = getattr(payload, name)
+            if isinstance(value, (BaseModel, list)):
+                collect_tags(value, tags)
+    return tags
+
+
+class ResponseCache:
+    """
+    Cache of serialized JSON responses keyed by route and query string
+
+    Entries are tagged with the entities they contain. Services report
+    writes through app.services.events and on_change() drops exactly the
+    entries tagged with the changed rows, plus the entity's list pages.
+    Lookups and stores are awaited by the endpoints; calls to a blocking
+    backend such as Redis run in the threadpool, off the event loop.
+    Invalidations reported on the event loop, by services using an
+    AsyncSession, are handed to the threadpool as well and lookups wait
+    for them to finish.
+
+    A replica may not have caught up with a write yet. Responses read from
+    a replica within READ_YOUR_WRITES_SECONDS of this process's last
+    invalidation are therefore returned without being stored.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.last_invalidation = float("-inf")
+        self._pending: Set[asyncio.Future] = set()
+
+    @staticmethod
+    def key_for(route: str, request: Request) -> str:
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{route}:{request.url.path}?{query}"
+
+    @staticmethod
+    def ttl_for(route: str) -> int:
+        return settings.CACHE_ROUTE_TTLS.get(route, settings.CACHE_TTL_SECONDS)
+
+    async def _call(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.backend.blocking:
+            return await run_in_threadpool(func, *args)
+        return func(*args)
+
+    async def get(self, route: str, request: Request) -> Optional[Response]:
+        """Return the cached response for this request, if any"""
+        if not settings.CACHE_ENABLED:
+            return None
+
+        if self._pending:
+            # Never serve an entry a finished write is still dropping
+            await asyncio.wait(list(self._pending))
+        raw = await self._call(self.backend.get, self.key_for(route, request))
+        if raw is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        header_line, body = raw.split(b"\n", 1)
+        headers = json.loads(header_line)
+        headers["X-Cache"] = "HIT"
+        return Response(body, media_type="application/json", headers=headers)
+
+    async def store(
+        self,
+        route: str,
+        request: Request,
+        body: bytes,
+        tags: Iterable[str],
+        headers: Optional[Dict[str, str]] = None
+    ) -> Response:
+        """Cache a serialized JSON body and return it as a response"""
+        headers = dict(headers or {})
+        if settings.CACHE_ENABLED and not self.may_be_stale(request):
+            raw = json.dumps(headers).encode() + b"\n" + body
+            await self._call(self.backend.set, self.key_for(route, request), raw, self.ttl_for(route), tags)
+            headers["X-Cache"] = "MISS"
+        return Response(body, media_type="application/json", headers=headers)
+
+    def may_be_stale(self, request: Request) -> bool:
+        """Whether the response was read from a replica that may lag behind the last invalidation"""
+        return (
+            getattr(request.state, "read_replica", False)
+            and time.monotonic() - self.last_invalidation < settings.READ_YOUR_WRITES_SECONDS
+        )
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        self.last_invalidation = time.monotonic()
+        tags = list(tags)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or not self.backend.blocking:
+            self.backend.invalidate(tags)
+            return
+
+        future = loop.run_in_executor(None, self.backend.invalidate, tags)
+        self._pending.add(future)
+        future.add_done_callback(self._invalidated)
+
+    def _invalidated(self, future: asyncio.Future) -> None:
+        self._pending.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Cache invalidation failed", exc_info=future.exception())
+
+    def on_change(self, entity: str, ids: tuple) -> None:
+        """Change listener: drop entries embedding the rows and the entity's lists"""
+        self.invalidate([f"{entity}:list", *(f"{entity}:{row_id}" for row_id in ids)])
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.last_invalidation = float("-inf")
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": settings.CACHE_ENABLED,
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
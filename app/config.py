@@ -3,8 +3,8 @@ Configuration settings for PiXerse Backend
 """
 
 import os
-from typing import List, Optional
-from pydantic import field_validator, ConfigDict
+from typing import Dict, List, Optional
+from pydantic import field_validator, model_validator, ConfigDict
 from pydantic_settings import BaseSettings
 
 
@@ -16,15 +16,57 @@ class Settings(BaseSettings):
     # API Configuration
     API_V1_STR: str = "/api/v1"
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB in bytes
+    UPLOAD_CHUNKED_THRESHOLD: int = 6291456  # larger uploads use Cloudinary's chunked upload, keep below MAX_UPLOAD_SIZE
+    UPLOAD_CHUNK_SIZE: int = 6291456  # 6MB chunks of a chunked upload, Cloudinary needs at least 5MB
+    UPLOAD_SPOOL_DIR: str = "/tmp/pixerse/uploads"  # local copies of ?async=true uploads, shared by all workers
+    UPLOAD_WORKERS: int = 2  # background upload tasks per process, 0 disables them
+    UPLOAD_JOB_POLL_SECONDS: int = 5  # queue poll interval of idle upload workers
+    UPLOAD_JOB_MAX_ATTEMPTS: int = 5  # a job fails for good after this many attempts
+    UPLOAD_JOB_RETRY_SECONDS: int = 30  # first retry delay, doubled on every further attempt
+    UPLOAD_JOB_STALE_SECONDS: int = 900  # RUNNING jobs older than this are claimed again
     
     # Database Configuration
     DATABASE_URL: str
-    
-    # Cloudinary Configuration
-    CLOUDINARY_CLOUD_NAME: str
-    CLOUDINARY_API_KEY: str
-    CLOUDINARY_API_SECRET: str
+    DATABASE_ASYNC: bool = False  # serve requests through the asyncpg engine
+    ASYNC_DATABASE_URL: Optional[str] = None  # derived from DATABASE_URL when unset
+    DATABASE_REPLICA_URLS: List[str] = []  # read-only replicas used by GET endpoints
+    READ_YOUR_WRITES_SECONDS: int = 5  # keep a client on the primary after it writes
+    QUERY_REPEAT_THRESHOLD: int = 10  # warn when one statement repeats more often per request
+
+    # Response Cache Configuration
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "memory"  # memory or redis
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_MAX_ENTRIES: int = 1024  # LRU bound of the memory backend
+    CACHE_TTL_SECONDS: int = 60
+    CACHE_ROUTE_TTLS: Dict[str, int] = {}  # per-route overrides, e.g. {"projects:list": 30}
+    LANDING_SECTION_LIMIT: int = 20  # newest rows per section of /landing
+    LANDING_MAX_AGE_SECONDS: int = 300  # full rebuild interval, covers writes on other workers
+    EXPORT_BATCH_SIZE: int = 500  # rows fetched per server-side cursor round trip in /export
+    BULK_MAX_ITEMS: int = 1000  # items accepted by one POST /{entity}/bulk request
+    SUGGEST_WARM_ON_STARTUP: bool = True  # build the /search/suggest index before serving requests
+    SUGGEST_MAX_AGE_SECONDS: int = 300  # full reload interval, covers writes on other workers
+    SUGGEST_MAX_WORDS: int = 8  # words of a label that start a suggestion key
+    SUGGEST_KEY_LENGTH: int = 64  # characters of a label that are indexed
+
+    # Storage Configuration
+    STORAGE_BACKEND: str = "cloudinary"  # cloudinary or local
+    STORAGE_LOCAL_ROOT: str = "/var/lib/pixerse/assets"  # directory of the local backend
+    STORAGE_LOCAL_BASE_URL: str = ""  # prefixed to local file URLs, e.g. https://api.example.com
+    STORAGE_LOCAL_ACCEL_PREFIX: Optional[str] = None  # nginx internal location, files are then sent by nginx
+
+    # Cloudinary Configuration, required by the cloudinary storage backend
+    CLOUDINARY_CLOUD_NAME: str = ""
+    CLOUDINARY_API_KEY: str = ""
+    CLOUDINARY_API_SECRET: str = ""
     CLOUDINARY_URL: Optional[str] = None
+    CLOUDINARY_MAX_WORKERS: int = 4  # concurrent Cloudinary SDK calls per process, more are queued
+    CLOUDINARY_TIMEOUT_SECONDS: int = 60  # per HTTP request to Cloudinary, i.e. per chunk of a chunked upload
+    ASSET_DELETION_WORKERS: int = 1  # background tasks draining the asset_deletions outbox, 0 disables them
+    ASSET_DELETION_POLL_SECONDS: int = 10  # outbox poll interval of idle deletion workers
+    ASSET_DELETION_BATCH_SIZE: int = 100  # public IDs per delete_resources call, Cloudinary accepts at most 100
+    ASSET_DELETION_RETRY_SECONDS: int = 30  # first retry delay, doubled on every further attempt
+    ASSET_DELETION_MAX_RETRY_SECONDS: int = 3600  # cap of the retry delay, deletions are never given up
     
     # CORS Configuration
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8080", "http://127.0.0.1:3000"]
@@ -40,12 +82,29 @@ class Settings(BaseSettings):
             raise ValueError("DATABASE_URL must be a valid PostgreSQL connection string")
         return v
     
-    @field_validator("CLOUDINARY_CLOUD_NAME", mode="before")
+    @field_validator("STORAGE_BACKEND")
     @classmethod
-    def validate_cloudinary_cloud_name(cls, v: str) -> str:
-        if not v:
-            raise ValueError("CLOUDINARY_CLOUD_NAME is required")
+    def validate_storage_backend(cls, v: str) -> str:
+        if v not in ("cloudinary", "local"):
+            raise ValueError("STORAGE_BACKEND must be cloudinary or local")
         return v
+
+    @field_validator("ASSET_DELETION_BATCH_SIZE")
+    @classmethod
+    def validate_asset_deletion_batch_size(cls, v: int) -> int:
+        # Cloudinary refuses larger delete_resources calls, the outbox would retry them forever
+        if not 1 <= v <= 100:
+            raise ValueError("ASSET_DELETION_BATCH_SIZE must be between 1 and 100")
+        return v
+
+    @model_validator(mode="after")
+    def validate_cloudinary_credentials(self) -> "Settings":
+        if self.STORAGE_BACKEND != "cloudinary":
+            return self
+        for name in ("CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET"):
+            if not getattr(self, name):
+                raise ValueError(f"{name} is required by the cloudinary storage backend")
+        return self
     
     model_config = ConfigDict(
         env_file=".env",
@@ -2,10 +2,42 @@
 Database configuration and session management
 """
 
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, List, Optional, Type, Union
+
+from fastapi import Request
+from pydantic import BaseModel
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from starlette.concurrency import run_in_threadpool
+
 from app.config import settings
 
+# Cookie marking a client that wrote recently and must read from the primary
+READ_YOUR_WRITES_COOKIE = "pixerse_last_write"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the replica assigned to it
+
+    Sessions without a replica in info["replica"] behave like a plain
+    Session bound to the primary. Flushes always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is not None and not self._flushing:
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
@@ -14,18 +46,168 @@ engine = create_engine(
     max_overflow=20
 )
 
+# Read replicas, used round-robin by get_read_db()
+replica_engines: List[Engine] = [
+    create_engine(url, pool_pre_ping=True, pool_size=10, max_overflow=20)
+    for url in settings.DATABASE_REPLICA_URLS
+]
+
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
 
 # Create Base class for models
 Base = declarative_base()
 
-def get_db():
+# Either session flavour can be handed to the services through run_db()
+DBSession = Union[Session, AsyncSession]
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Convert a psycopg2 style URL into its asyncpg equivalent"""
+    async_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    # asyncpg spells libpq's sslmode as ssl
+    return async_url.replace("sslmode=", "ssl=")
+
+
+# Optional async engine; the sync engine above stays as the fallback
+async_engine = None
+async_replica_engines = []
+AsyncSessionLocal = None
+
+if settings.DATABASE_ASYNC:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL),
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20
+    )
+    async_replica_engines = [
+        create_async_engine(
+            get_async_database_url(url), pool_pre_ping=True, pool_size=10, max_overflow=20
+        )
+        for url in settings.DATABASE_REPLICA_URLS
+    ]
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        sync_session_class=RoutingSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+_replica_counter = itertools.count()
+
+
+def all_engines() -> List[Engine]:
+    """Every sync engine in use, including the ones behind async engines"""
+    engines = [engine, *replica_engines]
+    if async_engine is not None:
+        engines.extend(e.sync_engine for e in [async_engine, *async_replica_engines])
+    return engines
+
+
+def wrote_recently(request: Request) -> bool:
+    """Check whether the client is inside its read-your-writes window"""
+    last_write = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    if not last_write:
+        return False
+    try:
+        return time.time() - float(last_write) < settings.READ_YOUR_WRITES_SECONDS
+    except ValueError:
+        return False
+
+
+def choose_replica(request: Request) -> Optional[int]:
+    """Return the index of the replica serving this read, None for the primary"""
+    if not replica_engines or wrote_recently(request):
+        return None
+    return next(_replica_counter) % len(replica_engines)
+
+
+@asynccontextmanager
+async def open_session(replica: Optional[int] = None):
     """
-    Database dependency for FastAPI
+    Open a session of the configured flavour outside of a request
+
+    A plain Session is closed in the threadpool: closing rolls back and
+    returns its connection to the pool, which blocks.
     """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            if replica is not None:
+                db.info["replica"] = async_replica_engines[replica].sync_engine
+            yield db
+        return
+
     db = SessionLocal()
+    if replica is not None:
+        db.info["replica"] = replica_engines[replica]
     try:
         yield db
     finally:
-        db.close()
+        await run_in_threadpool(db.close)
+
+
+async def get_db(request: Request):
+    """
+    Database dependency for FastAPI
+
+    Yields an AsyncSession when DATABASE_ASYNC is enabled, otherwise a
+    regular Session whose work is pushed to the threadpool by run_db().
+    Always bound to the primary; when replicas are configured writes are
+    flagged for ReadYourWritesMiddleware, which opens the client's
+    read-your-writes window.
+    """
+    if replica_engines and request.method not in SAFE_METHODS:
+        request.state.primary_write = True
+
+    async with open_session() as db:
+        yield db
+
+
+async def get_read_db(request: Request):
+    """
+    Database dependency for read-only endpoints
+
+    Reads are spread round-robin over DATABASE_REPLICA_URLS, falling back
+    to the primary when no replica is configured or the client wrote within
+    READ_YOUR_WRITES_SECONDS.
+    """
+    replica = choose_replica(request)
+    # The response cache refuses to store replica reads made just after a write
+    request.state.read_replica = replica is not None
+    async with open_session(replica) as db:
+        yield db
+
+
+def _serialize(result: Any, response_model: Type[BaseModel]) -> Any:
+    if result is None:
+        return None
+    if isinstance(result, list):
+        return [response_model.model_validate(item) for item in result]
+    return response_model.model_validate(result)
+
+
+async def run_db(
+    db: DBSession,
+    func: Callable[..., Any],
+    *args: Any,
+    response_model: Optional[Type[BaseModel]] = None,
+    **kwargs: Any
+) -> Any:
+    """
+    Run a sync service function against either session flavour
+
+    AsyncSession work runs through run_sync() on the event loop, a plain
+    Session is handed to the threadpool. When response_model is given the
+    result is validated while the session is still usable, so relationship
+    loads never happen outside of it.
+    """
+    def call(session: Session) -> Any:
+        result = func(session, *args, **kwargs)
+        if response_model is not None:
+            return _serialize(result, response_model)
+        return result
+
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(call)
+    return await run_in_threadpool(call, db)
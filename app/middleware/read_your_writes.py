@@ -0,0 +1,51 @@
+"""
+Read-your-writes cookie for clients routed away from the read replicas
+"""
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.database.base import READ_YOUR_WRITES_COOKIE
+
+
+def read_your_writes_cookie() -> str:
+    """Set-Cookie value opening a READ_YOUR_WRITES_SECONDS window from now"""
+    response = Response()
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        str(time.time()),
+        max_age=settings.READ_YOUR_WRITES_SECONDS,
+        httponly=True
+    )
+    return response.headers["set-cookie"]
+
+
+class ReadYourWritesMiddleware:
+    """
+    Set the read-your-writes cookie on responses to writes
+
+    get_db() flags writes in request.state.primary_write; the cookie is
+    added here so it survives endpoints returning their own Response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Shared with request.state of the endpoint and its dependencies
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.get("primary_write"):
+                MutableHeaders(scope=message).append("set-cookie", read_your_writes_cookie())
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,62 @@
+"""
+Request body size limit for multipart uploads
+"""
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+# Room for the boundaries and part headers around the uploaded file
+FORM_OVERHEAD = 64 * 1024
+
+
+def upload_too_large_detail() -> str:
+    return f"Upload exceeds the maximum size of {settings.MAX_UPLOAD_SIZE} bytes"
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject multipart request bodies larger than MAX_UPLOAD_SIZE
+
+    A declared Content-Length over the limit is answered with 413 before
+    the body is read. Otherwise the bytes are counted as they arrive and
+    reading fails with 413 as soon as the limit is crossed, so an oversized
+    upload is never spooled to disk in full.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = settings.MAX_UPLOAD_SIZE + FORM_OVERHEAD
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": upload_too_large_detail()}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside body parsing, FastAPI passes HTTPExceptions through
+                    raise HTTPException(status_code=413, detail=upload_too_large_detail())
+            return message
+
+        await self.app(scope, limited_receive, send)
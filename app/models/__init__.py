@@ -2,8 +2,10 @@
 from .base import Base
 from .project import Project
 from .member import Member
-from .blog import Blog
+from .blog import Blog, BlogTag
 from .asset import Asset, AssetType
+from .upload_job import UploadJob, UploadJobStatus
+from .asset_deletion import AssetDeletion
 from .associations import project_assets, blog_assets, member_assets
 from .admin import AdminUser, AdminSession
 from .chat import ChatSession, ChatMessage, ToolCall, MessageRole
@@ -13,8 +15,12 @@ __all__ = [
     "Project",
     "Member", 
     "Blog",
+    "BlogTag",
     "Asset",
     "AssetType",
+    "UploadJob",
+    "UploadJobStatus",
+    "AssetDeletion",
     "project_assets",
     "blog_assets", 
     "member_assets",
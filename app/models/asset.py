@@ -2,7 +2,7 @@
 Asset model for managing Cloudinary files and YouTube embeds
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, BigInteger
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, BigInteger, Index, DDL, event
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -18,12 +18,25 @@ class AssetType(enum.Enum):
 
 class Asset(Base):
     __tablename__ = "assets"
+    __table_args__ = (
+        # Keyset pagination order, see app/services/pagination.py
+        Index("ix_assets_created_at_asset_id", "created_at", "asset_id"),
+        # Trigram indexes serving AssetService.search_assets() on PostgreSQL
+        *(
+            Index(
+                f"ix_assets_{name}_trgm", name,
+                postgresql_using="gin", postgresql_ops={name: "gin_trgm_ops"}
+            ).ddl_if(dialect="postgresql")
+            for name in ("filename", "original_filename", "description")
+        ),
+    )
 
     asset_id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(255), nullable=False)
     original_filename = Column(String(255), nullable=True)  # nullable for YouTube
     cloudinary_public_id = Column(String(255), nullable=True, unique=True, index=True)  # nullable for YouTube
     cloudinary_url = Column(Text, nullable=True)  # nullable for YouTube
+    storage_backend = Column(String(20), nullable=True)  # backend holding the file, see app.storage; None for YouTube
     asset_type = Column(Enum(AssetType), nullable=False, default=AssetType.IMAGE)
     file_size = Column(BigInteger, nullable=True, default=0)  # 0 for YouTube
     mime_type = Column(String(100), nullable=True)  # nullable for YouTube
@@ -31,6 +44,7 @@ class Asset(Base):
     height = Column(Integer, nullable=True)  # For images/videos
     youtube_video_id = Column(String(100), nullable=True)  # for YouTube videos
     description = Column(Text, nullable=True)  # alt text or video description
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of uploaded files, for deduplication
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -41,3 +55,14 @@ class Asset(Base):
 
     def __repr__(self):
         return f"<Asset(id={self.asset_id}, filename='{self.filename}', type='{self.asset_type.value}')>"
+
+
+# Byte-order public_id index walked by ReconciliationService.iter_assets()
+Index("ix_assets_cloudinary_public_id_c", Asset.cloudinary_public_id.collate("C")).ddl_if(dialect="postgresql")
+
+# The gin_trgm_ops operator class comes from the pg_trgm extension
+event.listen(
+    Asset.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
@@ -0,0 +1,24 @@
+"""
+Asset deletion model, the outbox of stored files left behind by deleted assets
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.sql import func
+
+from app.database.base import Base
+
+
+class AssetDeletion(Base):
+    __tablename__ = "asset_deletions"
+
+    deletion_id = Column(Integer, primary_key=True, index=True)
+    public_id = Column(String(255), nullable=False)
+    backend = Column(String(20), nullable=False, default="cloudinary", server_default="cloudinary")  # storage backend holding the file
+    resource_type = Column(String(20), nullable=False)  # image or video, delete_resources does not accept auto
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    run_after = Column(DateTime(timezone=True), nullable=False, index=True)  # claimable once passed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<AssetDeletion(id={self.deletion_id}, public_id='{self.public_id}', attempts={self.attempts})>"
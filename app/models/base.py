@@ -7,8 +7,10 @@ from app.database.base import Base
 # Import all models here to ensure they are registered with SQLAlchemy
 from app.models.project import Project  # noqa: F401
 from app.models.member import Member  # noqa: F401  
-from app.models.blog import Blog  # noqa: F401
+from app.models.blog import Blog, BlogTag  # noqa: F401
 from app.models.asset import Asset  # noqa: F401
+from app.models.upload_job import UploadJob  # noqa: F401
+from app.models.asset_deletion import AssetDeletion  # noqa: F401
 from app.models.associations import *  # noqa: F401, F403
 
 __all__ = ["Base"]
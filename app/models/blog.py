@@ -2,7 +2,7 @@
 Blog model
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index, DDL, event
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -11,6 +11,10 @@ from app.database.base import Base
 
 class Blog(Base):
     __tablename__ = "blogs"
+    __table_args__ = (
+        # Keyset pagination order, see app/services/pagination.py
+        Index("ix_blogs_created_at_blog_id", "created_at", "blog_id"),
+    )
 
     blog_id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.project_id", ondelete="CASCADE"), nullable=True)  # nullable for general blogs
@@ -27,6 +31,68 @@ class Blog(Base):
     project = relationship("Project", back_populates="blogs")
     author = relationship("Member", back_populates="blogs")
     assets = relationship("Asset", secondary="blog_assets", back_populates="blogs")
+    # Normalized copy of tags, kept in sync by BlogService
+    tag_rows = relationship("BlogTag", back_populates="blog", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Blog(id={self.blog_id}, title='{self.title[:50]}...')>"
+
+
+class BlogTag(Base):
+    """One row per (blog, normalized tag), backing tag filters and tag counts"""
+    __tablename__ = "blog_tags"
+
+    blog_id = Column(Integer, ForeignKey("blogs.blog_id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(100), primary_key=True, index=True)
+
+    blog = relationship("Blog", back_populates="tag_rows")
+
+    def __repr__(self):
+        return f"<BlogTag(blog_id={self.blog_id}, tag='{self.tag}')>"
+
+
+# Full-text search, see BlogService.search_blogs(). The search structures are
+# not mapped columns: PostgreSQL gets a generated tsvector with a GIN index,
+# SQLite (tests, local development) an FTS5 index kept in sync by triggers.
+POSTGRES_SEARCH_DDL = (
+    """
+    ALTER TABLE blogs ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B') ||
+        setweight(json_to_tsvector('english', coalesce(tags, '[]'::json), '["string"]'), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_blogs_search_vector ON blogs USING GIN (search_vector)",
+)
+
+SQLITE_SEARCH_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS blogs_fts USING fts5(
+        title, content, tags, content='blogs', content_rowid='blog_id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_insert AFTER INSERT ON blogs BEGIN
+        INSERT INTO blogs_fts(rowid, title, content, tags) VALUES (new.blog_id, new.title, new.content, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_delete AFTER DELETE ON blogs BEGIN
+        INSERT INTO blogs_fts(blogs_fts, rowid, title, content, tags)
+        VALUES ('delete', old.blog_id, old.title, old.content, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_update AFTER UPDATE ON blogs BEGIN
+        INSERT INTO blogs_fts(blogs_fts, rowid, title, content, tags)
+        VALUES ('delete', old.blog_id, old.title, old.content, old.tags);
+        INSERT INTO blogs_fts(rowid, title, content, tags) VALUES (new.blog_id, new.title, new.content, new.tags);
+    END
+    """,
+)
+
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(Blog.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Blog.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Blog.__table__, "before_drop", DDL("DROP TABLE IF EXISTS blogs_fts").execute_if(dialect="sqlite"))
@@ -2,7 +2,7 @@
 Member model
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -11,6 +11,13 @@ from app.database.base import Base
 
 class Member(Base):
     __tablename__ = "members"
+    __table_args__ = (
+        # Keyset pagination order, see app/services/pagination.py
+        Index("ix_members_created_at_member_id", "created_at", "member_id"),
+        # Directory filters and facet grouping, see MemberService.get_member_facets()
+        Index("ix_members_team_type_role_experience", "team_type", "role", "experience"),
+        Index("ix_members_role_experience", "role", "experience"),
+    )
 
     member_id = Column(Integer, primary_key=True, index=True)
     member_name = Column(String(255), nullable=False)
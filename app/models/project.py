@@ -2,7 +2,7 @@
 Project model
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -11,6 +11,10 @@ from app.database.base import Base
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Keyset pagination order, see app/services/pagination.py
+        Index("ix_projects_created_at_project_id", "created_at", "project_id"),
+    )
 
     project_id = Column(Integer, primary_key=True, index=True)
     project_name = Column(String(255), nullable=False, index=True)
@@ -0,0 +1,46 @@
+"""
+Upload job model, the queue behind asynchronous asset uploads
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, BigInteger, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+import enum
+
+from app.database.base import Base
+
+
+class UploadJobStatus(enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+class UploadJob(Base):
+    __tablename__ = "upload_jobs"
+    __table_args__ = (
+        # Claim order of UploadJobService.claim_next_job()
+        Index("ix_upload_jobs_status_job_id", "status", "job_id"),
+    )
+
+    job_id = Column(Integer, primary_key=True, index=True)
+    status = Column(Enum(UploadJobStatus), nullable=False, default=UploadJobStatus.QUEUED)
+    spool_path = Column(String(500), nullable=False)  # local copy of the upload until it is sent
+    original_filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=True)
+    file_size = Column(BigInteger, nullable=False)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 taken while spooling
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)  # last failure
+    asset_id = Column(Integer, ForeignKey("assets.asset_id", ondelete="SET NULL"), nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)  # start of the current attempt
+    run_after = Column(DateTime(timezone=True), nullable=True)  # retry backoff, claimable once passed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    asset = relationship("Asset")
+
+    def __repr__(self):
+        return f"<UploadJob(id={self.job_id}, status='{self.status}', filename='{self.original_filename}')>"
@@ -5,3 +5,7 @@ from .blog import *
 from .asset import *
 from .admin import *
 from .chat import *
+from .landing import *
+from .search import *
+from .bulk import *
+from .upload_job import *
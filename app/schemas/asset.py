@@ -35,6 +35,8 @@ class AssetUpdate(BaseModel):
 
 class AssetResponse(AssetBase):
     asset_id: int
+    content_hash: Optional[str] = Field(None, description="SHA-256 of the uploaded file")
+    storage_backend: Optional[str] = Field(None, description="Storage backend holding the file, cloudinary or local")
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -56,6 +58,38 @@ class FileUploadResponse(BaseModel):
     asset: AssetResponse
 
 
+# Direct-to-Cloudinary upload schemas
+class SignedUploadRequest(BaseModel):
+    asset_type: AssetType = Field(default=AssetType.IMAGE, description="IMAGE or VIDEO")
+
+
+class SignedUploadParams(BaseModel):
+    upload_url: str = Field(..., description="Cloudinary endpoint to POST the file to")
+    api_key: str
+    cloud_name: str
+    folder: str
+    public_id: str
+    timestamp: int
+    signature: str
+    expires_at: int = Field(..., description="Unix time after which Cloudinary refuses the signature")
+
+
+class SignedUploadRegistration(BaseModel):
+    # Fields of the Cloudinary upload response
+    public_id: str = Field(..., min_length=1, max_length=255, description="public_id returned by Cloudinary")
+    version: int = Field(..., description="version returned by Cloudinary")
+    signature: str = Field(..., min_length=1, description="signature returned by Cloudinary")
+    resource_type: Optional[str] = Field(
+        None, pattern="^(image|video)$", description="resource_type returned by Cloudinary, must match the folder"
+    )
+    format: Optional[str] = Field(None, max_length=20, description="format returned by Cloudinary")
+    bytes: Optional[int] = Field(None, ge=0, description="bytes returned by Cloudinary")
+    width: Optional[int] = Field(None, ge=0)
+    height: Optional[int] = Field(None, ge=0)
+    original_filename: Optional[str] = Field(None, max_length=255, description="Name of the file on the client")
+    description: Optional[str] = Field(None, description="Alt text or video description")
+
+
 # YouTube embed schema
 class YouTubeEmbedRequest(BaseModel):
     youtube_video_id: str = Field(..., min_length=1, max_length=100, description="YouTube video ID")
@@ -66,6 +100,11 @@ class AssetAttachRequest(BaseModel):
     asset_ids: List[int] = Field(..., description="List of asset IDs to attach")
 
 
+class AssetLinkResponse(BaseModel):
+    # Ids already attached (or not attached, for detach) are left out
+    asset_ids: List[int] = Field(..., description="Asset IDs attached or detached by this request")
+
+
 # Forward references for circular imports
 from app.schemas.project import ProjectResponse  # noqa: E402
 from app.schemas.blog import BlogResponse  # noqa: E402
@@ -39,6 +39,11 @@ class BlogResponse(BlogBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class BlogTagCount(BaseModel):
+    tag: str
+    count: int = Field(..., description="Number of blogs with this tag")
+
+
 class BlogDetailResponse(BlogResponse):
     # Include related data
     project: Optional["ProjectResponse"] = None
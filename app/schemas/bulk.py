@@ -0,0 +1,25 @@
+"""
+Bulk create schemas for response
+"""
+
+from typing import Any, Dict, Generic, List, TypeVar
+from pydantic import BaseModel
+
+__all__ = ["BulkItemError", "BulkCreatedItem", "BulkCreateResponse"]
+
+ItemT = TypeVar("ItemT")
+
+
+class BulkItemError(BaseModel):
+    index: int  # position of the item in the request payload
+    errors: List[Dict[str, Any]]
+
+
+class BulkCreatedItem(BaseModel, Generic[ItemT]):
+    index: int  # position of the item in the request payload
+    item: ItemT
+
+
+class BulkCreateResponse(BaseModel, Generic[ItemT]):
+    created: List[BulkCreatedItem[ItemT]] = []
+    errors: List[BulkItemError] = []
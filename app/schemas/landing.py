@@ -0,0 +1,19 @@
+"""
+Landing page schemas for response
+"""
+
+from typing import List
+from pydantic import BaseModel
+
+from app.schemas.project import ProjectResponse
+from app.schemas.member import MemberResponse
+from app.schemas.blog import BlogResponse
+from app.schemas.asset import AssetResponse
+
+
+class LandingResponse(BaseModel):
+    # Newest rows of every section, see LANDING_SECTION_LIMIT
+    projects: List[ProjectResponse] = []
+    members: List[MemberResponse] = []
+    blogs: List[BlogResponse] = []
+    assets: List[AssetResponse] = []
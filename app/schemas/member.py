@@ -3,7 +3,7 @@ Member schemas for request/response
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -48,6 +48,27 @@ class MemberDetailResponse(MemberResponse):
     model_config = ConfigDict(from_attributes=True)
 
 
+class MemberFilters(BaseModel):
+    team_type: Optional[str] = Field(None, description="Filter by team type")
+    role: Optional[str] = Field(None, description="Filter by role")
+    min_experience: Optional[int] = Field(None, ge=0, description="Minimum years of experience")
+    max_experience: Optional[int] = Field(None, ge=0, description="Maximum years of experience")
+
+
+class MemberFacets(BaseModel):
+    # Value -> number of members, each facet ignores its own filter
+    team_type: Dict[str, int] = {}
+    role: Dict[str, int] = {}
+    experience: Dict[int, int] = {}
+
+
+class MemberDirectoryResponse(BaseModel):
+    items: List[MemberResponse]
+    total: int = Field(..., description="Number of members matching all filters")
+    facets: MemberFacets
+    next_cursor: Optional[str] = None
+
+
 # Forward references for circular imports
 from app.schemas.project import ProjectResponse  # noqa: E402
 from app.schemas.asset import AssetResponse  # noqa: E402
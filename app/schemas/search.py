@@ -0,0 +1,17 @@
+"""
+Search schemas for response
+"""
+
+from typing import List
+from pydantic import BaseModel
+
+
+class Suggestion(BaseModel):
+    entity: str  # project, member, blog or asset
+    id: int
+    label: str
+
+
+class SuggestResponse(BaseModel):
+    query: str
+    suggestions: List[Suggestion] = []
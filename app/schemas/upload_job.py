@@ -0,0 +1,24 @@
+"""
+Upload job schemas for response
+"""
+
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+from app.models.upload_job import UploadJobStatus
+
+
+class UploadJobResponse(BaseModel):
+    job_id: int
+    status: UploadJobStatus
+    original_filename: str
+    file_size: int
+    attempts: int
+    error: Optional[str] = None  # last failure, kept while a retry is pending
+    asset_id: Optional[int] = None  # set once the upload is DONE
+    run_after: Optional[datetime] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
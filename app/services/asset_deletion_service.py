@@ -0,0 +1,147 @@
+"""
+Outbox of stored file deletions and the worker draining it
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.base import run_db
+from app.models.asset_deletion import AssetDeletion
+from app.services.workers import PollingWorker
+from app.storage import get_backend
+
+logger = logging.getLogger(__name__)
+
+# StorageBackend.delete_many() outcomes after which the file is gone
+DELETED_STATES = ("deleted", "not_found")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff after the given number of attempts, doubling up to ASSET_DELETION_MAX_RETRY_SECONDS"""
+    seconds = settings.ASSET_DELETION_RETRY_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, settings.ASSET_DELETION_MAX_RETRY_SECONDS))
+
+
+class AssetDeletionService:
+    @staticmethod
+    def queue_deletion(db: Session, public_id: str, resource_type: str, backend: str) -> AssetDeletion:
+        """
+        Add a stored file to the outbox; it is committed with the caller's transaction
+
+        backend names the storage backend holding the file, which is not
+        necessarily the one STORAGE_BACKEND selects for new uploads.
+        """
+        db_deletion = AssetDeletion(
+            public_id=public_id,
+            backend=backend,
+            resource_type=resource_type,
+            attempts=0,
+            run_after=_utcnow()
+        )
+        db.add(db_deletion)
+        return db_deletion
+
+    @staticmethod
+    def claim_batch(db: Session) -> List[AssetDeletion]:
+        """
+        Lease up to ASSET_DELETION_BATCH_SIZE due deletions, oldest first
+
+        Claiming pushes run_after out by the retry delay of the attempt, so
+        a failed call or a dead worker leaves the rows to be claimed again
+        once the backoff has passed, without a second write. On PostgreSQL
+        rows locked by another worker are skipped.
+        """
+        now = _utcnow()
+        rows = db.scalars(
+            select(AssetDeletion)
+            .where(AssetDeletion.run_after <= now)
+            .order_by(AssetDeletion.deletion_id)
+            .limit(settings.ASSET_DELETION_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        ).all()
+        for row in rows:
+            row.attempts += 1
+            row.run_after = now + retry_delay(row.attempts)
+        db.flush()
+        # Keep the claimed values through the commit
+        for row in rows:
+            db.expunge(row)
+        db.commit()
+        return list(rows)
+
+    @staticmethod
+    def complete(db: Session, deletion_ids: List[int]) -> int:
+        """Remove finished deletions from the outbox"""
+        result = db.execute(delete(AssetDeletion).where(AssetDeletion.deletion_id.in_(deletion_ids)))
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def record_failure(db: Session, deletion_ids: List[int], error: str) -> None:
+        """Remember why an attempt failed, the retry is already scheduled by claim_batch()"""
+        db.execute(
+            update(AssetDeletion).where(AssetDeletion.deletion_id.in_(deletion_ids)).values(last_error=error)
+        )
+        db.commit()
+
+
+class AssetDeletionWorker(PollingWorker):
+    """
+    Background tasks removing the stored files of deleted assets
+
+    Files are deleted with one delete_many() call per backend, resource
+    type and batch; for Cloudinary that is one delete_resources request
+    instead of one request per asset. Each row goes to the backend it was
+    queued for, whichever backend STORAGE_BACKEND currently selects.
+    """
+
+    def poll_seconds(self) -> float:
+        return settings.ASSET_DELETION_POLL_SECONDS
+
+    async def run_once(self) -> bool:
+        """Claim and send one batch, False when nothing is due"""
+        async with self.session_factory() as db:
+            claimed = await run_db(db, AssetDeletionService.claim_batch)
+        if not claimed:
+            return False
+
+        groups: Dict[Tuple[str, str], List[AssetDeletion]] = defaultdict(list)
+        for deletion in claimed:
+            groups[deletion.backend, deletion.resource_type].append(deletion)
+
+        for (backend, resource_type), deletions in groups.items():
+            await self.send(backend, resource_type, deletions)
+        return True
+
+    async def send(self, backend: str, resource_type: str, deletions: List[AssetDeletion]) -> None:
+        try:
+            outcome = await get_backend(backend).delete_many(
+                [deletion.public_id for deletion in deletions], resource_type
+            )
+        except Exception as e:
+            logger.warning("Deleting %d stored files failed: %s", len(deletions), e)
+            failed, error = deletions, str(e)
+        else:
+            failed = [deletion for deletion in deletions if outcome.get(deletion.public_id) not in DELETED_STATES]
+            error = "; ".join(f"{deletion.public_id}: {outcome.get(deletion.public_id)}" for deletion in failed)
+
+        failed_ids = [deletion.deletion_id for deletion in failed]
+        done_ids = [deletion.deletion_id for deletion in deletions if deletion.deletion_id not in failed_ids]
+        async with self.session_factory() as db:
+            if done_ids:
+                await run_db(db, AssetDeletionService.complete, done_ids)
+            if failed_ids:
+                await run_db(db, AssetDeletionService.record_failure, failed_ids, error)
+
+
+asset_deletion_worker = AssetDeletionWorker()
@@ -0,0 +1,52 @@
+"""
+Set-based attach/detach of assets on the association tables
+"""
+
+from typing import Iterable, List
+
+from fastapi import HTTPException
+from sqlalchemy import Table, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.asset import Asset
+from app.services.bulk import existing_values
+
+# INSERT constructs offering ON CONFLICT DO NOTHING, per dialect
+_CONFLICT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def attach_assets(db: Session, link: Table, owner_column: str, owner_id: int, asset_ids: Iterable[int]) -> List[int]:
+    """
+    Link assets to an owner row, returning the asset ids that were not linked yet
+
+    One existence check for the assets and one INSERT ... ON CONFLICT DO
+    NOTHING RETURNING, whatever the size of the owner's collection.
+    """
+    wanted = list(dict.fromkeys(asset_ids))
+    if not wanted:
+        return []
+
+    found = existing_values(db, Asset.asset_id, wanted)
+    missing = [asset_id for asset_id in wanted if asset_id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Assets not found: {missing}")
+
+    statement = _CONFLICT_INSERTS[db.get_bind().dialect.name](link).on_conflict_do_nothing()
+    rows = [{owner_column: owner_id, "asset_id": asset_id} for asset_id in wanted]
+    return list(db.scalars(statement.returning(link.c.asset_id), rows))
+
+
+def detach_assets(db: Session, link: Table, owner_column: str, owner_id: int, asset_ids: Iterable[int]) -> List[int]:
+    """Unlink assets from an owner row in one DELETE, returning the asset ids that were linked"""
+    wanted = list(dict.fromkeys(asset_ids))
+    if not wanted:
+        return []
+
+    statement = delete(link).where(
+        link.c[owner_column] == owner_id, link.c.asset_id.in_(wanted)
+    ).returning(link.c.asset_id)
+    return list(db.scalars(statement))
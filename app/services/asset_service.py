@@ -2,50 +2,123 @@
 Asset CRUD service
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
+import mimetypes
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session, selectinload
 from fastapi import UploadFile, HTTPException
 
-from app.models.asset import Asset
-from app.schemas.asset import AssetCreate, AssetUpdate
+from app.database.base import DBSession, run_db
+from app.models.asset import Asset, AssetType
+from app.schemas.asset import AssetCreate, AssetUpdate, SignedUploadRegistration
+from app.services.asset_deletion_service import AssetDeletionService, asset_deletion_worker
+from app.services.async_service import AsyncService
+from app.services.bulk import created_items, existing_values, insert_returning, item_error, validate_items
+from app.services.events import notify_change
+from app.services.fieldsets import apply_fields
+from app.services.pagination import paginate
 from app.services.cloudinary_service import CloudinaryService
+from app.services.uploads import get_folder_by_type, get_upload_size
+from app.storage import get_storage
+
+
+# Loader plan matching AssetDetailResponse: one SELECT ... IN per collection
+ASSET_DETAIL_LOADERS = (
+    selectinload(Asset.projects),
+    selectinload(Asset.blogs),
+    selectinload(Asset.members),
+)
 
 
 class AssetService:
     @staticmethod
-    def get_assets(db: Session, skip: int = 0, limit: int = 100) -> List[Asset]:
-        """Get all assets with pagination"""
-        return db.query(Asset).offset(skip).limit(limit).all()
+    def get_assets(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Asset]:
+        """Get all assets with offset or keyset pagination"""
+        query = apply_fields(db.query(Asset), Asset, fields)
+        return paginate(query, Asset.created_at, Asset.asset_id, skip, limit, cursor).all()
 
     @staticmethod
     def get_asset_by_id(db: Session, asset_id: int) -> Optional[Asset]:
         """Get asset by ID"""
         return db.query(Asset).filter(Asset.asset_id == asset_id).first()
 
+    @staticmethod
+    def get_asset_detail(db: Session, asset_id: int) -> Optional[Asset]:
+        """Get asset by ID with the relationships of AssetDetailResponse eagerly loaded"""
+        return db.query(Asset).options(*ASSET_DETAIL_LOADERS).filter(Asset.asset_id == asset_id).first()
+
     @staticmethod
     def get_asset_by_public_id(db: Session, public_id: str) -> Optional[Asset]:
         """Get asset by Cloudinary public ID"""
         return db.query(Asset).filter(Asset.cloudinary_public_id == public_id).first()
 
     @staticmethod
-    async def upload_and_create_asset(db: Session, file: UploadFile) -> Asset:
-        """Upload file to Cloudinary and create asset record"""
+    def get_asset_by_content_hash(db: Session, content_hash: str) -> Optional[Asset]:
+        """Get the oldest asset uploaded with the given content hash"""
+        return db.query(Asset).filter(Asset.content_hash == content_hash).order_by(Asset.asset_id).first()
+
+    @staticmethod
+    async def upload_and_create_asset(db: DBSession, file: UploadFile) -> Tuple[Asset, bool]:
+        """
+        Store an uploaded file with the storage backend and create asset record
+
+        Returns the asset and whether it was created: the backend hashes the
+        file while storing it, and when an earlier upload has the same
+        SHA-256 its asset is returned and the new copy is deleted.
+        """
+        # Failures already surface as HTTPException
+        upload_data = await get_storage().save(file.file, file.filename, file.content_type, get_upload_size(file))
+
+        asset, created = await run_db(db, AssetService.create_uploaded_asset, upload_data)
+        if not created:
+            asset_deletion_worker.wake()
+        return asset, created
+
+    @staticmethod
+    def create_uploaded_asset(db: Session, upload_data: Dict[str, Any]) -> Tuple[Asset, bool]:
+        """
+        Create asset record from storage backend upload metadata
+
+        A file whose content_hash matches an existing asset gets no record,
+        the existing asset is returned and the file is added to the deletion
+        outbox.
+        """
+        existing_asset = AssetService.get_asset_by_content_hash(db, upload_data["content_hash"])
+        if existing_asset:
+            AssetDeletionService.queue_deletion(
+                db,
+                upload_data["cloudinary_public_id"],
+                CloudinaryService.get_resource_type(upload_data["asset_type"]),
+                upload_data["storage_backend"]
+            )
+            db.commit()
+            return existing_asset, False
         try:
-            # Upload to Cloudinary
-            upload_data = await CloudinaryService.upload_file(file)
-            
-            # Create asset record in database
             db_asset = Asset(**upload_data)
             db.add(db_asset)
             db.commit()
             db.refresh(db_asset)
+            notify_change("asset", db_asset.asset_id)
             
-            return db_asset
+            return db_asset, True
             
         except Exception as e:
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to create asset: {str(e)}")
 
+    @staticmethod
+    def asset_row(asset_data: AssetCreate) -> Dict[str, Any]:
+        """Column values of an asset whose file, if any, is already in Cloudinary"""
+        row = asset_data.model_dump()
+        row["storage_backend"] = "cloudinary" if asset_data.cloudinary_public_id else None
+        return row
+
     @staticmethod
     def create_asset(db: Session, asset_data: AssetCreate) -> Asset:
         """Create asset record (for assets already uploaded to Cloudinary)"""
@@ -54,23 +127,86 @@ class AssetService:
         if existing_asset:
             raise HTTPException(status_code=400, detail="Asset with this public ID already exists")
         
-        db_asset = Asset(
-            filename=asset_data.filename,
-            original_filename=asset_data.original_filename,
-            cloudinary_public_id=asset_data.cloudinary_public_id,
-            cloudinary_url=asset_data.cloudinary_url,
-            cloudinary_secure_url=asset_data.cloudinary_secure_url,
-            asset_type=asset_data.asset_type,
-            file_size=asset_data.file_size,
-            mime_type=asset_data.mime_type,
-            width=asset_data.width,
-            height=asset_data.height
-        )
+        db_asset = Asset(**AssetService.asset_row(asset_data))
         db.add(db_asset)
         db.commit()
         db.refresh(db_asset)
+        notify_change("asset", db_asset.asset_id)
         return db_asset
 
+    @staticmethod
+    def register_signed_upload(db: Session, registration: SignedUploadRegistration) -> Asset:
+        """
+        Create the asset record of a file uploaded straight to Cloudinary
+
+        Cloudinary signs the response of any upload to the account, so the
+        public_id must also lie in one of the folders sign_upload() signs
+        for; the asset type and resource type follow from that folder. Only
+        the public_id and version are covered by the signature, so the URL
+        is derived from them rather than taken from the client.
+        """
+        if not CloudinaryService.verify_upload(registration.public_id, registration.version, registration.signature):
+            raise HTTPException(status_code=400, detail="Invalid upload signature")
+
+        folder, _, _ = registration.public_id.rpartition("/")
+        signed_folders = {get_folder_by_type(asset_type): asset_type for asset_type in (AssetType.IMAGE, AssetType.VIDEO)}
+        asset_type = signed_folders.get(folder)
+        if asset_type is None:
+            raise HTTPException(status_code=400, detail="Upload is outside the folders signed for direct uploads")
+        resource_type = CloudinaryService.get_resource_type(asset_type)
+        if registration.resource_type is not None and registration.resource_type != resource_type:
+            raise HTTPException(status_code=400, detail=f"Uploads in this folder are of resource type {resource_type}")
+
+        mime_type = None
+        if registration.format:
+            mime_type, _ = mimetypes.guess_type(f"file.{registration.format}")
+
+        asset_data = AssetCreate(
+            filename=registration.public_id.split("/")[-1],
+            original_filename=registration.original_filename,
+            cloudinary_public_id=registration.public_id,
+            cloudinary_url=CloudinaryService.build_url(
+                registration.public_id, asset_type, registration.version, registration.format
+            ),
+            asset_type=asset_type,
+            file_size=registration.bytes,
+            mime_type=mime_type,
+            width=registration.width,
+            height=registration.height,
+            description=registration.description
+        )
+        return AssetService.create_asset(db, asset_data)
+
+    @staticmethod
+    def bulk_create_assets(
+        db: Session, items: List[Any]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Create the valid assets of a payload in one INSERT, returning them and errors by payload index"""
+        valid, errors = validate_items(items, AssetCreate)
+        taken = existing_values(
+            db, Asset.cloudinary_public_id, (asset.cloudinary_public_id for _, asset in valid)
+        )
+
+        rows, indexes = [], []
+        for index, asset in valid:
+            public_id = asset.cloudinary_public_id
+            if public_id is not None and public_id in taken:
+                errors.append(item_error(
+                    index, "cloudinary_public_id", "Asset with this public ID already exists", "duplicate"
+                ))
+                continue
+            if public_id is not None:
+                # Later items repeating a public ID of this payload are rejected as well
+                taken.add(public_id)
+            rows.append(AssetService.asset_row(asset))
+            indexes.append(index)
+
+        assets = insert_returning(db, Asset, rows)
+        db.commit()
+        notify_change("asset", *(asset.asset_id for asset in assets))
+        errors.sort(key=lambda error: error["index"])
+        return created_items(indexes, assets), errors
+
     @staticmethod
     def update_asset(db: Session, asset_id: int, asset_data: AssetUpdate) -> Optional[Asset]:
         """Update asset metadata"""
@@ -85,37 +221,86 @@ class AssetService:
         
         db.commit()
         db.refresh(db_asset)
+        notify_change("asset", asset_id)
         return db_asset
 
     @staticmethod
-    def delete_asset(db: Session, asset_id: int, delete_from_cloudinary: bool = True) -> bool:
-        """Delete asset and optionally remove from Cloudinary"""
-        db_asset = AssetService.get_asset_by_id(db, asset_id)
+    async def delete_asset(db: DBSession, asset_id: int, delete_from_cloudinary: bool = True) -> bool:
+        """
+        Delete asset and optionally remove its file from Cloudinary
+
+        The stored file is only queued for deletion, in the transaction
+        deleting the row; the outbox worker removes it in the background.
+        """
+        deleted = await run_db(db, AssetService.delete_asset_row, asset_id, delete_from_cloudinary)
+        if deleted and delete_from_cloudinary:
+            asset_deletion_worker.wake()
+        return deleted
+
+    @staticmethod
+    def delete_asset_row(db: Session, asset_id: int, delete_from_cloudinary: bool = False) -> bool:
+        """Delete the asset row, adding its stored file to the deletion outbox when requested"""
+        db_asset = db.get(Asset, asset_id)
         if not db_asset:
             return False
-        
-        # Delete from Cloudinary if requested
-        if delete_from_cloudinary:
-            cloudinary_deleted = CloudinaryService.delete_file(db_asset.cloudinary_public_id)
-            if not cloudinary_deleted:
-                # Log warning but continue with database deletion
-                print(f"Warning: Failed to delete asset {db_asset.cloudinary_public_id} from Cloudinary")
-        
-        # Delete from database
+        # YouTube embeds have nothing stored
+        if delete_from_cloudinary and db_asset.cloudinary_public_id:
+            AssetDeletionService.queue_deletion(
+                db,
+                db_asset.cloudinary_public_id,
+                CloudinaryService.get_resource_type(db_asset.asset_type),
+                # Rows written before storage_backend existed are all Cloudinary files
+                db_asset.storage_backend or "cloudinary"
+            )
         db.delete(db_asset)
         db.commit()
+        notify_change("asset", asset_id)
         return True
 
     @staticmethod
-    def get_assets_by_type(db: Session, asset_type: str, skip: int = 0, limit: int = 100) -> List[Asset]:
+    def get_assets_by_type(
+        db: Session,
+        asset_type: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Asset]:
         """Get assets filtered by type"""
-        return db.query(Asset).filter(Asset.asset_type == asset_type).offset(skip).limit(limit).all()
+        query = apply_fields(db.query(Asset), Asset, fields).filter(Asset.asset_type == asset_type)
+        return paginate(query, Asset.created_at, Asset.asset_id, skip, limit, cursor).all()
 
     @staticmethod
-    def search_assets(db: Session, search_term: str, skip: int = 0, limit: int = 100) -> List[Asset]:
-        """Search assets by filename or original filename"""
-        search_pattern = f"%{search_term}%"
-        return db.query(Asset).filter(
-            (Asset.filename.ilike(search_pattern)) | 
-            (Asset.original_filename.ilike(search_pattern))
-        ).offset(skip).limit(limit).all()
+    def search_assets(
+        db: Session, search_term: str, skip: int = 0, limit: int = 100, fields: Optional[List[str]] = None
+    ) -> Tuple[List[Asset], int]:
+        """
+        Search assets by filename, original filename or description
+
+        Returns the page and the total number of matches. On PostgreSQL the
+        substring and similarity (%) filters are served by the pg_trgm GIN
+        indexes and results are ranked by trigram similarity. The total comes
+        from a count(*) OVER () window on the same query.
+        """
+        columns = (Asset.filename, Asset.original_filename, Asset.description)
+        escaped = search_term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"%{escaped}%"
+        matches = [column.ilike(pattern, escape="\\") for column in columns]
+
+        query = apply_fields(db.query(Asset, func.count().over()), Asset, fields)
+        if db.get_bind().dialect.name == "postgresql":
+            matches.extend(column.op("%")(search_term) for column in columns)
+            rank = func.greatest(*(func.similarity(column, search_term) for column in columns))
+            query = query.filter(or_(*matches)).order_by(rank.desc(), Asset.asset_id)
+        else:
+            query = query.filter(or_(*matches)).order_by(Asset.asset_id)
+
+        rows = query.offset(skip).limit(limit).all()
+        if rows:
+            return [asset for asset, _ in rows], rows[0][1]
+        # Past the last page the window has no row to report on
+        total = db.query(func.count(Asset.asset_id)).filter(or_(*matches)).scalar() if skip else 0
+        return [], total
+
+
+AsyncAssetService = AsyncService(AssetService)
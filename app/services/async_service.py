@@ -0,0 +1,37 @@
+"""
+Async adapter for the CRUD services
+"""
+
+import inspect
+from typing import Any, Callable
+
+from app.database.base import DBSession, run_db
+
+
+class AsyncService:
+    """
+    Expose a sync service class as awaitable methods
+
+    Every static method of the wrapped service becomes a coroutine taking
+    the same arguments. The query code is shared with the sync service and
+    executed through run_db(), so it works with both AsyncSession and the
+    sync Session fallback.
+    """
+
+    def __init__(self, service: type):
+        self._service = service
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        func = getattr(self._service, name)
+        if inspect.iscoroutinefunction(func):
+            return func
+
+        async def call(db: DBSession, *args: Any, **kwargs: Any) -> Any:
+            return await run_db(db, func, *args, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = func.__doc__
+        return call
+
+    def __repr__(self) -> str:
+        return f"<AsyncService({self._service.__name__})>"
@@ -2,21 +2,60 @@
 Blog CRUD service
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import column, func, insert, literal_column, select, table
+from sqlalchemy.orm import Session, joinedload, selectinload
 from fastapi import HTTPException
 
-from app.models.blog import Blog
-from app.models.asset import Asset
+from app.models.blog import Blog, BlogTag
+from app.models.member import Member
+from app.models.associations import blog_assets
+from app.models.project import Project
 from app.schemas.blog import BlogCreate, BlogUpdate
 from app.services.project_service import ProjectService
+from app.services.asset_links import attach_assets, detach_assets
+from app.services.async_service import AsyncService
+from app.services.bulk import created_items, existing_values, insert_returning, item_error, validate_items
+from app.services.events import notify_change
+from app.services.fieldsets import apply_fields
+from app.services.pagination import paginate
+
+
+# Loader plan matching BlogDetailResponse: many-to-one joined, collections via SELECT ... IN
+BLOG_DETAIL_LOADERS = (
+    joinedload(Blog.project),
+    joinedload(Blog.author),
+    selectinload(Blog.assets),
+)
+
+# FTS5 index maintained by triggers on SQLite, see app/models/blog.py
+_blogs_fts = table("blogs_fts", column("rowid"), column("rank"), column("blogs_fts"))
+
+
+def fts5_query(search_term: str) -> str:
+    """Quote every word so user input is never parsed as FTS5 query syntax"""
+    return " ".join('"{}"'.format(word.replace('"', '""')) for word in search_term.split())
+
+
+def normalize_tags(tags: Optional[Iterable[str]]) -> List[str]:
+    """Lowercase, trimmed, de-duplicated tags in their original order"""
+    normalized = (tag.strip().lower()[:100] for tag in tags or ())
+    return list(dict.fromkeys(tag for tag in normalized if tag))
 
 
 class BlogService:
     @staticmethod
-    def get_blogs(db: Session, skip: int = 0, limit: int = 100) -> List[Blog]:
-        """Get all blogs with pagination"""
-        return db.query(Blog).offset(skip).limit(limit).all()
+    def get_blogs(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        tag: Optional[str] = None
+    ) -> List[Blog]:
+        """Get all blogs with offset or keyset pagination, optionally by tag"""
+        query = BlogService._filter_tag(apply_fields(db.query(Blog), Blog, fields), tag)
+        return paginate(query, Blog.created_at, Blog.blog_id, skip, limit, cursor).all()
 
     @staticmethod
     def get_blog_by_id(db: Session, blog_id: int) -> Optional[Blog]:
@@ -24,28 +63,116 @@ class BlogService:
         return db.query(Blog).filter(Blog.blog_id == blog_id).first()
 
     @staticmethod
-    def get_blogs_by_project(db: Session, project_id: int) -> List[Blog]:
-        """Get all blogs of a specific project"""
-        return db.query(Blog).filter(Blog.project_id == project_id).all()
+    def get_blog_detail(db: Session, blog_id: int) -> Optional[Blog]:
+        """Get blog by ID with the relationships of BlogDetailResponse eagerly loaded"""
+        return db.query(Blog).options(*BLOG_DETAIL_LOADERS).filter(Blog.blog_id == blog_id).first()
+
+    @staticmethod
+    def get_blogs_by_project(
+        db: Session, project_id: int, fields: Optional[List[str]] = None, tag: Optional[str] = None
+    ) -> List[Blog]:
+        """Get all blogs of a specific project, optionally by tag"""
+        query = BlogService._filter_tag(apply_fields(db.query(Blog), Blog, fields), tag)
+        return query.filter(Blog.project_id == project_id).all()
+
+    @staticmethod
+    def _filter_tag(query, tag: Optional[str]):
+        # (blog_id, tag) is the primary key, the join never duplicates a blog
+        normalized = normalize_tags([tag] if tag else None)
+        if not normalized:
+            return query
+        return query.join(BlogTag, BlogTag.blog_id == Blog.blog_id).filter(BlogTag.tag == normalized[0])
+
+    @staticmethod
+    def get_tag_counts(db: Session, limit: int = 100) -> List[Tuple[str, int]]:
+        """Get tags with their number of blogs, most used first"""
+        count = func.count(BlogTag.blog_id)
+        return db.query(BlogTag.tag, count).group_by(BlogTag.tag).order_by(count.desc(), BlogTag.tag).limit(limit).all()
+
+    @staticmethod
+    def _sync_tags(db_blog: Blog) -> None:
+        """Make blog_tags match Blog.tags, touching only the rows that changed"""
+        wanted = normalize_tags(db_blog.tags)
+        kept = [row for row in db_blog.tag_rows if row.tag in wanted]
+        existing = {row.tag for row in kept}
+        db_blog.tag_rows = kept + [BlogTag(tag=tag) for tag in wanted if tag not in existing]
+
+    @staticmethod
+    def search_blogs(
+        db: Session, search_term: str, skip: int = 0, limit: int = 100, fields: Optional[List[str]] = None
+    ) -> List[Blog]:
+        """Full-text search over title, content and tags, best matches first"""
+        query = apply_fields(db.query(Blog), Blog, fields)
+
+        if db.get_bind().dialect.name == "postgresql":
+            search_vector = literal_column("blogs.search_vector")
+            ts_query = func.websearch_to_tsquery("english", search_term)
+            query = query.filter(search_vector.op("@@")(ts_query)).order_by(
+                func.ts_rank(search_vector, ts_query).desc(), Blog.blog_id
+            )
+        else:
+            match_query = fts5_query(search_term)
+            if not match_query:
+                return []
+            matches = select(_blogs_fts.c.rowid, _blogs_fts.c.rank).where(
+                _blogs_fts.c.blogs_fts.op("MATCH")(match_query)
+            ).subquery()
+            # FTS5 rank is bm25(), lower is better
+            query = query.join(matches, matches.c.rowid == Blog.blog_id).order_by(matches.c.rank, Blog.blog_id)
+
+        return query.offset(skip).limit(limit).all()
 
     @staticmethod
     def create_blog(db: Session, blog_data: BlogCreate) -> Blog:
         """Create new blog"""
-        # Verify project exists
-        project = ProjectService.get_project_by_id(db, blog_data.project_id)
-        if not project:
+        # Verify project (optional for general blogs) and author exist
+        if blog_data.project_id is not None and not ProjectService.get_project_by_id(db, blog_data.project_id):
             raise HTTPException(status_code=404, detail="Project not found")
+        if not db.get(Member, blog_data.author_id):
+            raise HTTPException(status_code=404, detail="Author not found")
         
-        db_blog = Blog(
-            project_id=blog_data.project_id,
-            title=blog_data.title,
-            detail=blog_data.detail
-        )
+        db_blog = Blog(**blog_data.model_dump())
+        BlogService._sync_tags(db_blog)
         db.add(db_blog)
         db.commit()
         db.refresh(db_blog)
+        notify_change("blog", db_blog.blog_id)
+        notify_change("project", db_blog.project_id)
+        notify_change("member", db_blog.author_id)
         return db_blog
 
+    @staticmethod
+    def bulk_create_blogs(
+        db: Session, items: List[Any]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Create the valid blogs of a payload in one INSERT, returning them and errors by payload index"""
+        valid, errors = validate_items(items, BlogCreate)
+        project_ids = existing_values(db, Project.project_id, (blog.project_id for _, blog in valid))
+        author_ids = existing_values(db, Member.member_id, (blog.author_id for _, blog in valid))
+
+        rows, indexes = [], []
+        for index, blog in valid:
+            if blog.project_id is not None and blog.project_id not in project_ids:
+                errors.append(item_error(index, "project_id", "Project not found", "not_found"))
+            elif blog.author_id not in author_ids:
+                errors.append(item_error(index, "author_id", "Author not found", "not_found"))
+            else:
+                rows.append(blog.model_dump())
+                indexes.append(index)
+
+        blogs = insert_returning(db, Blog, rows)
+        tag_rows = [
+            {"blog_id": blog.blog_id, "tag": tag} for blog in blogs for tag in normalize_tags(blog.tags)
+        ]
+        if tag_rows:
+            db.execute(insert(BlogTag), tag_rows)
+        db.commit()
+        notify_change("blog", *(blog.blog_id for blog in blogs))
+        notify_change("project", *{blog.project_id for blog in blogs})
+        notify_change("member", *{blog.author_id for blog in blogs})
+        errors.sort(key=lambda error: error["index"])
+        return created_items(indexes, blogs), errors
+
     @staticmethod
     def update_blog(db: Session, blog_id: int, blog_data: BlogUpdate) -> Optional[Blog]:
         """Update blog"""
@@ -53,13 +180,20 @@ class BlogService:
         if not db_blog:
             return None
         
+        old_project_id, old_author_id = db_blog.project_id, db_blog.author_id
+
         # Update only provided fields
         update_data = blog_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_blog, field, value)
+        if "tags" in update_data:
+            BlogService._sync_tags(db_blog)
         
         db.commit()
         db.refresh(db_blog)
+        notify_change("blog", blog_id)
+        notify_change("project", old_project_id, db_blog.project_id)
+        notify_change("member", old_author_id, db_blog.author_id)
         return db_blog
 
     @staticmethod
@@ -69,46 +203,39 @@ class BlogService:
         if not db_blog:
             return False
         
+        project_id, author_id = db_blog.project_id, db_blog.author_id
+
         db.delete(db_blog)
         db.commit()
+        notify_change("blog", blog_id)
+        notify_change("project", project_id)
+        notify_change("member", author_id)
         return True
 
     @staticmethod
-    def attach_assets_to_blog(db: Session, blog_id: int, asset_ids: List[int]) -> Optional[Blog]:
-        """Attach assets to blog"""
-        db_blog = BlogService.get_blog_by_id(db, blog_id)
-        if not db_blog:
+    def attach_assets_to_blog(db: Session, blog_id: int, asset_ids: List[int]) -> List[int]:
+        """Attach assets to blog, returning the ids that were not attached yet"""
+        if not BlogService.get_blog_by_id(db, blog_id):
             raise HTTPException(status_code=404, detail="Blog not found")
-        
-        # Get assets
-        assets = db.query(Asset).filter(Asset.asset_id.in_(asset_ids)).all()
-        if len(assets) != len(asset_ids):
-            found_ids = [asset.asset_id for asset in assets]
-            missing_ids = [aid for aid in asset_ids if aid not in found_ids]
-            raise HTTPException(status_code=404, detail=f"Assets not found: {missing_ids}")
-        
-        # Attach assets (avoid duplicates)
-        for asset in assets:
-            if asset not in db_blog.assets:
-                db_blog.assets.append(asset)
-        
+
+        attached = attach_assets(db, blog_assets, "blog_id", blog_id, asset_ids)
         db.commit()
-        db.refresh(db_blog)
-        return db_blog
+        if attached:
+            notify_change("blog", blog_id)
+            notify_change("asset", *attached)
+        return attached
 
     @staticmethod
-    def detach_assets_from_blog(db: Session, blog_id: int, asset_ids: List[int]) -> Optional[Blog]:
-        """Detach assets from blog"""
-        db_blog = BlogService.get_blog_by_id(db, blog_id)
-        if not db_blog:
+    def detach_assets_from_blog(db: Session, blog_id: int, asset_ids: List[int]) -> List[int]:
+        """Detach assets from blog, returning the ids that were attached"""
+        if not BlogService.get_blog_by_id(db, blog_id):
             raise HTTPException(status_code=404, detail="Blog not found")
-        
-        # Remove assets
-        for asset_id in asset_ids:
-            asset_to_remove = next((asset for asset in db_blog.assets if asset.asset_id == asset_id), None)
-            if asset_to_remove:
-                db_blog.assets.remove(asset_to_remove)
-        
+
+        detached = detach_assets(db, blog_assets, "blog_id", blog_id, asset_ids)
         db.commit()
-        db.refresh(db_blog)
-        return db_blog
+        if detached:
+            notify_change("blog", blog_id)
+            notify_change("asset", *detached)
+        return detached
+
+AsyncBlogService = AsyncService(BlogService)
@@ -0,0 +1,74 @@
+"""
+Helpers shared by the bulk create service methods
+"""
+
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Set, Tuple, Type, TypeVar
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+def item_error(index: int, field: str, message: str, error_type: str = "value_error") -> Dict[str, Any]:
+    """Error entry for one item of a bulk payload, shaped like a validation error"""
+    return {"index": index, "errors": [{"loc": [field], "msg": message, "type": error_type}]}
+
+
+def validate_items(
+    items: List[Any], schema: Type[SchemaT]
+) -> Tuple[List[Tuple[int, SchemaT]], List[Dict[str, Any]]]:
+    """
+    Validate every item on its own, returning (index, model) pairs and per-item errors
+
+    Items that are not objects are reported like any other invalid item.
+    """
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.BULK_MAX_ITEMS} items per bulk request"
+        )
+
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as e:
+            errors.append({"index": index, "errors": e.errors(include_url=False, include_input=False)})
+    return valid, errors
+
+
+def existing_values(db: Session, column, values: Iterable[Any]) -> Set[Any]:
+    """Which of the values are present in a column, in one query"""
+    wanted = {value for value in values if value is not None}
+    if not wanted:
+        return set()
+    return set(db.scalars(select(column).where(column.in_(wanted))))
+
+
+def created_items(indexes: List[int], created: List[Any]) -> List[Dict[str, Any]]:
+    """Pair created rows with the payload index of their item, in the shape of BulkCreatedItem"""
+    return [{"index": index, "item": obj} for index, obj in zip(indexes, created)]
+
+
+def insert_returning(db: Session, model: type, rows: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Insert rows in one multi-row INSERT ... RETURNING, in payload order
+
+    Rows are put back in payload order by their autoincrement key rather
+    than with sort_by_parameter_order, which makes SQLite fall back to one
+    INSERT per row. The returned objects are detached before the caller
+    commits, so they keep their RETURNING values instead of being expired
+    and refreshed one by one.
+    """
+    if not rows:
+        return []
+    pk = inspect(model).primary_key[0].key
+    created = sorted(db.scalars(insert(model).returning(model), rows).all(), key=attrgetter(pk))
+    for obj in created:
+        db.expunge(obj)
+    return created
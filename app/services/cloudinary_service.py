@@ -2,123 +2,211 @@
 Cloudinary service for file upload and management
 """
 
+import asyncio
+import functools
+import logging
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
-from typing import Dict, Any, Optional
+import cloudinary.utils
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Dict, Any, List, Optional
 from fastapi import UploadFile, HTTPException
-import mimetypes
 import os
+import time
+import urllib3
+import uuid
 
 from app.config import settings
 from app.models.asset import AssetType
+from app.services.uploads import check_upload, get_folder_by_type, get_upload_size
 
 # Configure Cloudinary
 cloudinary.config(
     cloud_name=settings.CLOUDINARY_CLOUD_NAME,
     api_key=settings.CLOUDINARY_API_KEY,
-    api_secret=settings.CLOUDINARY_API_SECRET
+    api_secret=settings.CLOUDINARY_API_SECRET,
+    timeout=settings.CLOUDINARY_TIMEOUT_SECONDS
 )
 
+logger = logging.getLogger(__name__)
 
-class CloudinaryService:
-    @staticmethod
-    def get_asset_type_from_mime(mime_type: str) -> AssetType:
-        """Determine asset type from MIME type"""
-        if mime_type.startswith('image/'):
-            return AssetType.IMAGE
-        elif mime_type.startswith('video/'):
-            return AssetType.VIDEO
-        elif mime_type in ['application/pdf', 'text/plain', 'application/msword', 
-                          'application/vnd.openxmlformats-officedocument.wordprocessingml.document']:
-            return AssetType.DOCUMENT
-        else:
-            return AssetType.OTHER
+# Cloudinary refuses signed requests whose timestamp is older than an hour
+SIGNATURE_LIFETIME_SECONDS = 3600
+
+# The SDK is blocking. Its calls run in this pool rather than on the event
+# loop or in the threadpool serving sync database sessions, so slow uploads
+# can neither stall other requests nor starve database work.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.CLOUDINARY_MAX_WORKERS, thread_name_prefix="cloudinary"
+)
+
+
+async def run_sdk(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking Cloudinary SDK call in the Cloudinary pool with the configured timeout"""
+    kwargs.setdefault("timeout", settings.CLOUDINARY_TIMEOUT_SECONDS)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def _timed_out(error: Exception) -> bool:
+    # The SDK re-raises transport errors as cloudinary.exceptions.Error
+    cause = error.__context__
+    cause = getattr(cause, "reason", None) or cause
+    return isinstance(cause, urllib3.exceptions.TimeoutError)
 
-    @staticmethod
-    def get_folder_by_type(asset_type: AssetType) -> str:
-        """Get Cloudinary folder based on asset type"""
-        folder_mapping = {
-            AssetType.IMAGE: "pixerse/images",
-            AssetType.VIDEO: "pixerse/videos", 
-            AssetType.DOCUMENT: "pixerse/documents",
-            AssetType.OTHER: "pixerse/others"
-        }
-        return folder_mapping.get(asset_type, "pixerse/others")
 
+class CloudinaryService:
     @staticmethod
     async def upload_file(file: UploadFile) -> Dict[str, Any]:
         """
         Upload file to Cloudinary and return metadata
+
+        The file is sent from the spooled temporary file the form parser
+        streamed it into, never read into memory as a whole.
+        """
+        return await CloudinaryService.upload_stream(
+            file.file, file.filename, file.content_type, get_upload_size(file)
+        )
+
+    @staticmethod
+    async def upload_stream(
+        stream: BinaryIO, filename: Optional[str], content_type: Optional[str], file_size: int
+    ) -> Dict[str, Any]:
         """
+        Upload an open binary file to Cloudinary and return asset metadata
+
+        Files larger than UPLOAD_CHUNKED_THRESHOLD go through Cloudinary's
+        chunked upload, in chunks of UPLOAD_CHUNK_SIZE.
+        """
+        mime_type, asset_type = check_upload(filename, content_type, file_size)
+        stream.seek(0)
+        
+        # Upload options
+        upload_options = {
+            "folder": get_folder_by_type(asset_type),
+            "resource_type": "auto",  # Auto-detect resource type
+            "use_filename": True,
+            "unique_filename": True,
+            "overwrite": False,
+            "filename": filename  # name of the stream for use_filename
+        }
+        
         try:
-            # Validate file
-            if not file.filename:
-                raise HTTPException(status_code=400, detail="No file selected")
-            
-            # Get MIME type
-            mime_type, _ = mimetypes.guess_type(file.filename)
-            if not mime_type:
-                mime_type = file.content_type or "application/octet-stream"
-            
-            # Determine asset type and folder
-            asset_type = CloudinaryService.get_asset_type_from_mime(mime_type)
-            folder = CloudinaryService.get_folder_by_type(asset_type)
-            
-            # Read file content
-            file_content = await file.read()
-            
-            # Upload options
-            upload_options = {
-                "folder": folder,
-                "resource_type": "auto",  # Auto-detect resource type
-                "use_filename": True,
-                "unique_filename": True,
-                "overwrite": False
-            }
-            
             # Upload to Cloudinary
-            result = cloudinary.uploader.upload(file_content, **upload_options)
-            
-            # Prepare response data
-            upload_data = {
-                "filename": os.path.splitext(result["public_id"].split("/")[-1])[0],
-                "original_filename": file.filename,
-                "cloudinary_public_id": result["public_id"],
-                "cloudinary_url": result["url"],
-                "cloudinary_secure_url": result["secure_url"],
-                "asset_type": asset_type,
-                "file_size": result.get("bytes"),
-                "mime_type": mime_type,
-                "width": result.get("width"),
-                "height": result.get("height")
-            }
-            
-            return upload_data
-            
+            if file_size > settings.UPLOAD_CHUNKED_THRESHOLD:
+                result = await run_sdk(
+                    cloudinary.uploader.upload_large,
+                    stream, chunk_size=settings.UPLOAD_CHUNK_SIZE, **upload_options
+                )
+            else:
+                result = await run_sdk(cloudinary.uploader.upload, stream, **upload_options)
         except Exception as e:
+            if _timed_out(e):
+                raise HTTPException(status_code=504, detail="File upload timed out")
             raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
+        
+        # Prepare response data
+        upload_data = {
+            "filename": os.path.splitext(result["public_id"].split("/")[-1])[0],
+            "original_filename": filename,
+            "cloudinary_public_id": result["public_id"],
+            "cloudinary_url": result["secure_url"],
+            "asset_type": asset_type,
+            "file_size": result.get("bytes", file_size),
+            "mime_type": mime_type,
+            "width": result.get("width"),
+            "height": result.get("height")
+        }
+        
+        return upload_data
 
     @staticmethod
-    def delete_file(public_id: str, resource_type: str = "auto") -> bool:
+    def sign_upload(asset_type: AssetType) -> Dict[str, Any]:
+        """
+        Signed parameters for uploading one file straight to Cloudinary
+
+        The folder and a fresh public_id are part of the signature, so the
+        browser can only upload a single new file where the API would have
+        put it.
+        """
+        if asset_type not in (AssetType.IMAGE, AssetType.VIDEO):
+            raise HTTPException(status_code=400, detail=f"Cannot upload assets of type {asset_type.value}")
+
+        config = cloudinary.config()
+        timestamp = int(time.time())
+        params = {
+            "folder": get_folder_by_type(asset_type),
+            "public_id": uuid.uuid4().hex,
+            "timestamp": timestamp,
+        }
+        signature = cloudinary.utils.api_sign_request(
+            params, config.api_secret, config.signature_algorithm or cloudinary.utils.SIGNATURE_SHA1
+        )
+        return {
+            **params,
+            "signature": signature,
+            "api_key": config.api_key,
+            "cloud_name": config.cloud_name,
+            "upload_url": cloudinary.utils.cloudinary_api_url(
+                "upload", resource_type=CloudinaryService.get_resource_type(asset_type)
+            ),
+            "expires_at": timestamp + SIGNATURE_LIFETIME_SECONDS,
+        }
+
+    @staticmethod
+    def verify_upload(public_id: str, version: int, signature: str) -> bool:
+        """Check the signature Cloudinary put on an upload response"""
+        return cloudinary.utils.verify_api_response_signature(public_id, version, signature)
+
+    @staticmethod
+    def build_url(public_id: str, asset_type: AssetType, version: int, file_format: Optional[str]) -> str:
+        """Delivery URL of an uploaded file, as upload() returns it in secure_url"""
+        url, _ = cloudinary.utils.cloudinary_url(
+            public_id,
+            resource_type=CloudinaryService.get_resource_type(asset_type),
+            version=version,
+            format=file_format,
+            secure=True
+        )
+        return url
+
+    @staticmethod
+    def get_resource_type(asset_type: AssetType) -> str:
+        """Cloudinary resource type of an asset type, destroy() does not accept auto"""
+        return "video" if asset_type == AssetType.VIDEO else "image"
+
+    @staticmethod
+    async def delete_file(public_id: str, resource_type: str = "image") -> bool:
         """
         Delete file from Cloudinary
         """
         try:
-            result = cloudinary.uploader.destroy(public_id, resource_type=resource_type)
+            result = await run_sdk(cloudinary.uploader.destroy, public_id, resource_type=resource_type)
             return result.get("result") == "ok"
         except Exception as e:
-            print(f"Error deleting file from Cloudinary: {str(e)}")
+            logger.warning("Error deleting %s from Cloudinary: %s", public_id, e)
             return False
 
     @staticmethod
-    def get_file_info(public_id: str) -> Optional[Dict[str, Any]]:
+    async def delete_files(public_ids: List[str], resource_type: str = "image") -> Dict[str, str]:
+        """
+        Delete up to 100 files with one Admin API call, returning the outcome per public ID
+
+        Unlike delete_file() failures are raised, callers retry them.
+        """
+        result = await run_sdk(
+            cloudinary.api.delete_resources, public_ids, resource_type=resource_type, type="upload"
+        )
+        return result.get("deleted", {})
+
+    @staticmethod
+    async def get_file_info(public_id: str) -> Optional[Dict[str, Any]]:
         """
         Get file information from Cloudinary
         """
         try:
-            result = cloudinary.api.resource(public_id)
-            return result
+            return await run_sdk(cloudinary.api.resource, public_id)
         except Exception as e:
-            print(f"Error getting file info from Cloudinary: {str(e)}")
+            logger.warning("Error getting %s from Cloudinary: %s", public_id, e)
             return None
@@ -0,0 +1,40 @@
+"""
+Change notifications emitted by the services after a successful commit
+"""
+
+import logging
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Listeners are called as listener(entity, ids), e.g. ("project", (3,))
+ChangeListener = Callable[[str, tuple], None]
+
+_listeners: List[ChangeListener] = []
+
+
+def subscribe(listener: ChangeListener) -> None:
+    """Register a listener for entity changes"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def unsubscribe(listener: ChangeListener) -> None:
+    """Remove a previously registered listener"""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def notify_change(entity: str, *ids: Optional[int]) -> None:
+    """
+    Tell listeners that rows of an entity were created, updated or deleted
+
+    None ids are ignored so optional foreign keys can be passed directly.
+    A failing listener is logged and never breaks the write that triggered it.
+    """
+    changed = tuple(i for i in ids if i is not None)
+    for listener in list(_listeners):
+        try:
+            listener(entity, changed)
+        except Exception:
+            logger.exception("Change listener %r failed for %s %s", listener, entity, changed)
@@ -0,0 +1,116 @@
+"""
+Streaming export service
+"""
+
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterator, Sequence, Union
+
+from sqlalchemy import inspect, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.config import settings
+from app.database.base import DBSession
+from app.models.asset import Asset
+from app.models.blog import Blog
+from app.models.member import Member
+from app.models.project import Project
+from app.schemas.asset import AssetResponse
+from app.schemas.blog import BlogResponse
+from app.schemas.member import MemberResponse
+from app.schemas.project import ProjectResponse
+
+# Entity -> (model, schema defining the exported fields)
+EXPORT_ENTITIES = {
+    "project": (Project, ProjectResponse),
+    "member": (Member, MemberResponse),
+    "blog": (Blog, BlogResponse),
+    "asset": (Asset, AssetResponse),
+}
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class ExportService:
+    @staticmethod
+    def export_statement(entity: str) -> Select:
+        """Plain column SELECT of a table in primary key order, no ORM identity map"""
+        model, _ = EXPORT_ENTITIES[entity]
+        pk = inspect(model).primary_key[0]
+        return select(model.__table__).order_by(pk).execution_options(
+            yield_per=settings.EXPORT_BATCH_SIZE
+        )
+
+    @staticmethod
+    def iter_batches(db: Session, entity: str) -> Iterator[Sequence[Row]]:
+        """Fetch rows batch by batch through a server-side cursor"""
+        result = db.execute(ExportService.export_statement(entity))
+        yield from result.partitions()
+
+    @staticmethod
+    async def aiter_batches(db: AsyncSession, entity: str) -> AsyncIterator[Sequence[Row]]:
+        """Async variant of iter_batches() using AsyncSession.stream()"""
+        result = await db.stream(ExportService.export_statement(entity))
+        async for batch in result.partitions():
+            yield batch
+
+    @staticmethod
+    def encode_batch(entity: str, rows: Sequence[Row], export_format: str, header: bool = False) -> bytes:
+        """Serialize a batch of rows as NDJSON lines or CSV records"""
+        _, schema = EXPORT_ENTITIES[entity]
+        records = [schema.model_validate(row) for row in rows]
+
+        if export_format == "ndjson":
+            return b"".join(record.model_dump_json().encode("utf-8") + b"\n" for record in records)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(schema.model_fields)
+        for record in records:
+            writer.writerow(_csv_value(value) for value in record.model_dump(mode="json").values())
+        return buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def stream(db: DBSession, entity: str, export_format: str) -> Union[Iterator[bytes], AsyncIterator[bytes]]:
+        """
+        Encoded export body, one chunk per EXPORT_BATCH_SIZE rows
+
+        A sync Session yields a regular generator, which StreamingResponse
+        advances in the threadpool; an AsyncSession yields an async one.
+        Only a single batch is held in memory at a time either way.
+        """
+        if isinstance(db, AsyncSession):
+            return ExportService._aiter_chunks(db, entity, export_format)
+        return ExportService._iter_chunks(db, entity, export_format)
+
+    @staticmethod
+    def _iter_chunks(db: Session, entity: str, export_format: str) -> Iterator[bytes]:
+        header = export_format == "csv"
+        for batch in ExportService.iter_batches(db, entity):
+            yield ExportService.encode_batch(entity, batch, export_format, header)
+            header = False
+        if header:
+            yield ExportService.encode_batch(entity, [], export_format, header)
+
+    @staticmethod
+    async def _aiter_chunks(db: AsyncSession, entity: str, export_format: str) -> AsyncIterator[bytes]:
+        header = export_format == "csv"
+        async for batch in ExportService.aiter_batches(db, entity):
+            yield ExportService.encode_batch(entity, batch, export_format, header)
+            header = False
+        if header:
+            yield ExportService.encode_batch(entity, [], export_format, header)
@@ -0,0 +1,42 @@
+"""
+Sparse fieldset (?fields=) helpers
+"""
+
+from typing import Any, Dict, List, Optional, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import Query, load_only
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    """Validate a comma separated ?fields= value against a response schema"""
+    if not fields:
+        return None
+
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in schema.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {unknown}")
+    return requested or None
+
+
+def apply_fields(query: Query, model: type, fields: Optional[List[str]]) -> Query:
+    """
+    Restrict the loaded columns to the requested fields
+
+    The primary key and created_at are always loaded, they identify the row
+    and carry the keyset pagination position.
+    """
+    if not fields:
+        return query
+
+    mapper = inspect(model)
+    columns = {mapper.primary_key[0].key, "created_at", *fields}
+    return query.options(load_only(*(getattr(model, name) for name in columns)))
+
+
+def select_fields(items: List[Any], fields: List[str]) -> List[Dict[str, Any]]:
+    """Build response rows holding only the requested fields"""
+    return [{name: getattr(item, name) for name in fields} for item in items]
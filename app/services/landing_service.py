@@ -0,0 +1,134 @@
+"""
+Landing page snapshot service
+"""
+
+import hashlib
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.base import DBSession, run_db
+from app.models.asset import Asset
+from app.models.blog import Blog
+from app.models.member import Member
+from app.models.project import Project
+from app.schemas.asset import AssetResponse
+from app.schemas.blog import BlogResponse
+from app.schemas.member import MemberResponse
+from app.schemas.project import ProjectResponse
+from app.services.events import subscribe
+
+# Section name -> (model, response schema), in payload order
+LANDING_SECTIONS = {
+    "projects": (Project, ProjectResponse),
+    "members": (Member, MemberResponse),
+    "blogs": (Blog, BlogResponse),
+    "assets": (Asset, AssetResponse),
+}
+
+# Entity names used by app.services.events -> section
+ENTITY_SECTIONS = {
+    "project": "projects",
+    "member": "members",
+    "blog": "blogs",
+    "asset": "assets",
+}
+
+_adapters = {name: TypeAdapter(List[schema]) for name, (_, schema) in LANDING_SECTIONS.items()}
+
+
+class LandingService:
+    @staticmethod
+    def get_section(db: Session, section: str) -> List:
+        """Get the newest rows of a landing section"""
+        model, _ = LANDING_SECTIONS[section]
+        pk = inspect(model).primary_key[0]
+        return db.query(model).order_by(
+            model.created_at.desc(), pk.desc()
+        ).limit(settings.LANDING_SECTION_LIMIT).all()
+
+    @staticmethod
+    def build_sections(db: Session, sections: Iterable[str]) -> Dict[str, bytes]:
+        """Query and serialize the given sections to JSON arrays"""
+        built = {}
+        for section in sections:
+            _, schema = LANDING_SECTIONS[section]
+            rows = [schema.model_validate(row) for row in LandingService.get_section(db, section)]
+            built[section] = _adapters[section].dump_json(rows)
+        return built
+
+
+class LandingSnapshot:
+    """
+    Ready-to-send bytes of the landing payload
+
+    Writes reported through app.services.events only mark their section
+    dirty; the next read re-queries the dirty sections and splices them
+    into the cached payload, so a snapshot hit never touches the database.
+    LANDING_MAX_AGE_SECONDS bounds how long another worker's writes can
+    go unnoticed.
+    """
+
+    def __init__(self):
+        self._sections: Dict[str, bytes] = {}
+        self._dirty = set(LANDING_SECTIONS)
+        self._body: Optional[bytes] = None
+        self._etag: Optional[str] = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def on_change(self, entity: str, ids: tuple) -> None:
+        """Change listener: mark the entity's section for rebuilding"""
+        section = ENTITY_SECTIONS.get(entity)
+        if section is not None:
+            with self._lock:
+                self._dirty.add(section)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sections.clear()
+            self._dirty = set(LANDING_SECTIONS)
+            self._body = None
+            self._etag = None
+            self.rebuilds = 0
+
+    def _take_dirty(self) -> List[str]:
+        with self._lock:
+            expired = time.monotonic() - self._built_at >= settings.LANDING_MAX_AGE_SECONDS
+            if self._body is None or expired:
+                self._dirty = set(LANDING_SECTIONS)
+            dirty, self._dirty = self._dirty, set()
+        return [section for section in LANDING_SECTIONS if section in dirty]
+
+    async def get(self, db: DBSession) -> Tuple[bytes, str]:
+        """Return the payload and its ETag, rebuilding dirty sections first"""
+        dirty = self._take_dirty()
+        if dirty:
+            # Writes landing while this runs mark their section dirty again
+            # and are picked up by the next read
+            try:
+                built = await run_db(db, LandingService.build_sections, dirty)
+            except Exception:
+                with self._lock:
+                    self._dirty.update(dirty)
+                raise
+            with self._lock:
+                self._sections.update(built)
+                self._body = b"{" + b",".join(
+                    b'"%s":%s' % (name.encode(), self._sections[name]) for name in LANDING_SECTIONS
+                ) + b"}"
+                self._etag = f'"{hashlib.sha1(self._body).hexdigest()}"'
+                if len(dirty) == len(LANDING_SECTIONS):
+                    self._built_at = time.monotonic()
+                self.rebuilds += 1
+        return self._body, self._etag
+
+
+landing_snapshot = LandingSnapshot()
+subscribe(landing_snapshot.on_change)
@@ -2,21 +2,97 @@
 Member CRUD service
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
 from fastapi import HTTPException
 
 from app.models.member import Member
-from app.models.asset import Asset
-from app.schemas.member import MemberCreate, MemberUpdate
+from app.models.associations import member_assets
+from app.models.project import Project
+from app.schemas.member import MemberCreate, MemberUpdate, MemberFilters
 from app.services.project_service import ProjectService
+from app.services.asset_links import attach_assets, detach_assets
+from app.services.async_service import AsyncService
+from app.services.bulk import created_items, existing_values, insert_returning, item_error, validate_items
+from app.services.events import notify_change
+from app.services.fieldsets import apply_fields
+from app.services.pagination import paginate
+
+
+# Loader plan matching MemberDetailResponse: many-to-one joined, collections via SELECT ... IN
+MEMBER_DETAIL_LOADERS = (
+    joinedload(Member.project),
+    selectinload(Member.assets),
+    selectinload(Member.blogs),
+)
 
 
 class MemberService:
     @staticmethod
-    def get_members(db: Session, skip: int = 0, limit: int = 100) -> List[Member]:
-        """Get all members with pagination"""
-        return db.query(Member).offset(skip).limit(limit).all()
+    def get_members(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        filters: Optional[MemberFilters] = None
+    ) -> List[Member]:
+        """Get all members with offset or keyset pagination and optional filters"""
+        query = MemberService._filter(apply_fields(db.query(Member), Member, fields), filters)
+        return paginate(query, Member.created_at, Member.member_id, skip, limit, cursor).all()
+
+    @staticmethod
+    def _filter(query: Query, filters: Optional[MemberFilters]) -> Query:
+        if filters is None:
+            return query
+        if filters.team_type is not None:
+            query = query.filter(Member.team_type == filters.team_type)
+        if filters.role is not None:
+            query = query.filter(Member.role == filters.role)
+        if filters.min_experience is not None:
+            query = query.filter(Member.experience >= filters.min_experience)
+        if filters.max_experience is not None:
+            query = query.filter(Member.experience <= filters.max_experience)
+        return query
+
+    @staticmethod
+    def get_member_facets(db: Session, filters: Optional[MemberFilters] = None) -> Tuple[Dict[str, Any], int]:
+        """
+        Facet counts and total number of matching members
+
+        One GROUP BY (team_type, role, experience) over the whole table is
+        folded in Python. Each facet applies every filter except its own, so
+        the counts show what selecting another value would return.
+        """
+        filters = filters or MemberFilters()
+        groups = db.query(
+            Member.team_type, Member.role, Member.experience, func.count()
+        ).group_by(Member.team_type, Member.role, Member.experience).all()
+
+        def matches(team_type: str, role: str, experience: int, skip: str = "") -> bool:
+            return (
+                (skip == "team_type" or filters.team_type is None or team_type == filters.team_type)
+                and (skip == "role" or filters.role is None or role == filters.role)
+                and (skip == "experience" or (
+                    (filters.min_experience is None or experience >= filters.min_experience)
+                    and (filters.max_experience is None or experience <= filters.max_experience)
+                ))
+            )
+
+        facets: Dict[str, Dict[Any, int]] = {"team_type": {}, "role": {}, "experience": {}}
+        total = 0
+        for team_type, role, experience, count in groups:
+            values = {"team_type": team_type, "role": role, "experience": experience}
+            for facet, value in values.items():
+                if matches(team_type, role, experience, skip=facet):
+                    facets[facet][value] = facets[facet].get(value, 0) + count
+            if matches(team_type, role, experience):
+                total += count
+
+        for facet, counts in facets.items():
+            facets[facet] = dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+        return facets, total
 
     @staticmethod
     def get_member_by_id(db: Session, member_id: int) -> Optional[Member]:
@@ -24,30 +100,59 @@ class MemberService:
         return db.query(Member).filter(Member.member_id == member_id).first()
 
     @staticmethod
-    def get_members_by_project(db: Session, project_id: int) -> List[Member]:
-        """Get all members of a specific project"""
-        return db.query(Member).filter(Member.project_id == project_id).all()
+    def get_member_detail(db: Session, member_id: int) -> Optional[Member]:
+        """Get member by ID with the relationships of MemberDetailResponse eagerly loaded"""
+        return db.query(Member).options(*MEMBER_DETAIL_LOADERS).filter(Member.member_id == member_id).first()
+
+    @staticmethod
+    def get_members_by_project(
+        db: Session,
+        project_id: int,
+        fields: Optional[List[str]] = None,
+        filters: Optional[MemberFilters] = None
+    ) -> List[Member]:
+        """Get all members of a specific project with optional filters"""
+        query = MemberService._filter(apply_fields(db.query(Member), Member, fields), filters)
+        return query.filter(Member.project_id == project_id).all()
 
     @staticmethod
     def create_member(db: Session, member_data: MemberCreate) -> Member:
         """Create new member"""
-        # Verify project exists
-        project = ProjectService.get_project_by_id(db, member_data.project_id)
-        if not project:
+        # Verify project exists (optional for general members)
+        if member_data.project_id is not None and not ProjectService.get_project_by_id(db, member_data.project_id):
             raise HTTPException(status_code=404, detail="Project not found")
         
-        db_member = Member(
-            project_id=member_data.project_id,
-            team_type=member_data.team_type,
-            role=member_data.role,
-            experience=member_data.experience,
-            summary=member_data.summary
-        )
+        db_member = Member(**member_data.model_dump())
         db.add(db_member)
         db.commit()
         db.refresh(db_member)
+        notify_change("member", db_member.member_id)
+        notify_change("project", db_member.project_id)
         return db_member
 
+    @staticmethod
+    def bulk_create_members(
+        db: Session, items: List[Any]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Create the valid members of a payload in one INSERT, returning them and errors by payload index"""
+        valid, errors = validate_items(items, MemberCreate)
+        project_ids = existing_values(db, Project.project_id, (member.project_id for _, member in valid))
+
+        rows, indexes = [], []
+        for index, member in valid:
+            if member.project_id is not None and member.project_id not in project_ids:
+                errors.append(item_error(index, "project_id", "Project not found", "not_found"))
+            else:
+                rows.append(member.model_dump())
+                indexes.append(index)
+
+        members = insert_returning(db, Member, rows)
+        db.commit()
+        notify_change("member", *(member.member_id for member in members))
+        notify_change("project", *{member.project_id for member in members})
+        errors.sort(key=lambda error: error["index"])
+        return created_items(indexes, members), errors
+
     @staticmethod
     def update_member(db: Session, member_id: int, member_data: MemberUpdate) -> Optional[Member]:
         """Update member"""
@@ -55,6 +160,8 @@ class MemberService:
         if not db_member:
             return None
         
+        old_project_id = db_member.project_id
+
         # Update only provided fields
         update_data = member_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
@@ -62,6 +169,8 @@ class MemberService:
         
         db.commit()
         db.refresh(db_member)
+        notify_change("member", member_id)
+        notify_change("project", old_project_id, db_member.project_id)
         return db_member
 
     @staticmethod
@@ -71,46 +180,41 @@ class MemberService:
         if not db_member:
             return False
         
+        # Authored blogs are removed by the foreign key cascade
+        project_id = db_member.project_id
+        blog_ids = [blog.blog_id for blog in db_member.blogs]
+
         db.delete(db_member)
         db.commit()
+        notify_change("member", member_id)
+        notify_change("project", project_id)
+        notify_change("blog", *blog_ids)
         return True
 
     @staticmethod
-    def attach_assets_to_member(db: Session, member_id: int, asset_ids: List[int]) -> Optional[Member]:
-        """Attach assets to member"""
-        db_member = MemberService.get_member_by_id(db, member_id)
-        if not db_member:
+    def attach_assets_to_member(db: Session, member_id: int, asset_ids: List[int]) -> List[int]:
+        """Attach assets to member, returning the ids that were not attached yet"""
+        if not MemberService.get_member_by_id(db, member_id):
             raise HTTPException(status_code=404, detail="Member not found")
-        
-        # Get assets
-        assets = db.query(Asset).filter(Asset.asset_id.in_(asset_ids)).all()
-        if len(assets) != len(asset_ids):
-            found_ids = [asset.asset_id for asset in assets]
-            missing_ids = [aid for aid in asset_ids if aid not in found_ids]
-            raise HTTPException(status_code=404, detail=f"Assets not found: {missing_ids}")
-        
-        # Attach assets (avoid duplicates)
-        for asset in assets:
-            if asset not in db_member.assets:
-                db_member.assets.append(asset)
-        
+
+        attached = attach_assets(db, member_assets, "member_id", member_id, asset_ids)
         db.commit()
-        db.refresh(db_member)
-        return db_member
+        if attached:
+            notify_change("member", member_id)
+            notify_change("asset", *attached)
+        return attached
 
     @staticmethod
-    def detach_assets_from_member(db: Session, member_id: int, asset_ids: List[int]) -> Optional[Member]:
-        """Detach assets from member"""
-        db_member = MemberService.get_member_by_id(db, member_id)
-        if not db_member:
+    def detach_assets_from_member(db: Session, member_id: int, asset_ids: List[int]) -> List[int]:
+        """Detach assets from member, returning the ids that were attached"""
+        if not MemberService.get_member_by_id(db, member_id):
             raise HTTPException(status_code=404, detail="Member not found")
-        
-        # Remove assets
-        for asset_id in asset_ids:
-            asset_to_remove = next((asset for asset in db_member.assets if asset.asset_id == asset_id), None)
-            if asset_to_remove:
-                db_member.assets.remove(asset_to_remove)
-        
+
+        detached = detach_assets(db, member_assets, "member_id", member_id, asset_ids)
         db.commit()
-        db.refresh(db_member)
-        return db_member
+        if detached:
+            notify_change("member", member_id)
+            notify_change("asset", *detached)
+        return detached
+
+AsyncMemberService = AsyncService(MemberService)
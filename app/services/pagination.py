@@ -0,0 +1,58 @@
+"""
+Keyset (cursor) pagination helpers
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    """Encode the (created_at, id) position of a row as an opaque cursor"""
+    payload = [created_at.isoformat() if created_at else None, row_id]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Decode a cursor produced by encode_cursor()"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(query: Query, created_column, id_column, skip: int, limit: int, cursor: Optional[str] = None) -> Query:
+    """
+    Order a query by (created_at, id) and apply either keyset or offset paging
+
+    With a cursor only rows after the cursor position are returned, so the
+    (created_at, id) index is used to seek straight to the page instead of
+    skipping over all previous rows.
+    """
+    query = query.order_by(created_column, id_column)
+    if cursor is None:
+        return query.offset(skip).limit(limit)
+
+    created_at, row_id = decode_cursor(cursor)
+    # Compare against the stored timestamp of the cursor row so driver-side
+    # datetime formatting can't skew the comparison; the encoded value is
+    # only used if that row has been deleted since.
+    anchor = select(created_column).where(id_column == row_id).correlate(None).scalar_subquery()
+    return query.filter(
+        tuple_(created_column, id_column) > tuple_(func.coalesce(anchor, created_at), row_id)
+    ).limit(limit)
+
+
+def next_cursor(items: List[Any], id_attr: str, limit: int) -> Optional[str]:
+    """Cursor for the page after items, or None when this is the last page"""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, getattr(last, id_attr))
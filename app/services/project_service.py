@@ -2,26 +2,52 @@
 Project CRUD service
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException
 
 from app.models.project import Project
-from app.models.asset import Asset
+from app.models.associations import project_assets
 from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.services.asset_links import attach_assets, detach_assets
+from app.services.async_service import AsyncService
+from app.services.bulk import created_items, insert_returning, validate_items
+from app.services.events import notify_change
+from app.services.fieldsets import apply_fields
+from app.services.pagination import paginate
+
+
+# Loader plan matching ProjectDetailResponse: one SELECT ... IN per collection
+PROJECT_DETAIL_LOADERS = (
+    selectinload(Project.members),
+    selectinload(Project.blogs),
+    selectinload(Project.assets),
+)
 
 
 class ProjectService:
     @staticmethod
-    def get_projects(db: Session, skip: int = 0, limit: int = 100) -> List[Project]:
-        """Get all projects with pagination"""
-        return db.query(Project).offset(skip).limit(limit).all()
+    def get_projects(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Project]:
+        """Get all projects with offset or keyset pagination"""
+        query = apply_fields(db.query(Project), Project, fields)
+        return paginate(query, Project.created_at, Project.project_id, skip, limit, cursor).all()
 
     @staticmethod
     def get_project_by_id(db: Session, project_id: int) -> Optional[Project]:
         """Get project by ID"""
         return db.query(Project).filter(Project.project_id == project_id).first()
 
+    @staticmethod
+    def get_project_detail(db: Session, project_id: int) -> Optional[Project]:
+        """Get project by ID with the relationships of ProjectDetailResponse eagerly loaded"""
+        return db.query(Project).options(*PROJECT_DETAIL_LOADERS).filter(Project.project_id == project_id).first()
+
     @staticmethod
     def create_project(db: Session, project_data: ProjectCreate) -> Project:
         """Create new project"""
@@ -32,8 +58,20 @@ class ProjectService:
         db.add(db_project)
         db.commit()
         db.refresh(db_project)
+        notify_change("project", db_project.project_id)
         return db_project
 
+    @staticmethod
+    def bulk_create_projects(
+        db: Session, items: List[Any]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Create the valid projects of a payload in one INSERT, returning them and errors by payload index"""
+        valid, errors = validate_items(items, ProjectCreate)
+        projects = insert_returning(db, Project, [project.model_dump() for _, project in valid])
+        db.commit()
+        notify_change("project", *(project.project_id for project in projects))
+        return created_items([index for index, _ in valid], projects), errors
+
     @staticmethod
     def update_project(db: Session, project_id: int, project_data: ProjectUpdate) -> Optional[Project]:
         """Update project"""
@@ -48,6 +86,7 @@ class ProjectService:
         
         db.commit()
         db.refresh(db_project)
+        notify_change("project", project_id)
         return db_project
 
     @staticmethod
@@ -57,46 +96,41 @@ class ProjectService:
         if not db_project:
             return False
         
+        # Members and blogs are deleted with the project
+        member_ids = [member.member_id for member in db_project.members]
+        blog_ids = [blog.blog_id for blog in db_project.blogs]
+
         db.delete(db_project)
         db.commit()
+        notify_change("project", project_id)
+        notify_change("member", *member_ids)
+        notify_change("blog", *blog_ids)
         return True
 
     @staticmethod
-    def attach_assets_to_project(db: Session, project_id: int, asset_ids: List[int]) -> Optional[Project]:
-        """Attach assets to project"""
-        db_project = ProjectService.get_project_by_id(db, project_id)
-        if not db_project:
+    def attach_assets_to_project(db: Session, project_id: int, asset_ids: List[int]) -> List[int]:
+        """Attach assets to project, returning the ids that were not attached yet"""
+        if not ProjectService.get_project_by_id(db, project_id):
             raise HTTPException(status_code=404, detail="Project not found")
-        
-        # Get assets
-        assets = db.query(Asset).filter(Asset.asset_id.in_(asset_ids)).all()
-        if len(assets) != len(asset_ids):
-            found_ids = [asset.asset_id for asset in assets]
-            missing_ids = [aid for aid in asset_ids if aid not in found_ids]
-            raise HTTPException(status_code=404, detail=f"Assets not found: {missing_ids}")
-        
-        # Attach assets (avoid duplicates)
-        for asset in assets:
-            if asset not in db_project.assets:
-                db_project.assets.append(asset)
-        
+
+        attached = attach_assets(db, project_assets, "project_id", project_id, asset_ids)
         db.commit()
-        db.refresh(db_project)
-        return db_project
+        if attached:
+            notify_change("project", project_id)
+            notify_change("asset", *attached)
+        return attached
 
     @staticmethod
-    def detach_assets_from_project(db: Session, project_id: int, asset_ids: List[int]) -> Optional[Project]:
-        """Detach assets from project"""
-        db_project = ProjectService.get_project_by_id(db, project_id)
-        if not db_project:
+    def detach_assets_from_project(db: Session, project_id: int, asset_ids: List[int]) -> List[int]:
+        """Detach assets from project, returning the ids that were attached"""
+        if not ProjectService.get_project_by_id(db, project_id):
             raise HTTPException(status_code=404, detail="Project not found")
-        
-        # Remove assets
-        for asset_id in asset_ids:
-            asset_to_remove = next((asset for asset in db_project.assets if asset.asset_id == asset_id), None)
-            if asset_to_remove:
-                db_project.assets.remove(asset_to_remove)
-        
+
+        detached = detach_assets(db, project_assets, "project_id", project_id, asset_ids)
         db.commit()
-        db.refresh(db_project)
-        return db_project
+        if detached:
+            notify_change("project", project_id)
+            notify_change("asset", *detached)
+        return detached
+
+AsyncProjectService = AsyncService(ProjectService)
@@ -0,0 +1,199 @@
+"""
+Reconciliation of Cloudinary files against asset rows
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import cloudinary
+from sqlalchemy import delete, or_, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.models.asset import Asset
+from app.models.associations import blog_assets, member_assets, project_assets
+from app.services.asset_deletion_service import AssetDeletionService
+from app.services.events import notify_change
+
+# Folder every upload of this app is stored under, see app.services.uploads.get_folder_by_type()
+ROOT_FOLDER = "pixerse"
+
+# Largest page the Search API returns
+REMOTE_PAGE_SIZE = 500
+
+
+@dataclass(frozen=True)
+class RemoteFile:
+    """A file stored in Cloudinary"""
+    public_id: str
+    resource_type: str
+    created_at: datetime
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive timestamps, they are stored as UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def iter_remote_files(
+    folder: str = ROOT_FOLDER, page_size: int = REMOTE_PAGE_SIZE, search: Callable = cloudinary.Search
+) -> Iterator[RemoteFile]:
+    """
+    Files under a Cloudinary folder in public_id order, fetched page by page
+
+    The Admin API resources listing can only be ordered by creation time,
+    the Search API can be ordered by public_id, which the merge needs.
+    """
+    cursor = None
+    while True:
+        query = search().expression(f"folder:{folder}/*").sort_by("public_id", "asc").max_results(page_size)
+        if cursor:
+            query = query.next_cursor(cursor)
+        page = query.execute()
+        for resource in page.get("resources", []):
+            yield RemoteFile(
+                resource["public_id"],
+                resource["resource_type"],
+                _as_utc(datetime.fromisoformat(resource["created_at"]))
+            )
+        cursor = page.get("next_cursor")
+        if not cursor:
+            return
+
+
+def _checked_order(items: Iterable, key: Callable[..., str], source: str) -> Iterator:
+    previous = None
+    for item in items:
+        current = key(item)
+        if previous is not None and current < previous:
+            raise ValueError(f"{source} are not sorted by public_id: {current!r} after {previous!r}")
+        previous = current
+        yield item
+
+
+def merge_orphans(
+    remote: Iterable[RemoteFile], local: Iterable[Row]
+) -> Iterator[Tuple[Optional[RemoteFile], Optional[Row]]]:
+    """
+    Walk two public_id ordered streams once, yielding what only one side has
+
+    (file, None) is a Cloudinary file without an asset row, (None, row) an
+    asset whose file is not in Cloudinary. Only the current item of each
+    side is held, so memory does not grow with the number of assets. A
+    stream out of order raises ValueError rather than reporting false
+    orphans.
+    """
+    remote_items = _checked_order(remote, lambda item: item.public_id, "Cloudinary files")
+    local_items = _checked_order(local, lambda item: item.cloudinary_public_id, "Assets")
+    file, row = next(remote_items, None), next(local_items, None)
+    while file is not None or row is not None:
+        if row is None or (file is not None and file.public_id < row.cloudinary_public_id):
+            yield file, None
+            file = next(remote_items, None)
+        elif file is None or row.cloudinary_public_id < file.public_id:
+            yield None, row
+            row = next(local_items, None)
+        else:
+            file, row = next(remote_items, None), next(local_items, None)
+
+
+class ReconciliationService:
+    @staticmethod
+    def iter_assets(db: Session, folder: str = ROOT_FOLDER, page_size: int = 1000) -> Iterator[Row]:
+        """
+        (asset_id, cloudinary_public_id, created_at) of the Cloudinary assets under a folder in public_id order
+
+        Pages are fetched by keyset on public_id, short queries that can be
+        interleaved with the cleanup commits. On PostgreSQL the comparison
+        uses the "C" collation, which orders like Python strings and is
+        backed by ix_assets_cloudinary_public_id_c.
+        """
+        public_id = Asset.cloudinary_public_id
+        if db.get_bind().dialect.name == "postgresql":
+            public_id = public_id.collate("C")
+
+        last = None
+        while True:
+            query = select(Asset.asset_id, Asset.cloudinary_public_id, Asset.created_at).where(
+                Asset.cloudinary_public_id.startswith(f"{folder}/", autoescape=True),
+                or_(Asset.storage_backend == "cloudinary", Asset.storage_backend.is_(None))
+            )
+            if last is not None:
+                query = query.where(public_id > last)
+            rows = db.execute(query.order_by(public_id).limit(page_size)).all()
+            yield from rows
+            if len(rows) < page_size:
+                return
+            last = rows[-1].cloudinary_public_id
+
+    @staticmethod
+    def queue_file_deletions(db: Session, files: List[RemoteFile]) -> None:
+        """Hand orphaned files to the deletion outbox"""
+        for file in files:
+            AssetDeletionService.queue_deletion(db, file.public_id, file.resource_type, backend="cloudinary")
+        db.commit()
+
+    @staticmethod
+    def delete_asset_rows(db: Session, asset_ids: List[int]) -> None:
+        """Delete assets and their links with one statement per table"""
+        for link in (project_assets, blog_assets, member_assets):
+            db.execute(delete(link).where(link.c.asset_id.in_(asset_ids)))
+        db.execute(delete(Asset).where(Asset.asset_id.in_(asset_ids)))
+        db.commit()
+        notify_change("asset", *asset_ids)
+
+    @staticmethod
+    def reconcile(
+        db: Session,
+        remote_files: Iterable[RemoteFile],
+        clean: bool = False,
+        min_age: timedelta = timedelta(hours=1),
+        batch_size: int = 100,
+        folder: str = ROOT_FOLDER,
+        report: Optional[Callable[[Optional[RemoteFile], Optional[Row]], None]] = None
+    ) -> Dict[str, int]:
+        """
+        Find Cloudinary files without an asset and assets without a file
+
+        Files and rows younger than min_age are left alone: an upload in
+        progress has its file before its row, and the Search API indexes
+        new files with a delay. Orphans are passed to report as they are
+        found. With clean, orphaned files are queued for deletion and rows
+        without a file are deleted, batch_size at a time.
+        """
+        cutoff = datetime.now(timezone.utc) - min_age
+        counts = {"orphaned_files": 0, "missing_files": 0}
+        orphaned_files: List[RemoteFile] = []
+        missing_ids: List[int] = []
+
+        for file, row in merge_orphans(remote_files, ReconciliationService.iter_assets(db, folder)):
+            if file is not None:
+                if file.created_at > cutoff:
+                    continue
+                counts["orphaned_files"] += 1
+                if clean:
+                    orphaned_files.append(file)
+            else:
+                if row.created_at is not None and _as_utc(row.created_at) > cutoff:
+                    continue
+                counts["missing_files"] += 1
+                if clean:
+                    missing_ids.append(row.asset_id)
+            if report:
+                report(file, row)
+
+            if len(orphaned_files) >= batch_size:
+                ReconciliationService.queue_file_deletions(db, orphaned_files)
+                orphaned_files = []
+            if len(missing_ids) >= batch_size:
+                ReconciliationService.delete_asset_rows(db, missing_ids)
+                missing_ids = []
+
+        if orphaned_files:
+            ReconciliationService.queue_file_deletions(db, orphaned_files)
+        if missing_ids:
+            ReconciliationService.delete_asset_rows(db, missing_ids)
+        return counts
@@ -0,0 +1,249 @@
+"""
+Typeahead suggestions over an in-memory prefix index
+"""
+
+import bisect
+import re
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.base import DBSession, run_db
+from app.models.asset import Asset
+from app.models.blog import Blog
+from app.models.member import Member
+from app.models.project import Project
+from app.services.events import subscribe
+
+# Entity -> (model, id attribute, label attribute)
+SUGGEST_SOURCES = {
+    "project": (Project, "project_id", "project_name"),
+    "member": (Member, "member_id", "member_name"),
+    "blog": (Blog, "blog_id", "title"),
+    "asset": (Asset, "asset_id", "filename"),
+}
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Case-fold and collapse whitespace, the form keys and queries are compared in"""
+    return " ".join(text.casefold().split())
+
+
+def index_keys(label: str) -> List[str]:
+    """
+    Keys a label can be found under
+
+    The label itself plus its remainder from each later word, so
+    "Intro to FastAPI" matches "intro", "to fa" and "fastapi". Bounded by
+    SUGGEST_MAX_WORDS keys of at most SUGGEST_KEY_LENGTH characters.
+    """
+    text = normalize(label)[:settings.SUGGEST_KEY_LENGTH]
+    starts = [match.start() for match in _WORD.finditer(text)][:settings.SUGGEST_MAX_WORDS]
+    return list(dict.fromkeys([text, *(text[start:] for start in starts)]))
+
+
+def _sorted_keys(entries: List[Tuple[str, int]], prefix: str) -> Iterator[int]:
+    """Ids of the (key, id) pairs whose key starts with prefix, in key order"""
+    position = bisect.bisect_left(entries, (prefix,))
+    while position < len(entries) and entries[position][0].startswith(prefix):
+        yield entries[position][1]
+        position += 1
+
+
+class _EntityIndex:
+    """
+    Sorted (key, id) pairs of one entity plus the label of every id
+
+    heads holds the key of each whole label, entries every key, so labels
+    starting with a prefix are found without walking later-word keys.
+    """
+
+    def __init__(self):
+        self.entries: List[Tuple[str, int]] = []
+        self.heads: List[Tuple[str, int]] = []
+        self.labels: Dict[int, str] = {}
+
+    def load(self, rows: Iterable[Tuple[int, str]]) -> None:
+        self.labels = {row_id: label for row_id, label in rows if label}
+        keys = {row_id: index_keys(label) for row_id, label in self.labels.items()}
+        self.entries = sorted((key, row_id) for row_id, row_keys in keys.items() for key in row_keys)
+        self.heads = sorted((row_keys[0], row_id) for row_id, row_keys in keys.items())
+
+    @staticmethod
+    def _discard(entries: List[Tuple[str, int]], entry: Tuple[str, int]) -> None:
+        position = bisect.bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+
+    def remove(self, row_id: int) -> None:
+        label = self.labels.pop(row_id, None)
+        if label is None:
+            return
+        keys = index_keys(label)
+        self._discard(self.heads, (keys[0], row_id))
+        for key in keys:
+            self._discard(self.entries, (key, row_id))
+
+    def put(self, row_id: int, label: str) -> None:
+        self.remove(row_id)
+        if not label:
+            return
+        self.labels[row_id] = label
+        keys = index_keys(label)
+        bisect.insort(self.heads, (keys[0], row_id))
+        for key in keys:
+            bisect.insort(self.entries, (key, row_id))
+
+    def lookup(self, prefix: str, limit: int) -> List[int]:
+        """
+        Ids of up to limit labels with a key starting with prefix
+
+        Labels starting with the prefix come first, in label order, then
+        labels where only a later word does, in key order.
+        """
+        found: Dict[int, None] = {}
+        for entries in (self.heads, self.entries):
+            for row_id in _sorted_keys(entries, prefix):
+                if len(found) >= limit:
+                    return list(found)
+                found.setdefault(row_id)
+        return list(found)
+
+
+class SuggestService:
+    @staticmethod
+    def get_labels(db: Session, entity: str, ids: Optional[Iterable[int]] = None) -> List[Tuple[int, str]]:
+        """(id, label) pairs of an entity, all of them or only the given ids"""
+        model, id_attr, label_attr = SUGGEST_SOURCES[entity]
+        pk, label = getattr(model, id_attr), getattr(model, label_attr)
+        query = db.query(pk, label)
+        if ids is not None:
+            query = query.filter(pk.in_(list(ids)))
+        return [tuple(row) for row in query.all()]
+
+    @staticmethod
+    def fetch(
+        db: Session, stale: Iterable[str], dirty: Dict[str, Set[int]]
+    ) -> Tuple[Dict[str, List[Tuple[int, str]]], Dict[str, List[Tuple[int, str]]]]:
+        """Labels of the stale entities and of the changed rows of the others"""
+        loaded = {entity: SuggestService.get_labels(db, entity) for entity in stale}
+        changed = {entity: SuggestService.get_labels(db, entity, ids) for entity, ids in dirty.items()}
+        return loaded, changed
+
+
+class SuggestIndex:
+    """
+    Prefix index over project names, member names, blog titles and asset filenames
+
+    Every entity is a sorted array of (key, id) pairs searched with bisect,
+    so a lookup never touches the database. Writes reported through
+    app.services.events only record the changed ids; the next lookup
+    re-reads those rows and updates the arrays in place. Entities are
+    loaded in full on first use and every SUGGEST_MAX_AGE_SECONDS, which
+    bounds how long another worker's writes can go unnoticed.
+    """
+
+    def __init__(self):
+        self._indexes = {entity: _EntityIndex() for entity in SUGGEST_SOURCES}
+        self._dirty: Dict[str, Set[int]] = {entity: set() for entity in SUGGEST_SOURCES}
+        self._stale = set(SUGGEST_SOURCES)
+        self._loaded_at = dict.fromkeys(SUGGEST_SOURCES, 0.0)
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def __len__(self) -> int:
+        return sum(len(index.entries) for index in self._indexes.values())
+
+    def on_change(self, entity: str, ids: tuple) -> None:
+        """Change listener: remember the rows to re-read"""
+        if entity in self._dirty and ids:
+            with self._lock:
+                self._dirty[entity].update(ids)
+
+    def reset(self) -> None:
+        with self._lock:
+            for entity in SUGGEST_SOURCES:
+                self._indexes[entity] = _EntityIndex()
+                self._dirty[entity] = set()
+                self._loaded_at[entity] = 0.0
+            self._stale = set(SUGGEST_SOURCES)
+            self.loads = 0
+
+    def _take_pending(self) -> Tuple[List[str], Dict[str, Set[int]]]:
+        with self._lock:
+            now = time.monotonic()
+            self._stale.update(
+                entity for entity, loaded_at in self._loaded_at.items()
+                if now - loaded_at >= settings.SUGGEST_MAX_AGE_SECONDS
+            )
+            stale, self._stale = self._stale, set()
+            # A full load already covers the changed rows of that entity
+            dirty = {entity: ids for entity, ids in self._dirty.items() if ids and entity not in stale}
+            self._dirty = {entity: set() for entity in SUGGEST_SOURCES}
+        return [entity for entity in SUGGEST_SOURCES if entity in stale], dirty
+
+    async def refresh(self, db: DBSession) -> None:
+        """Load stale entities and re-read changed rows"""
+        stale, dirty = self._take_pending()
+        if not stale and not dirty:
+            return
+        try:
+            loaded, changed = await run_db(db, SuggestService.fetch, stale, dirty)
+        except Exception:
+            with self._lock:
+                self._stale.update(stale)
+                for entity, ids in dirty.items():
+                    self._dirty[entity].update(ids)
+            raise
+
+        with self._lock:
+            now = time.monotonic()
+            for entity, rows in loaded.items():
+                self._indexes[entity].load(rows)
+                self._loaded_at[entity] = now
+                self.loads += 1
+            for entity, rows in changed.items():
+                index, labels = self._indexes[entity], dict(rows)
+                for row_id in dirty[entity]:
+                    if row_id in labels:
+                        index.put(row_id, labels[row_id])
+                    else:
+                        index.remove(row_id)
+
+    async def suggest(
+        self, db: DBSession, query: str, limit: int = 10, entities: Optional[Iterable[str]] = None
+    ) -> List[Dict]:
+        """
+        Suggestions for a typed prefix across the selected entities
+
+        Labels starting with the prefix rank before labels where only a
+        later word does, then alphabetically.
+        """
+        await self.refresh(db)
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        matches = []
+        with self._lock:
+            for entity in entities or SUGGEST_SOURCES:
+                index = self._indexes[entity]
+                for row_id in index.lookup(prefix, limit):
+                    label = index.labels[row_id]
+                    key = normalize(label)
+                    matches.append((not key.startswith(prefix), key, entity, row_id, label))
+
+        matches.sort()
+        return [
+            {"entity": entity, "id": row_id, "label": label}
+            for _, _, entity, row_id, label in matches[:limit]
+        ]
+
+
+suggest_index = SuggestIndex()
+subscribe(suggest_index.on_change)
@@ -0,0 +1,307 @@
+"""
+Upload job queue: spooled asynchronous uploads and the workers sending them
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database.base import DBSession, run_db
+from app.models.asset import Asset
+from app.models.upload_job import UploadJob, UploadJobStatus
+from app.services.async_service import AsyncService
+from app.services.asset_deletion_service import AssetDeletionService, asset_deletion_worker
+from app.services.asset_service import AssetService
+from app.services.cloudinary_service import CloudinaryService
+from app.services.uploads import check_upload, copy_stream, get_upload_size
+from app.services.events import notify_change
+from app.services.workers import PollingWorker
+from app.storage import get_storage
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def spool_file(source: BinaryIO, filename: str) -> Tuple[str, str]:
+    """Copy an upload into UPLOAD_SPOOL_DIR in chunks, returning the new path and its SHA-256"""
+    os.makedirs(settings.UPLOAD_SPOOL_DIR, exist_ok=True)
+    _, extension = os.path.splitext(filename)
+    path = os.path.join(settings.UPLOAD_SPOOL_DIR, f"{uuid.uuid4().hex}{extension[:10]}")
+    with open(path, "wb") as target:
+        _, content_hash = copy_stream(source, target)
+    return path, content_hash
+
+
+def remove_spool_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class UploadJobService:
+    @staticmethod
+    async def enqueue_upload(db: DBSession, file: UploadFile) -> UploadJob:
+        """Validate and spool an upload, then queue it for the upload workers"""
+        file_size = get_upload_size(file)
+        # Refuse what the worker would refuse before anything is spooled
+        check_upload(file.filename, file.content_type, file_size)
+
+        spool_path, content_hash = await run_in_threadpool(spool_file, file.file, file.filename)
+        try:
+            job = await run_db(
+                db, UploadJobService.create_job,
+                spool_path, file.filename, file.content_type, file_size, content_hash
+            )
+        except Exception:
+            remove_spool_file(spool_path)
+            raise
+        upload_worker.wake()
+        return job
+
+    @staticmethod
+    def create_job(
+        db: Session,
+        spool_path: str,
+        original_filename: str,
+        content_type: Optional[str],
+        file_size: int,
+        content_hash: Optional[str] = None
+    ) -> UploadJob:
+        """Create a queued upload job"""
+        db_job = UploadJob(
+            status=UploadJobStatus.QUEUED,
+            spool_path=spool_path,
+            original_filename=original_filename,
+            content_type=content_type,
+            file_size=file_size,
+            content_hash=content_hash,
+            attempts=0
+        )
+        db.add(db_job)
+        db.commit()
+        db.refresh(db_job)
+        return db_job
+
+    @staticmethod
+    def get_job(db: Session, job_id: int) -> Optional[UploadJob]:
+        """Get upload job by ID"""
+        return db.get(UploadJob, job_id)
+
+    @staticmethod
+    def fail_abandoned_jobs(db: Session) -> List[str]:
+        """
+        Mark stale RUNNING jobs FAILED once they used up UPLOAD_JOB_MAX_ATTEMPTS
+
+        A file that kills every worker sending it would otherwise be claimed
+        forever. Returns the spool paths of the failed jobs.
+        """
+        now = _utcnow()
+        spool_paths = db.scalars(
+            update(UploadJob).where(
+                UploadJob.status == UploadJobStatus.RUNNING,
+                UploadJob.started_at < now - timedelta(seconds=settings.UPLOAD_JOB_STALE_SECONDS),
+                UploadJob.attempts >= settings.UPLOAD_JOB_MAX_ATTEMPTS
+            ).values(
+                status=UploadJobStatus.FAILED,
+                error="Upload worker stopped during the last attempt",
+                started_at=None,
+                updated_at=now
+            ).returning(UploadJob.spool_path)
+        ).all()
+        db.commit()
+        return list(spool_paths)
+
+    @staticmethod
+    def claim_next_job(db: Session) -> Optional[UploadJob]:
+        """
+        Move the oldest claimable job to RUNNING in one statement and return it
+
+        Claimable are QUEUED jobs whose retry backoff has passed and RUNNING
+        jobs older than UPLOAD_JOB_STALE_SECONDS with attempts left, left
+        behind by a worker that died. On PostgreSQL the candidate row is
+        locked with SKIP LOCKED, so concurrent workers never claim the same
+        job. The returned started_at identifies the claim, see complete_job().
+        """
+        now = _utcnow()
+        candidate = select(UploadJob.job_id).where(or_(
+            and_(
+                UploadJob.status == UploadJobStatus.QUEUED,
+                or_(UploadJob.run_after.is_(None), UploadJob.run_after <= now)
+            ),
+            and_(
+                UploadJob.status == UploadJobStatus.RUNNING,
+                UploadJob.started_at < now - timedelta(seconds=settings.UPLOAD_JOB_STALE_SECONDS),
+                UploadJob.attempts < settings.UPLOAD_JOB_MAX_ATTEMPTS
+            ),
+        )).order_by(UploadJob.job_id).limit(1).with_for_update(skip_locked=True).scalar_subquery()
+
+        db_job = db.scalars(
+            update(UploadJob).where(UploadJob.job_id == candidate).values(
+                status=UploadJobStatus.RUNNING,
+                attempts=UploadJob.attempts + 1,
+                started_at=now,
+                updated_at=now
+            ).returning(UploadJob)
+        ).first()
+        if db_job is not None:
+            # Keep the RETURNING values through the commit
+            db.expunge(db_job)
+        db.commit()
+        return db_job
+
+    @staticmethod
+    def _finish_claim(db: Session, job_id: int, claimed_at: datetime, **values: Any) -> Optional[UploadJob]:
+        """
+        Update a job only while the claim made at claimed_at still holds it
+
+        A worker that outlived UPLOAD_JOB_STALE_SECONDS may find its job
+        reclaimed by another one; None is returned then and nothing is written.
+        """
+        result = db.execute(
+            update(UploadJob).where(
+                UploadJob.job_id == job_id,
+                UploadJob.status == UploadJobStatus.RUNNING,
+                UploadJob.started_at == claimed_at
+            ).values(**values, updated_at=_utcnow())
+        )
+        if result.rowcount != 1:
+            db.rollback()
+            return None
+        db.commit()
+        return db.get(UploadJob, job_id)
+
+    @staticmethod
+    def complete_job(
+        db: Session, job_id: int, claimed_at: datetime, upload_data: Dict[str, Any]
+    ) -> Optional[UploadJob]:
+        """
+        Create the asset of a finished upload and mark its job DONE, in one transaction
+
+        When the claim was lost the asset is dropped and the uploaded file is
+        queued for deletion, the job's current owner uploads its own copy.
+        """
+        db_asset = Asset(**upload_data)
+        db.add(db_asset)
+        db.flush()
+
+        db_job = UploadJobService._finish_claim(
+            db, job_id, claimed_at, status=UploadJobStatus.DONE, asset_id=db_asset.asset_id, error=None
+        )
+        if db_job is None:
+            AssetDeletionService.queue_deletion(
+                db,
+                upload_data["cloudinary_public_id"],
+                CloudinaryService.get_resource_type(upload_data["asset_type"]),
+                upload_data["storage_backend"]
+            )
+            db.commit()
+            return None
+        notify_change("asset", db_asset.asset_id)
+        return db_job
+
+    @staticmethod
+    def complete_duplicate_job(db: Session, job_id: int, claimed_at: datetime) -> Optional[UploadJob]:
+        """
+        Mark a job DONE with the asset already holding its content, if there is one
+
+        Returns None, leaving the job untouched, when its content is new or
+        the claim was lost.
+        """
+        db_job = db.get(UploadJob, job_id)
+        if db_job.content_hash is None:
+            return None
+        existing_asset = AssetService.get_asset_by_content_hash(db, db_job.content_hash)
+        if existing_asset is None:
+            return None
+        return UploadJobService._finish_claim(
+            db, job_id, claimed_at, status=UploadJobStatus.DONE, asset_id=existing_asset.asset_id, error=None
+        )
+
+    @staticmethod
+    def fail_job(
+        db: Session, job_id: int, claimed_at: datetime, attempts: int, error: str, retry: bool = True
+    ) -> Optional[UploadJob]:
+        """
+        Record a failed attempt, queueing a retry with exponential backoff while attempts remain
+
+        attempts is the count the claim returned. None is returned, and
+        nothing recorded, when the claim was lost.
+        """
+        if retry and attempts < settings.UPLOAD_JOB_MAX_ATTEMPTS:
+            delay = settings.UPLOAD_JOB_RETRY_SECONDS * 2 ** (attempts - 1)
+            values = {"status": UploadJobStatus.QUEUED, "run_after": _utcnow() + timedelta(seconds=delay)}
+        else:
+            values = {"status": UploadJobStatus.FAILED}
+        return UploadJobService._finish_claim(db, job_id, claimed_at, error=error, started_at=None, **values)
+
+
+class UploadWorker(PollingWorker):
+    """
+    Background tasks sending queued uploads to the storage backend
+
+    The queue is the upload_jobs table, so jobs outlive the process: queued
+    jobs are picked up by whichever worker runs next, and jobs a crashed
+    worker left RUNNING are claimed again once stale. The spool directory
+    must be shared by every process that serves uploads or runs workers.
+    """
+
+    def poll_seconds(self) -> float:
+        return settings.UPLOAD_JOB_POLL_SECONDS
+
+    async def run_once(self) -> bool:
+        """Claim and process one job, False when none is claimable"""
+        async with self.session_factory() as db:
+            for spool_path in await run_db(db, UploadJobService.fail_abandoned_jobs):
+                remove_spool_file(spool_path)
+            job = await run_db(db, UploadJobService.claim_next_job)
+        if job is None:
+            return False
+        await self.process(job)
+        return True
+
+    async def process(self, job: UploadJob) -> None:
+        claim = (job.job_id, job.started_at)
+        spool_path = job.spool_path
+        # Checked at processing time, so identical files queued together are sent once
+        async with self.session_factory() as db:
+            duplicate = await run_db(db, UploadJobService.complete_duplicate_job, *claim)
+        if duplicate is not None:
+            remove_spool_file(duplicate.spool_path)
+            return
+
+        try:
+            with open(job.spool_path, "rb") as stream:
+                upload_data = await get_storage().save(
+                    stream, job.original_filename, job.content_type, job.file_size
+                )
+        except Exception as e:
+            # A lost spool file or a refused file stays that way on retry
+            retry = not isinstance(e, FileNotFoundError) and not (
+                isinstance(e, HTTPException) and e.status_code < 500
+            )
+            error = e.detail if isinstance(e, HTTPException) else str(e)
+            async with self.session_factory() as db:
+                job = await run_db(db, UploadJobService.fail_job, *claim, job.attempts, error, retry)
+        else:
+            async with self.session_factory() as db:
+                job = await run_db(db, UploadJobService.complete_job, *claim, upload_data)
+            if job is None:
+                asset_deletion_worker.wake()
+
+        # A lost claim leaves the spool file to the job's new owner
+        if job is not None and job.status in (UploadJobStatus.DONE, UploadJobStatus.FAILED):
+            remove_spool_file(spool_path)
+
+
+AsyncUploadJobService = AsyncService(UploadJobService)
+
+upload_worker = UploadWorker()
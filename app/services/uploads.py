@@ -0,0 +1,117 @@
+"""
+Upload validation and helpers shared by every storage backend
+"""
+
+import hashlib
+import mimetypes
+import os
+from typing import BinaryIO, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+
+from app.config import settings
+from app.middleware.upload_limit import upload_too_large_detail
+from app.models.asset import AssetType
+
+# Read size for hashing and copying uploads
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def get_asset_type_from_mime(mime_type: str) -> Optional[AssetType]:
+    """Determine asset type from MIME type, None for types assets cannot hold"""
+    if mime_type.startswith('image/'):
+        return AssetType.IMAGE
+    elif mime_type.startswith('video/'):
+        return AssetType.VIDEO
+    return None
+
+
+def get_folder_by_type(asset_type: AssetType) -> str:
+    """Folder, or key prefix, files of an asset type are stored under"""
+    folder_mapping = {
+        AssetType.IMAGE: "pixerse/images",
+        AssetType.VIDEO: "pixerse/videos"
+    }
+    return folder_mapping.get(asset_type, "pixerse/others")
+
+
+def check_upload(filename: Optional[str], content_type: Optional[str], file_size: int) -> Tuple[str, AssetType]:
+    """Validate an upload before it is stored, returning its MIME type and asset type"""
+    # Validate file
+    if not filename:
+        raise HTTPException(status_code=400, detail="No file selected")
+
+    # Get MIME type
+    mime_type, _ = mimetypes.guess_type(filename)
+    if not mime_type:
+        mime_type = content_type or "application/octet-stream"
+
+    # Determine asset type
+    asset_type = get_asset_type_from_mime(mime_type)
+    if asset_type is None:
+        raise HTTPException(status_code=415, detail=f"Unsupported file type: {mime_type}")
+
+    # UploadSizeLimitMiddleware bounds the whole form, this is the exact check
+    if file_size > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail=upload_too_large_detail())
+    return mime_type, asset_type
+
+
+def get_upload_size(file: UploadFile) -> int:
+    """Size of an uploaded file in bytes"""
+    if file.size is not None:
+        return file.size
+    return file.file.seek(0, os.SEEK_END)
+
+
+class HashingReader:
+    """
+    Read-only view of an open binary file taking the SHA-256 of what is read
+
+    Lets a copy or an upload hash the file as it goes instead of reading it
+    a second time. Bytes read again after a seek are hashed once.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.name = None  # storage backends pass the filename explicitly
+        self._digest = hashlib.sha256()
+        self._hashed = 0
+
+    def read(self, size: int = -1) -> bytes:
+        position = self.stream.tell()
+        chunk = self.stream.read(size)
+        if position <= self._hashed < position + len(chunk):
+            self._digest.update(chunk[self._hashed - position:])
+            self._hashed = position + len(chunk)
+        return chunk
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self.stream.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.stream.tell()
+
+    def close(self) -> None:
+        self.stream.close()
+
+    def __enter__(self) -> "HashingReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def hexdigest(self) -> str:
+        """SHA-256 hex digest of the bytes read so far"""
+        return self._digest.hexdigest()
+
+
+def copy_stream(source: BinaryIO, target: BinaryIO) -> Tuple[int, str]:
+    """Copy an open binary file from its start in chunks, returning its size and SHA-256"""
+    reader = HashingReader(source)
+    reader.seek(0)
+    size = 0
+    for chunk in iter(lambda: reader.read(COPY_CHUNK_SIZE), b""):
+        target.write(chunk)
+        size += len(chunk)
+    return size, reader.hexdigest()
@@ -0,0 +1,115 @@
+"""
+Version watermarks behind the ETag and Last-Modified validators
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Table, func, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.models.asset import Asset
+from app.models.associations import blog_assets, member_assets, project_assets
+from app.models.blog import Blog
+from app.models.member import Member
+from app.models.project import Project
+from app.services.async_service import AsyncService
+
+ENTITY_MODELS = {
+    "project": Project,
+    "member": Member,
+    "blog": Blog,
+    "asset": Asset,
+}
+
+
+def _version(model):
+    """Row version: updated_at, or created_at for rows never updated"""
+    return func.coalesce(model.updated_at, model.created_at)
+
+
+def _pk(model):
+    return inspect(model).primary_key[0]
+
+
+def _row(model, row_id: int) -> List[Select]:
+    return [select(_version(model)).where(_pk(model) == row_id)]
+
+
+def _parent(model, fk_column, row_id: int) -> List[Select]:
+    """Version of the row a many-to-one foreign key of row_id points at"""
+    owner = fk_column.class_
+    parent_id = select(fk_column).where(_pk(owner) == row_id).scalar_subquery()
+    return [select(_version(model)).where(_pk(model) == parent_id)]
+
+
+def _children(model, fk_column, row_id: int) -> List[Select]:
+    """Count and newest version of a one-to-many collection"""
+    return [
+        select(func.count()).select_from(model).where(fk_column == row_id),
+        select(func.max(_version(model))).where(fk_column == row_id),
+    ]
+
+
+def _linked(model, link: Table, own_column: str, other_column: str, row_id: int) -> List[Select]:
+    """Link count, newest link and newest linked row of a many-to-many collection"""
+    joined = link.join(model, _pk(model) == link.c[other_column])
+    own = link.c[own_column] == row_id
+    return [
+        select(func.count()).select_from(link).where(own),
+        select(func.max(link.c.created_at)).where(own),
+        select(func.max(_version(model))).select_from(joined).where(own),
+    ]
+
+
+# One list of scalar subqueries per detail response, covering every row it embeds
+DETAIL_VERSION_PARTS: Dict[str, Callable[[int], List[Select]]] = {
+    "project": lambda project_id: [
+        *_row(Project, project_id),
+        *_children(Member, Member.project_id, project_id),
+        *_children(Blog, Blog.project_id, project_id),
+        *_linked(Asset, project_assets, "project_id", "asset_id", project_id),
+    ],
+    "member": lambda member_id: [
+        *_row(Member, member_id),
+        *_parent(Project, Member.project_id, member_id),
+        *_children(Blog, Blog.author_id, member_id),
+        *_linked(Asset, member_assets, "member_id", "asset_id", member_id),
+    ],
+    "blog": lambda blog_id: [
+        *_row(Blog, blog_id),
+        *_parent(Project, Blog.project_id, blog_id),
+        *_parent(Member, Blog.author_id, blog_id),
+        *_linked(Asset, blog_assets, "blog_id", "asset_id", blog_id),
+    ],
+    "asset": lambda asset_id: [
+        *_row(Asset, asset_id),
+        *_linked(Project, project_assets, "asset_id", "project_id", asset_id),
+        *_linked(Blog, blog_assets, "asset_id", "blog_id", asset_id),
+        *_linked(Member, member_assets, "asset_id", "member_id", asset_id),
+    ],
+}
+
+
+class VersionService:
+    @staticmethod
+    def get_detail_version(db: Session, entity: str, row_id: int) -> Optional[Tuple]:
+        """
+        Version of a detail response in a single round trip
+
+        Combines the row version with count/newest-version watermarks of
+        every relationship the detail response embeds. None when the row
+        does not exist.
+        """
+        parts = DETAIL_VERSION_PARTS[entity](row_id)
+        values = tuple(db.execute(select(*(part.scalar_subquery() for part in parts))).one())
+        return values if values[0] is not None else None
+
+    @staticmethod
+    def get_collection_version(db: Session, entity: str) -> Tuple:
+        """Row count and newest row version of an entity's table"""
+        model = ENTITY_MODELS[entity]
+        return tuple(db.execute(select(func.count(), func.max(_version(model))).select_from(model)).one())
+
+
+AsyncVersionService = AsyncService(VersionService)
@@ -0,0 +1,67 @@
+"""
+Base class of the in-process background workers
+"""
+
+import asyncio
+import logging
+from typing import AsyncContextManager, Callable, List, Optional
+
+from app.database.base import DBSession, open_session
+
+logger = logging.getLogger(__name__)
+
+
+class PollingWorker:
+    """
+    asyncio tasks calling run_once() while it finds work, polling otherwise
+
+    Subclasses implement run_once() and poll_seconds(). Requests that
+    create work call wake() so idle tasks do not wait for their next poll.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncContextManager[DBSession]] = open_session):
+        self.session_factory = session_factory
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def poll_seconds(self) -> float:
+        raise NotImplementedError
+
+    async def run_once(self) -> bool:
+        """Process one unit of work, False when there is none"""
+        raise NotImplementedError
+
+    def start(self, workers: int) -> None:
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self) -> None:
+        """Have idle workers look for work now instead of at their next poll"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self.run_once():
+                    continue
+            except Exception:
+                logger.exception("%s failed", type(self).__name__)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds())
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def drain(self) -> int:
+        """Run until no work is left, returning how many units were processed"""
+        processed = 0
+        while await self.run_once():
+            processed += 1
+        return processed
@@ -0,0 +1,36 @@
+# Storage package
+from functools import lru_cache
+
+from app.config import settings
+from app.storage.base import StorageBackend
+from app.storage.local import LocalStorageBackend, content_headers, file_response, parse_range
+
+
+@lru_cache(maxsize=None)
+def get_backend(name: str) -> StorageBackend:
+    """The backend of the given name, created on first use"""
+    if name == "local":
+        return LocalStorageBackend(
+            settings.STORAGE_LOCAL_ROOT, settings.STORAGE_LOCAL_BASE_URL, settings.STORAGE_LOCAL_ACCEL_PREFIX
+        )
+    if name == "cloudinary":
+        # Imported here, importing the Cloudinary SDK configures it
+        from app.storage.cloudinary_backend import CloudinaryStorageBackend
+        return CloudinaryStorageBackend()
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+def get_storage() -> StorageBackend:
+    """The backend selected by STORAGE_BACKEND, which stores new uploads"""
+    return get_backend(settings.STORAGE_BACKEND)
+
+
+__all__ = [
+    "StorageBackend",
+    "LocalStorageBackend",
+    "content_headers",
+    "file_response",
+    "get_backend",
+    "get_storage",
+    "parse_range",
+]
@@ -0,0 +1,38 @@
+"""
+Storage backend interface for asset files
+"""
+
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from fastapi import Request, Response
+
+
+class StorageBackend:
+    """
+    Interface of the file store behind assets
+
+    Asset rows keep the key of a file in cloudinary_public_id and its
+    delivery URL in cloudinary_url, whichever backend stored it, and the
+    name of that backend in storage_backend.
+    """
+
+    name = ""
+
+    async def save(
+        self, stream: BinaryIO, filename: Optional[str], content_type: Optional[str], file_size: int
+    ) -> Dict[str, Any]:
+        """
+        Validate and store an open file, returning the fields of its asset
+
+        storage_backend and content_hash, the SHA-256 taken while the file
+        was stored, are included.
+        """
+        raise NotImplementedError
+
+    async def delete_many(self, public_ids: List[str], resource_type: str) -> Dict[str, str]:
+        """Delete files, returning "deleted" or "not_found" per key; failures raise and are retried"""
+        raise NotImplementedError
+
+    def serve(self, public_id: str, request: Request) -> Response:
+        """Response delivering a stored file"""
+        raise NotImplementedError
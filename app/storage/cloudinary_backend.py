@@ -0,0 +1,31 @@
+"""
+Cloudinary storage backend
+"""
+
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from fastapi import HTTPException, Request, Response
+
+from app.services.cloudinary_service import CloudinaryService
+from app.services.uploads import HashingReader
+from app.storage.base import StorageBackend
+
+
+class CloudinaryStorageBackend(StorageBackend):
+    """Files in Cloudinary, delivered by its CDN from the stored URL"""
+
+    name = "cloudinary"
+
+    async def save(
+        self, stream: BinaryIO, filename: Optional[str], content_type: Optional[str], file_size: int
+    ) -> Dict[str, Any]:
+        # The SDK reads the file once to send it, it is hashed on the way
+        reader = HashingReader(stream)
+        upload_data = await CloudinaryService.upload_stream(reader, filename, content_type, file_size)
+        return {**upload_data, "storage_backend": self.name, "content_hash": reader.hexdigest()}
+
+    async def delete_many(self, public_ids: List[str], resource_type: str) -> Dict[str, str]:
+        return await CloudinaryService.delete_files(public_ids, resource_type)
+
+    def serve(self, public_id: str, request: Request) -> Response:
+        raise HTTPException(status_code=404, detail="Files are delivered by Cloudinary, see cloudinary_url")
@@ -0,0 +1,189 @@
+"""
+Local filesystem storage backend
+"""
+
+import mimetypes
+import os
+import re
+import tempfile
+import uuid
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services.uploads import check_upload, copy_stream, get_folder_by_type
+from app.storage.base import StorageBackend
+
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Types browsers display without running scripts. Files are served from the
+# API's origin, anything else (SVG and HTML included) is sent as a download.
+INLINE_MEDIA_TYPES = ("image/jpeg", "image/png", "image/gif", "image/webp", "image/avif", "image/bmp")
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    First and last byte of a single-range Range header
+
+    None means the whole file is sent: no header, a malformed one or
+    several ranges, which a server may answer in full. An unsatisfiable
+    range raises ValueError.
+    """
+    match = _BYTE_RANGE.match(header.strip()) if header else None
+    if not match or match.groups() == ("", ""):
+        return None
+    start, end = match.groups()
+    if not start:
+        # Suffix range: the last N bytes
+        if int(end) == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - int(end), 0), size - 1
+    first, last = int(start), int(end) if end else size - 1
+    if end and last < first:
+        return None
+    if first >= size:
+        raise ValueError("Range starts after the end of the file")
+    return first, min(last, size - 1)
+
+
+def _read_range(path: str, offset: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as file:
+        file.seek(offset)
+        while length > 0:
+            chunk = file.read(min(FileResponse.chunk_size, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def content_headers(media_type: Optional[str]) -> Dict[str, str]:
+    """
+    Headers keeping a stored file from running as a page of the API origin
+
+    The sandbox policy and nosniff cover files opened directly, types
+    outside INLINE_MEDIA_TYPES are additionally sent as attachments.
+    """
+    headers = {"X-Content-Type-Options": "nosniff", "Content-Security-Policy": "sandbox"}
+    if media_type not in INLINE_MEDIA_TYPES and not (media_type or "").startswith("video/"):
+        headers["Content-Disposition"] = "attachment"
+    return headers
+
+
+def file_response(
+    path: str, request: Request, media_type: Optional[str] = None, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Send a file, or the single byte range the request asks for
+
+    Whole files go through FileResponse, which streams from disk with
+    ETag and Last-Modified headers; ranges are answered with 206.
+    """
+    size = os.stat(path).st_size
+    headers = {**(headers or {}), "Accept-Ranges": "bytes"}
+    try:
+        byte_range = parse_range(request.headers.get("range"), size)
+    except ValueError:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    if byte_range is None:
+        return FileResponse(path, media_type=media_type, headers=headers)
+
+    first, last = byte_range
+    headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+    headers["Content-Length"] = str(last - first + 1)
+    return StreamingResponse(
+        _read_range(path, first, last - first + 1), status_code=206, media_type=media_type, headers=headers
+    )
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Files in a local directory, for development, CI and air-gapped deployments
+
+    Uploads are copied in chunks to a temporary file that is renamed into
+    place, so readers never see partial files. Files are served through
+    GET /assets/files/{public_id} with byte range support; with an
+    accel_prefix the response only names the file in X-Accel-Redirect and
+    nginx sends it with sendfile().
+    """
+
+    name = "local"
+
+    def __init__(self, root: str, base_url: str = "", accel_prefix: Optional[str] = None):
+        self.root = os.path.realpath(root)
+        self.base_url = base_url.rstrip("/")
+        self.accel_prefix = accel_prefix.rstrip("/") if accel_prefix else None
+
+    def path_for(self, public_id: str) -> str:
+        """Filesystem path of a key, refusing keys that leave the root"""
+        path = os.path.realpath(os.path.join(self.root, public_id))
+        if os.path.commonpath([self.root, path]) != self.root or path == self.root:
+            raise HTTPException(status_code=404, detail="File not found")
+        return path
+
+    def url_for(self, public_id: str) -> str:
+        return f"{self.base_url}{settings.API_V1_STR}/assets/files/{public_id}"
+
+    def _write(self, stream: BinaryIO, path: str) -> Tuple[int, str]:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix=".part", delete=False) as target:
+            try:
+                size, content_hash = copy_stream(stream, target)
+            except BaseException:
+                os.remove(target.name)
+                raise
+        os.replace(target.name, path)
+        return size, content_hash
+
+    async def save(
+        self, stream: BinaryIO, filename: Optional[str], content_type: Optional[str], file_size: int
+    ) -> Dict[str, Any]:
+        mime_type, asset_type = check_upload(filename, content_type, file_size)
+        _, extension = os.path.splitext(filename)
+        name = uuid.uuid4().hex
+        public_id = f"{get_folder_by_type(asset_type)}/{name}{extension.lower()[:10]}"
+        size, content_hash = await run_in_threadpool(self._write, stream, self.path_for(public_id))
+        return {
+            "filename": name,
+            "original_filename": filename,
+            "cloudinary_public_id": public_id,
+            "cloudinary_url": self.url_for(public_id),
+            "storage_backend": self.name,
+            "asset_type": asset_type,
+            "file_size": size,
+            "content_hash": content_hash,
+            "mime_type": mime_type,
+            "width": None,
+            "height": None
+        }
+
+    def _delete(self, public_ids: List[str]) -> Dict[str, str]:
+        outcome = {}
+        for public_id in public_ids:
+            try:
+                os.remove(self.path_for(public_id))
+                outcome[public_id] = "deleted"
+            except (FileNotFoundError, HTTPException):
+                outcome[public_id] = "not_found"
+        return outcome
+
+    async def delete_many(self, public_ids: List[str], resource_type: str) -> Dict[str, str]:
+        return await run_in_threadpool(self._delete, public_ids)
+
+    def serve(self, public_id: str, request: Request) -> Response:
+        path = self.path_for(public_id)
+        if not os.path.isfile(path):
+            raise HTTPException(status_code=404, detail="File not found")
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        headers = content_headers(media_type)
+        if self.accel_prefix:
+            # nginx keeps Content-Type and Content-Disposition of this response,
+            # its internal location should add nosniff and the sandbox policy
+            return Response(
+                headers={**headers, "X-Accel-Redirect": f"{self.accel_prefix}/{public_id}"},
+                media_type=media_type
+            )
+        return file_response(path, request, media_type, headers)
@@ -2,27 +2,66 @@
 PiXerse Backend - FastAPI Application Entry Point
 """
 
+import logging
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import api_router
 from app.config import settings
-from app.database.base import engine
+from app.database.base import engine, all_engines, open_session
+from app.middleware.query_counter import QueryCounterMiddleware, instrument_engine
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.middleware.upload_limit import UploadSizeLimitMiddleware
 from app.models import base  # Import all models
+from app.services.asset_deletion_service import asset_deletion_worker
+from app.services.suggest_service import suggest_index
+from app.services.upload_job_service import upload_worker
+
+logger = logging.getLogger(__name__)
 
 # Create database tables
 base.Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm in-memory indexes and run the background workers while serving requests"""
+    if settings.SUGGEST_WARM_ON_STARTUP:
+        try:
+            async with open_session() as db:
+                await suggest_index.refresh(db)
+        except Exception:
+            # The index loads itself on the first /search/suggest call instead
+            logger.exception("Warming the suggestion index failed")
+
+    if settings.UPLOAD_WORKERS > 0:
+        upload_worker.start(settings.UPLOAD_WORKERS)
+    if settings.ASSET_DELETION_WORKERS > 0:
+        asset_deletion_worker.start(settings.ASSET_DELETION_WORKERS)
+    try:
+        yield
+    finally:
+        await upload_worker.stop()
+        await asset_deletion_worker.stop()
+
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.APP_NAME,
     description="Backend API for PiXerse Landing Page CMS",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+# Refuse oversized uploads while they stream in; added first so CORS
+# headers still wrap the 413
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -30,8 +69,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-DB-Queries", "X-DB-Time", "ETag", "Last-Modified"],
 )
 
+# Send clients that wrote to the primary until replicas caught up
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Count SQL statements per request
+app.add_middleware(QueryCounterMiddleware)
+for db_engine in all_engines():
+    instrument_engine(db_engine)
+
 # Include API routes
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
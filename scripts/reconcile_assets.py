@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Reconcile Cloudinary files with asset rows
+
+Lists Cloudinary files without an asset and assets whose file is gone.
+With --clean the orphaned files are queued in the asset_deletions outbox
+and the assets without a file are deleted.
+"""
+
+import os
+import sys
+from datetime import timedelta
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.database.base import SessionLocal
+from app.services.reconciliation_service import ROOT_FOLDER, ReconciliationService, iter_remote_files
+
+
+def print_orphan(file, row):
+    if file is not None:
+        print(f"orphaned file\t{file.resource_type}\t{file.public_id}")
+    else:
+        print(f"missing file\tasset {row.asset_id}\t{row.cloudinary_public_id}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reconcile Cloudinary files with PiXerse assets")
+    parser.add_argument("--clean", action="store_true", help="Queue orphaned files for deletion and delete assets without a file")
+    parser.add_argument("--min-age-hours", type=float, default=1, help="Ignore files and assets younger than this")
+    parser.add_argument("--batch-size", type=int, default=100, help="Orphans cleaned per transaction")
+    parser.add_argument("--folder", default=ROOT_FOLDER, help="Cloudinary folder to reconcile")
+    args = parser.parse_args()
+    # Files of the local backend share the pixerse/ keys, they would all be
+    # reported as missing from Cloudinary
+    if settings.STORAGE_BACKEND != "cloudinary":
+        parser.error(f"STORAGE_BACKEND is {settings.STORAGE_BACKEND}, reconciliation needs the cloudinary backend")
+
+    db = SessionLocal()
+    try:
+        counts = ReconciliationService.reconcile(
+            db,
+            iter_remote_files(args.folder),
+            clean=args.clean,
+            min_age=timedelta(hours=args.min_age_hours),
+            batch_size=args.batch_size,
+            folder=args.folder,
+            report=print_orphan
+        )
+    finally:
+        db.close()
+
+    action = "cleaned" if args.clean else "found"
+    print(f"{counts['orphaned_files']} orphaned files and {counts['missing_files']} missing files {action}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
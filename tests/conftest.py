@@ -2,16 +2,35 @@
 Test configuration and fixtures
 """
 
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import List, Optional
+
+import cloudinary
+import cloudinary.utils
 import pytest
+from cloudinary.exceptions import Error as CloudinaryError
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.database.base import Base, get_db
+from app.cache import response_cache
+from app.config import settings
+from app.database.base import Base, get_db, get_read_db
+from app.middleware.query_counter import instrument_engine
+from app.models import Asset, AssetType
+from app.services.landing_service import landing_snapshot
+from app.services.suggest_service import suggest_index
 from app.models.base import Base  # Import to register all models
 from main import app
 
+# Credentials signing the uploads of FakeCloudinary
+CLOUDINARY_TEST_KEY = "test-key"
+CLOUDINARY_TEST_SECRET = "test-secret"
+
 # Use in-memory SQLite for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
@@ -21,6 +40,15 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrument_engine(engine)
+
+# The startup warm-up would read from the configured database, tests load
+# the suggestion index lazily from the test session instead
+settings.SUGGEST_WARM_ON_STARTUP = False
+# Background work is run explicitly by the tests, see test_upload_jobs.py
+# and test_asset_deletions.py
+settings.UPLOAD_WORKERS = 0
+settings.ASSET_DELETION_WORKERS = 0
 
 
 def override_get_db():
@@ -32,6 +60,125 @@ def override_get_db():
         db.close()
 
 
+@asynccontextmanager
+async def open_testing_db():
+    """Session factory of the background workers, bound to the test database"""
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def create_assets(
+    db_session, *public_ids: str, asset_type: AssetType = AssetType.IMAGE, created_at: Optional[datetime] = None
+) -> List[int]:
+    """Insert one asset per Cloudinary public ID, returning their IDs"""
+    assets = [
+        Asset(filename=public_id.rsplit("/", 1)[-1], cloudinary_public_id=public_id, asset_type=asset_type)
+        for public_id in public_ids
+    ]
+    if created_at is not None:
+        for asset in assets:
+            asset.created_at = created_at
+    db_session.add_all(assets)
+    db_session.commit()
+    return [asset.asset_id for asset in assets]
+
+
+class FakeCloudinary:
+    """
+    Stand-in for the Cloudinary SDK and upload endpoint
+
+    SDK uploads and deletions are recorded instead of sent, the first
+    upload_failures and delete_failures calls fail. direct_upload() checks
+    and signs a browser upload like the real endpoint.
+    """
+
+    def __init__(self):
+        self.uploads = []  # (kind, body, options), kind is upload or upload_large
+        self.deletions = []  # (public_ids, resource_type, thread name)
+        self.upload_failures = 0
+        self.delete_failures = 0
+
+    def _upload(self, kind: str, file, options: dict) -> dict:
+        options["thread"] = threading.current_thread().name
+        self.uploads.append((kind, file.read(), options))
+        if self.upload_failures:
+            self.upload_failures -= 1
+            raise CloudinaryError("Server error")
+        return {
+            "public_id": f"pixerse/images/{options['filename'].split('.')[0]}_abc",
+            "secure_url": "https://res.cloudinary.com/demo/image/upload/photo_abc.png",
+            "bytes": 0,
+        }
+
+    def upload(self, file, **options) -> dict:
+        return self._upload("upload", file, options)
+
+    def upload_large(self, file, **options) -> dict:
+        return self._upload("upload_large", file, options)
+
+    def delete_resources(self, public_ids, **options) -> dict:
+        self.deletions.append((list(public_ids), options["resource_type"], threading.current_thread().name))
+        if self.delete_failures:
+            self.delete_failures -= 1
+            raise CloudinaryError("Rate limited")
+        return {"deleted": {public_id: "deleted" for public_id in public_ids}, "partial": False}
+
+    def destroy(self, public_id, **options):
+        raise AssertionError("deletions must go through the outbox")
+
+    def direct_upload(self, params: dict, file: bytes, file_format: str = "png", sign: bool = False) -> dict:
+        """Upload with signed parameters, or as any holder of the API secret would with sign"""
+        signed = {key: value for key, value in params.items() if key in ("folder", "public_id", "timestamp")}
+        expected = cloudinary.utils.api_sign_request(signed, CLOUDINARY_TEST_SECRET)
+        if not sign and params["signature"] != expected:
+            raise ValueError("Invalid Signature")
+        if time.time() - params["timestamp"] > 3600:
+            raise ValueError("Stale request")
+
+        public_id = f"{params['folder']}/{params['public_id']}"
+        version = int(time.time())
+        return {
+            "public_id": public_id,
+            "version": version,
+            "signature": cloudinary.utils.api_sign_request(
+                {"public_id": public_id, "version": version}, CLOUDINARY_TEST_SECRET, signature_version=1
+            ),
+            "resource_type": params["upload_url"].rsplit("/", 2)[-2],
+            "format": file_format,
+            "bytes": len(file),
+            "width": 640,
+            "height": 480,
+        }
+
+
+@pytest.fixture
+def fake_cloudinary(monkeypatch):
+    """Route Cloudinary SDK calls to a FakeCloudinary, with a fixed API key and secret"""
+    fake = FakeCloudinary()
+    for name in ("upload", "upload_large", "destroy"):
+        monkeypatch.setattr(f"cloudinary.uploader.{name}", getattr(fake, name))
+    monkeypatch.setattr("cloudinary.api.delete_resources", fake.delete_resources)
+    config = cloudinary.config()
+    monkeypatch.setattr(config, "api_key", CLOUDINARY_TEST_KEY)
+    monkeypatch.setattr(config, "api_secret", CLOUDINARY_TEST_SECRET)
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def clear_read_caches():
+    """Start every test with empty read caches, row ids are reused between tests"""
+    response_cache.clear()
+    landing_snapshot.reset()
+    suggest_index.reset()
+    yield
+    response_cache.clear()
+    landing_snapshot.reset()
+    suggest_index.reset()
+
+
 @pytest.fixture(scope="function")
 def db_session():
     """Create a fresh database session for each test"""
@@ -52,6 +199,7 @@ def db_session():
 def client(db_session):
     """Create test client with overridden database"""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     
     with TestClient(app) as test_client:
         yield test_client
@@ -60,6 +208,22 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def assert_query_budget(monkeypatch):
+    """Check the X-DB-Queries count of a response against a budget"""
+    monkeypatch.setattr(settings, "DEBUG", True)
+
+    def check(response, budget: int) -> int:
+        count = int(response.headers["X-DB-Queries"])
+        assert count <= budget, (
+            f"{response.request.method} {response.request.url.path} "
+            f"issued {count} queries, budget is {budget}"
+        )
+        return count
+
+    return check
+
+
 @pytest.fixture
 def sample_project_data():
     """Sample project data for testing"""
@@ -86,8 +250,10 @@ def sample_blog_data():
     """Sample blog data for testing"""
     return {
         "project_id": 1,
+        "author_id": 1,
         "title": "Test Blog Post",
-        "detail": "This is a test blog post content"
+        "content": "This is a test blog post content",
+        "tags": ["Python", "FastAPI"]
     }
 
 
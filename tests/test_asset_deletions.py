@@ -0,0 +1,131 @@
+"""
+Tests for the Cloudinary deletion outbox and its worker
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.config import Settings, settings
+from app.models import Asset, AssetDeletion, AssetType
+from app.services.asset_deletion_service import AssetDeletionWorker, retry_delay
+from tests.conftest import create_assets, open_testing_db
+
+
+@pytest.fixture(autouse=True)
+def retry_seconds(monkeypatch):
+    monkeypatch.setattr(settings, "ASSET_DELETION_RETRY_SECONDS", 30)
+
+
+@pytest.fixture
+def worker():
+    return AssetDeletionWorker(session_factory=open_testing_db)
+
+
+def make_due(db_session):
+    """Skip the retry backoff of every outbox row"""
+    for deletion in db_session.query(AssetDeletion).all():
+        deletion.run_after = deletion.created_at
+    db_session.commit()
+
+
+class TestAssetDeletions:
+    """Test class for DELETE /assets/{asset_id} and the deletion outbox"""
+
+    def test_delete_only_queues(self, client: TestClient, db_session, fake_cloudinary):
+        """Test the request deletes the row and queues the file without calling Cloudinary"""
+        calls = fake_cloudinary.deletions
+        asset_id, = create_assets(db_session, "test/clip_0", asset_type=AssetType.VIDEO)
+
+        assert client.delete(f"/api/v1/assets/{asset_id}").status_code == 200
+        assert calls == []
+        assert db_session.query(Asset).count() == 0
+        deletion = db_session.query(AssetDeletion).one()
+        assert (deletion.public_id, deletion.resource_type) == ("test/clip_0", "video")
+
+    def test_nothing_queued_without_cloudinary_file(self, client: TestClient, db_session, fake_cloudinary):
+        """Test YouTube embeds and delete_from_cloudinary=false leave the outbox empty"""
+        youtube_id = client.post(
+            "/api/v1/assets/", json={"filename": "embed", "asset_type": "YOUTUBE", "youtube_video_id": "abc"}
+        ).json()["asset_id"]
+        asset_id, = create_assets(db_session, "test/image_0")
+
+        assert client.delete(f"/api/v1/assets/{youtube_id}").status_code == 200
+        assert client.delete(f"/api/v1/assets/{asset_id}?delete_from_cloudinary=false").status_code == 200
+        assert db_session.query(AssetDeletion).count() == 0
+
+    def test_worker_deletes_in_batches(
+        self, client: TestClient, db_session, fake_cloudinary, worker, monkeypatch
+    ):
+        """Test the worker sends one call per resource type and batch"""
+        calls = fake_cloudinary.deletions
+        monkeypatch.setattr(settings, "ASSET_DELETION_BATCH_SIZE", 3)
+        asset_ids = create_assets(db_session, *(f"test/image_{i}" for i in range(4)))
+        asset_ids += create_assets(db_session, "test/clip_0", asset_type=AssetType.VIDEO)
+        for asset_id in asset_ids:
+            client.delete(f"/api/v1/assets/{asset_id}")
+
+        assert asyncio.run(worker.drain()) == 2
+        assert [(public_ids, kind) for public_ids, kind, _ in calls] == [
+            (["test/image_0", "test/image_1", "test/image_2"], "image"),
+            (["test/image_3"], "image"),
+            (["test/clip_0"], "video"),
+        ]
+        assert all(thread.startswith("cloudinary") for _, _, thread in calls)
+        assert db_session.query(AssetDeletion).count() == 0
+
+    def test_failed_batch_is_retried_with_backoff(self, client: TestClient, db_session, fake_cloudinary, worker):
+        """Test a failed call leaves the batch in the outbox until its backoff has passed"""
+        calls = fake_cloudinary.deletions
+        fake_cloudinary.delete_failures = 2
+        for asset_id in create_assets(db_session, "test/image_0", "test/image_1"):
+            client.delete(f"/api/v1/assets/{asset_id}")
+
+        assert asyncio.run(worker.drain()) == 1
+        deletions = db_session.query(AssetDeletion).all()
+        assert [deletion.attempts for deletion in deletions] == [1, 1]
+        assert all(deletion.last_error == "Rate limited" for deletion in deletions)
+        first_delay = deletions[0].run_after - deletions[0].created_at
+        # Not claimable before the backoff has passed
+        assert asyncio.run(worker.drain()) == 0
+
+        make_due(db_session)
+        asyncio.run(worker.drain())
+        db_session.expire_all()
+        deletion = db_session.query(AssetDeletion).first()
+        assert deletion.attempts == 2
+        assert deletion.run_after - deletion.created_at > first_delay
+
+        make_due(db_session)
+        asyncio.run(worker.drain())
+        assert len(calls) == 3
+        assert db_session.query(AssetDeletion).count() == 0
+
+    def test_partial_outcome(self, client: TestClient, db_session, fake_cloudinary, worker, monkeypatch):
+        """Test files Cloudinary reports as gone are done and the rest stay queued"""
+        def delete_resources(public_ids, **options):
+            return {"deleted": {"test/image_0": "deleted", "test/image_1": "not_found", "test/image_2": "error"}}
+
+        monkeypatch.setattr("cloudinary.api.delete_resources", delete_resources)
+        for asset_id in create_assets(db_session, "test/image_0", "test/image_1", "test/image_2"):
+            client.delete(f"/api/v1/assets/{asset_id}")
+
+        asyncio.run(worker.drain())
+        deletion = db_session.query(AssetDeletion).one()
+        assert deletion.public_id == "test/image_2"
+        assert deletion.last_error == "test/image_2: error"
+
+    def test_backoff_is_capped(self, monkeypatch):
+        """Test the retry delay doubles up to ASSET_DELETION_MAX_RETRY_SECONDS"""
+        monkeypatch.setattr(settings, "ASSET_DELETION_RETRY_SECONDS", 30)
+        monkeypatch.setattr(settings, "ASSET_DELETION_MAX_RETRY_SECONDS", 100)
+        assert [retry_delay(attempts).total_seconds() for attempts in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+    def test_batch_size_is_bounded(self):
+        """Test batch sizes Cloudinary would refuse are rejected at startup"""
+        for size in (0, 101):
+            with pytest.raises(ValidationError):
+                Settings(ASSET_DELETION_BATCH_SIZE=size)
+        assert Settings(ASSET_DELETION_BATCH_SIZE=100).ASSET_DELETION_BATCH_SIZE == 100
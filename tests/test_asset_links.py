@@ -0,0 +1,71 @@
+"""
+Tests for set-based asset attach/detach
+"""
+
+from fastapi.testclient import TestClient
+
+from app.models import Member, Project
+from tests.conftest import create_assets
+
+
+class TestAssetLinks:
+    """Test class for the attach/detach endpoints"""
+
+    def test_attach_returns_only_new_links(self, client: TestClient, db_session):
+        """Test re-attaching is a no-op and only new ids are reported"""
+        project = Project(project_name="Gallery")
+        db_session.add(project)
+        db_session.commit()
+        first, second = create_assets(db_session, "test/link_0", "test/link_1")
+        url = f"/api/v1/projects/{project.project_id}/assets"
+
+        assert client.post(f"{url}/attach", json={"asset_ids": [first]}).json() == {"asset_ids": [first]}
+        response = client.post(f"{url}/attach", json={"asset_ids": [first, second, second]})
+        assert response.status_code == 200
+        assert response.json() == {"asset_ids": [second]}
+        assert len(client.get(f"/api/v1/projects/{project.project_id}").json()["assets"]) == 2
+
+    def test_detach_returns_only_removed_links(self, client: TestClient, db_session):
+        """Test detaching ids that are not linked is ignored"""
+        member = Member(member_name="Linked", team_type="Design", role="UI", experience=1)
+        db_session.add(member)
+        db_session.commit()
+        first, second = create_assets(db_session, "test/link_0", "test/link_1")
+        url = f"/api/v1/members/{member.member_id}/assets"
+        client.post(f"{url}/attach", json={"asset_ids": [first]})
+
+        response = client.post(f"{url}/detach", json={"asset_ids": [first, second]})
+        assert response.json() == {"asset_ids": [first]}
+        assert client.get(f"/api/v1/members/{member.member_id}").json()["assets"] == []
+
+    def test_missing_rows(self, client: TestClient, db_session):
+        """Test unknown owners and assets answer 404 without linking anything"""
+        project = Project(project_name="Strict")
+        db_session.add(project)
+        db_session.commit()
+        (asset_id,) = create_assets(db_session, "test/link_0")
+
+        assert client.post("/api/v1/blogs/999/assets/attach", json={"asset_ids": [asset_id]}).status_code == 404
+        response = client.post(
+            f"/api/v1/projects/{project.project_id}/assets/attach", json={"asset_ids": [asset_id, 999]}
+        )
+        assert response.status_code == 404
+        assert "999" in response.json()["detail"]
+        assert client.get(f"/api/v1/projects/{project.project_id}").json()["assets"] == []
+
+    def test_query_count_independent_of_collection_size(self, client: TestClient, db_session, assert_query_budget):
+        """Test large collections cost the same statements as small ones"""
+        project = Project(project_name="Large gallery")
+        db_session.add(project)
+        db_session.commit()
+        asset_ids = create_assets(db_session, *(f"test/link_{i}" for i in range(300)))
+        url = f"/api/v1/projects/{project.project_id}/assets"
+
+        response = client.post(f"{url}/attach", json={"asset_ids": asset_ids})
+        assert len(response.json()["asset_ids"]) == 300
+        # Owner lookup, asset existence check, INSERT ... ON CONFLICT DO NOTHING
+        assert assert_query_budget(response, 3) == 3
+
+        response = client.post(f"{url}/detach", json={"asset_ids": asset_ids})
+        assert len(response.json()["asset_ids"]) == 300
+        assert assert_query_budget(response, 2) == 2
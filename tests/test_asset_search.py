@@ -0,0 +1,58 @@
+"""
+Tests for asset search
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models import Asset, AssetType
+from app.services.asset_service import AssetService
+
+
+@pytest.fixture
+def assets(db_session):
+    """Assets with distinct names and descriptions"""
+    rows = [
+        Asset(filename="hero_banner", original_filename="hero-banner.png",
+              cloudinary_public_id="test/hero", asset_type=AssetType.IMAGE),
+        Asset(filename="team_photo", description="Team at the hero launch event",
+              cloudinary_public_id="test/team", asset_type=AssetType.IMAGE),
+        Asset(filename="logo_100%", cloudinary_public_id="test/logo", asset_type=AssetType.IMAGE),
+        Asset(filename="intro_video", cloudinary_public_id="test/intro", asset_type=AssetType.VIDEO),
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+
+class TestAssetSearch:
+    """Test class for ?search= on /assets"""
+
+    def test_matches_description_and_reports_total(self, client: TestClient, assets):
+        """Test description is searched and X-Total-Count is set"""
+        response = client.get("/api/v1/assets/?search=hero")
+        assert response.status_code == 200
+        assert [a["filename"] for a in response.json()] == ["hero_banner", "team_photo"]
+        assert response.headers["X-Total-Count"] == "2"
+
+    def test_total_counts_all_pages(self, client: TestClient, assets):
+        """Test the total is independent of the page size"""
+        response = client.get("/api/v1/assets/?search=o&limit=1")
+        assert len(response.json()) == 1
+        assert response.headers["X-Total-Count"] == "4"
+
+        response = client.get("/api/v1/assets/?search=o&skip=10")
+        assert response.json() == []
+        assert response.headers["X-Total-Count"] == "4"
+
+    def test_like_wildcards_are_literal(self, db_session, assets):
+        """Test % and _ in the term match themselves"""
+        found, total = AssetService.search_assets(db_session, "100%")
+        assert [a.filename for a in found] == ["logo_100%"]
+        assert total == 1
+
+        assert AssetService.search_assets(db_session, "%")[1] == 1
+
+    def test_no_match(self, db_session, assets):
+        """Test an unmatched term returns an empty page and zero total"""
+        assert AssetService.search_assets(db_session, "missing") == ([], 0)
@@ -0,0 +1,64 @@
+"""
+Tests for blog full-text search
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models import Blog, Member
+from app.services.blog_service import BlogService, fts5_query
+
+
+@pytest.fixture
+def blogs(db_session):
+    """A few blogs by one author"""
+    author = Member(member_name="Author", team_type="Dev", role="Writer", experience=3)
+    rows = [
+        Blog(title="FastAPI tutorial", content="Building APIs with Python", tags=["python"], author=author),
+        Blog(title="Release notes", content="This release adds a FastAPI backend", tags=["news"], author=author),
+        Blog(title="Design showcase", content="Landing page visuals", tags=["design", "fastapi"], author=author),
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+
+class TestBlogSearch:
+    """Test class for /blogs/search"""
+
+    def test_matches_title_content_and_tags(self, client: TestClient, blogs):
+        """Test all indexed columns are searched"""
+        response = client.get("/api/v1/blogs/search?q=fastapi")
+        assert response.status_code == 200
+        assert {blog["title"] for blog in response.json()} == {
+            "FastAPI tutorial", "Release notes", "Design showcase"
+        }
+
+    def test_all_words_must_match(self, client: TestClient, blogs):
+        """Test multi-word queries narrow the result"""
+        response = client.get("/api/v1/blogs/search", params={"q": "python tutorial"})
+        assert [blog["title"] for blog in response.json()] == ["FastAPI tutorial"]
+
+    def test_index_follows_updates_and_deletes(self, client: TestClient, db_session, blogs):
+        """Test the index is kept in sync with the blogs table"""
+        blogs[0].title = "Renamed post"
+        db_session.delete(blogs[1])
+        db_session.commit()
+
+        assert [b.title for b in BlogService.search_blogs(db_session, "renamed")] == ["Renamed post"]
+        assert BlogService.search_blogs(db_session, "release") == []
+
+    def test_query_syntax_is_escaped(self, client: TestClient, blogs):
+        """Test FTS5 operators in user input are treated as words"""
+        response = client.get("/api/v1/blogs/search", params={"q": 'NOT "fastapi* ('})
+        assert response.status_code == 200
+        assert fts5_query('say "hi"') == '"say" """hi"""'
+
+    def test_blank_query(self, client: TestClient, blogs):
+        """Test whitespace-only input finds nothing"""
+        assert client.get("/api/v1/blogs/search", params={"q": "  "}).json() == []
+
+    def test_sparse_fields(self, client: TestClient, blogs):
+        """Test ?fields= works on search results"""
+        response = client.get("/api/v1/blogs/search?q=showcase&fields=title")
+        assert response.json() == [{"title": "Design showcase"}]
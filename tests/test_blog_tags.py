@@ -0,0 +1,95 @@
+"""
+Tests for normalized blog tags
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models import BlogTag, Member, Project
+from app.services.blog_service import normalize_tags
+
+
+@pytest.fixture
+def author(db_session):
+    """A project with one member to author blogs"""
+    project = Project(project_name="Tagged")
+    member = Member(member_name="Author", project=project, team_type="Dev", role="Writer", experience=1)
+    db_session.add(member)
+    db_session.commit()
+    return member
+
+
+def create_blog(client: TestClient, author: Member, title: str, tags):
+    response = client.post("/api/v1/blogs/", json={
+        "project_id": author.project_id,
+        "author_id": author.member_id,
+        "title": title,
+        "content": "Body",
+        "tags": tags,
+    })
+    assert response.status_code == 201
+    return response.json()
+
+
+class TestBlogTags:
+    """Test class for blog_tags maintenance and tag endpoints"""
+
+    def test_create_blog(self, client: TestClient, author, sample_blog_data):
+        """Test blogs can be created with tags kept as given"""
+        sample_blog_data.update(project_id=author.project_id, author_id=author.member_id)
+        response = client.post("/api/v1/blogs/", json=sample_blog_data)
+        assert response.status_code == 201
+        assert response.json()["tags"] == ["Python", "FastAPI"]
+
+    def test_create_blog_unknown_author(self, client: TestClient, author, sample_blog_data):
+        """Test a missing author is rejected"""
+        sample_blog_data.update(project_id=None, author_id=999)
+        assert client.post("/api/v1/blogs/", json=sample_blog_data).status_code == 404
+
+    def test_filter_by_tag(self, client: TestClient, author):
+        """Test ?tag= matches normalized tags"""
+        create_blog(client, author, "First", ["Python", "news"])
+        create_blog(client, author, "Second", ["design"])
+
+        response = client.get("/api/v1/blogs/?tag=PYTHON")
+        assert [blog["title"] for blog in response.json()] == ["First"]
+
+        response = client.get(f"/api/v1/blogs/?tag=design&project_id={author.project_id}")
+        assert [blog["title"] for blog in response.json()] == ["Second"]
+
+    def test_update_syncs_tags(self, client: TestClient, db_session, author):
+        """Test updates add and remove only changed tag rows"""
+        blog_id = create_blog(client, author, "Post", ["a", "b"])["blog_id"]
+
+        client.patch(f"/api/v1/blogs/{blog_id}", json={"tags": ["b", "c"]})
+        rows = db_session.query(BlogTag.tag).filter(BlogTag.blog_id == blog_id).order_by(BlogTag.tag).all()
+        assert [tag for tag, in rows] == ["b", "c"]
+
+        client.patch(f"/api/v1/blogs/{blog_id}", json={"title": "Renamed"})
+        assert db_session.query(BlogTag).filter(BlogTag.blog_id == blog_id).count() == 2
+
+    def test_delete_removes_tags(self, client: TestClient, db_session, author):
+        """Test tag rows go away with their blog"""
+        blog_id = create_blog(client, author, "Post", ["a"])["blog_id"]
+        assert client.delete(f"/api/v1/blogs/{blog_id}").status_code == 200
+        assert db_session.query(BlogTag).count() == 0
+
+    def test_tag_counts(self, client: TestClient, author):
+        """Test /blogs/tags counts blogs per tag and is invalidated by writes"""
+        create_blog(client, author, "One", ["python", "news"])
+        create_blog(client, author, "Two", ["Python"])
+
+        response = client.get("/api/v1/blogs/tags")
+        assert response.json() == [{"tag": "python", "count": 2}, {"tag": "news", "count": 1}]
+        assert client.get("/api/v1/blogs/tags").headers["X-Cache"] == "HIT"
+
+        create_blog(client, author, "Three", ["news"])
+        assert client.get("/api/v1/blogs/tags").json() == [
+            {"tag": "news", "count": 2}, {"tag": "python", "count": 2}
+        ]
+
+
+def test_normalize_tags():
+    """Test tags are trimmed, lowercased and de-duplicated"""
+    assert normalize_tags([" Python", "python", "", "News "]) == ["python", "news"]
+    assert normalize_tags(None) == []
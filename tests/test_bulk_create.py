@@ -0,0 +1,106 @@
+"""
+Tests for the POST /{entity}/bulk endpoints
+"""
+
+from fastapi.testclient import TestClient
+
+from app.models import BlogTag, Member, Project
+
+
+def create_project(db_session, name: str = "Bulk") -> int:
+    project = Project(project_name=name)
+    db_session.add(project)
+    db_session.commit()
+    return project.project_id
+
+
+def member_payload(name: str, **overrides):
+    return {"member_name": name, "team_type": "Development", "role": "Backend", "experience": 1, **overrides}
+
+
+class TestBulkCreate:
+    """Test class for bulk create endpoints"""
+
+    def test_members_single_insert(self, client: TestClient, db_session, assert_query_budget):
+        """Test a large payload costs a fixed number of queries"""
+        project_id = create_project(db_session)
+        items = [member_payload(f"Member {i}", project_id=project_id) for i in range(200)]
+
+        response = client.post("/api/v1/members/bulk", json=items)
+        assert response.status_code == 201
+        data = response.json()
+        assert data["errors"] == []
+        assert [c["item"]["member_name"] for c in data["created"]] == [f"Member {i}" for i in range(200)]
+        assert [c["index"] for c in data["created"]] == list(range(200))
+        assert all(c["item"]["member_id"] and c["item"]["created_at"] for c in data["created"])
+        # Project lookup and the multi-row INSERT ... RETURNING
+        assert assert_query_budget(response, 2) == 2
+        assert db_session.query(Member).count() == 200
+
+    def test_errors_reported_per_item(self, client: TestClient, db_session):
+        """Test invalid items are skipped and reported by index"""
+        project_id = create_project(db_session)
+        items = [
+            member_payload("Valid", project_id=project_id),
+            member_payload("", project_id=project_id),
+            member_payload("Orphan", project_id=999),
+            member_payload("General"),
+        ]
+
+        response = client.post("/api/v1/members/bulk", json=items)
+        assert response.status_code == 207
+        data = response.json()
+        assert [(c["index"], c["item"]["member_name"]) for c in data["created"]] == [(0, "Valid"), (3, "General")]
+        assert [error["index"] for error in data["errors"]] == [1, 2]
+        assert data["errors"][0]["errors"][0]["loc"] == ["member_name"]
+        assert data["errors"][1]["errors"][0]["msg"] == "Project not found"
+
+    def test_non_objects_reported_per_item(self, client: TestClient, db_session):
+        """Test items that are not objects do not reject the whole payload"""
+        response = client.post("/api/v1/projects/bulk", json=[5, {"project_name": "A"}, "B", None])
+        assert response.status_code == 207
+        data = response.json()
+        assert [(c["index"], c["item"]["project_name"]) for c in data["created"]] == [(1, "A")]
+        assert [error["index"] for error in data["errors"]] == [0, 2, 3]
+        assert data["errors"][0]["errors"][0]["type"] == "model_type"
+
+    def test_blogs_with_tags(self, client: TestClient, db_session):
+        """Test bulk blogs check their author and fill blog_tags"""
+        author = Member(member_name="Author", team_type="Content", role="Writer", experience=3)
+        db_session.add(author)
+        db_session.commit()
+        items = [
+            {"author_id": author.member_id, "title": "One", "content": "...", "tags": ["Python", "python "]},
+            {"author_id": 999, "title": "Two", "content": "..."},
+        ]
+
+        data = client.post("/api/v1/blogs/bulk", json=items).json()
+        assert [c["item"]["title"] for c in data["created"]] == ["One"]
+        assert data["errors"][0]["errors"][0]["loc"] == ["author_id"]
+        assert [row.tag for row in db_session.query(BlogTag).all()] == ["python"]
+
+    def test_assets_duplicate_public_ids(self, client: TestClient, db_session):
+        """Test public IDs must be unique across the table and the payload"""
+        client.post("/api/v1/assets/", json={"filename": "a", "cloudinary_public_id": "test/a"})
+        items = [
+            {"filename": "a", "cloudinary_public_id": "test/a"},
+            {"filename": "b", "cloudinary_public_id": "test/b"},
+            {"filename": "b again", "cloudinary_public_id": "test/b"},
+        ]
+
+        data = client.post("/api/v1/assets/bulk", json=items).json()
+        assert [(c["index"], c["item"]["filename"]) for c in data["created"]] == [(1, "b")]
+        assert [error["index"] for error in data["errors"]] == [0, 2]
+
+    def test_projects_invalidate_cache(self, client: TestClient, db_session):
+        """Test bulk writes reach the read caches"""
+        assert client.get("/api/v1/projects/").json() == []
+        client.post("/api/v1/projects/bulk", json=[{"project_name": "A"}, {"project_name": "B"}])
+        assert len(client.get("/api/v1/projects/").json()) == 2
+
+    def test_too_many_items(self, client: TestClient, db_session, monkeypatch):
+        """Test payloads over BULK_MAX_ITEMS are refused"""
+        from app.config import settings
+        monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+        response = client.post("/api/v1/projects/bulk", json=[{"project_name": "x"}] * 3)
+        assert response.status_code == 413
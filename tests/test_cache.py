@@ -0,0 +1,355 @@
+"""
+Tests for the response cache and its invalidation
+"""
+
+import asyncio
+import fnmatch
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.cache import backends, response_cache
+from app.cache.backends import MemoryCacheBackend, RedisCacheBackend
+from app.cache.response_cache import ResponseCache
+from app.config import settings
+from app.database.base import READ_YOUR_WRITES_COOKIE
+from app.models import Asset, AssetType, Project
+
+
+class FakeRedis:
+    """The subset of redis-py used by RedisCacheBackend, without expiry"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.round_trips = 0
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def get(self, key):
+        self.round_trips += 1
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.ttls[key] = ex
+
+    def sadd(self, key, member):
+        self.data.setdefault(key, set()).add(member)
+
+    def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    def ttl(self, key):
+        return self.ttls.get(key) or -1
+
+    def expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+    def delete(self, *keys):
+        self.round_trips += 1
+        for key in keys:
+            self.data.pop(key, None)
+            self.ttls.pop(key, None)
+
+    def scan_iter(self, match):
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, match)]
+
+
+class FakePipeline:
+    """Queues commands and runs them in one round trip on execute()"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+        return queue
+
+    def execute(self):
+        self.client.round_trips += 1
+        round_trips = self.client.round_trips
+        results = [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.client.round_trips = round_trips
+        return results
+
+
+class TestMemoryCacheBackend:
+    """Test class for the in-process LRU backend"""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry goes first"""
+        cache = MemoryCacheBackend(max_entries=2)
+        cache.set("a", b"1", 60)
+        cache.set("b", b"2", 60)
+        cache.get("a")
+        cache.set("c", b"3", 60)
+
+        assert cache.get("a") == b"1"
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+    def test_expiry(self, monkeypatch):
+        """Test entries are dropped once their TTL passed"""
+        now = [1000.0]
+        monkeypatch.setattr(backends.time, "monotonic", lambda: now[0])
+        cache = MemoryCacheBackend()
+        cache.set("a", b"1", 10)
+
+        assert cache.get("a") == b"1"
+        now[0] += 10
+        assert cache.get("a") is None
+
+    def test_invalidate_by_tag(self):
+        """Test only entries carrying the tag are dropped"""
+        cache = MemoryCacheBackend()
+        cache.set("project-1", b"1", 60, ["project:1"])
+        cache.set("projects", b"[]", 60, ["project:list", "project:1", "project:2"])
+        cache.set("project-2", b"2", 60, ["project:2"])
+
+        cache.invalidate(["project:1"])
+
+        assert cache.get("project-1") is None
+        assert cache.get("projects") is None
+        assert cache.get("project-2") == b"2"
+
+
+class TestRedisCacheBackend:
+    """Test class for the Redis backend against a fake client"""
+
+    def test_roundtrip_and_invalidate(self):
+        """Test values and tag sets are stored under the prefix"""
+        client = FakeRedis()
+        cache = RedisCacheBackend(client, prefix="test:")
+        cache.set("a", b"1", 30, ["blog:1"])
+        cache.set("b", b"2", 30, ["blog:2"])
+
+        assert cache.get("a") == b"1"
+        assert client.smembers("test:tag:blog:1") == {"test:a"}
+        assert client.ttls["test:tag:blog:1"] == 30
+
+        cache.invalidate(["blog:1"])
+        assert cache.get("a") is None
+        assert cache.get("b") == b"2"
+
+        cache.clear()
+        assert client.data == {}
+
+    def test_calls_are_pipelined(self):
+        """Test set() and invalidate() cost two round trips however many tags there are"""
+        client = FakeRedis()
+        cache = RedisCacheBackend(client, prefix="test:")
+        tags = [f"project:{i}" for i in range(50)]
+
+        cache.set("page", b"[]", 30, tags)
+        assert client.round_trips == 2
+        assert all(client.ttls[f"test:tag:{tag}"] == 30 for tag in tags)
+
+        # Tag sets already living long enough are not touched again
+        client.round_trips = 0
+        cache.set("other", b"[]", 10, tags)
+        assert client.round_trips == 1
+        assert client.ttls["test:tag:project:0"] == 30
+
+        client.round_trips = 0
+        cache.invalidate(tags)
+        assert client.round_trips == 2
+        assert client.data == {}
+
+
+class TestResponseCache:
+    """Test class for cached read endpoints"""
+
+    def test_list_hit_and_invalidation(self, client: TestClient, sample_project_data):
+        """Test list pages are served from cache until a project changes"""
+        client.post("/api/v1/projects/", json=sample_project_data)
+
+        first = client.get("/api/v1/projects/")
+        assert first.headers["X-Cache"] == "MISS"
+        second = client.get("/api/v1/projects/")
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+
+        client.post("/api/v1/projects/", json={"project_name": "Second"})
+        third = client.get("/api/v1/projects/")
+        assert third.headers["X-Cache"] == "MISS"
+        assert len(third.json()) == 2
+
+    def test_query_string_is_part_of_key(self, client: TestClient, sample_project_data):
+        """Test different query strings never share an entry"""
+        client.post("/api/v1/projects/", json=sample_project_data)
+
+        assert client.get("/api/v1/projects/?limit=5").headers["X-Cache"] == "MISS"
+        assert client.get("/api/v1/projects/?limit=6").headers["X-Cache"] == "MISS"
+        assert client.get("/api/v1/projects/?fields=project_name").json() == [
+            {"project_name": sample_project_data["project_name"]}
+        ]
+
+    def test_cursor_header_is_cached(self, client: TestClient):
+        """Test X-Next-Cursor survives a cache hit"""
+        for i in range(3):
+            client.post("/api/v1/projects/", json={"project_name": f"Project {i}"})
+
+        first = client.get("/api/v1/projects/?limit=2")
+        second = client.get("/api/v1/projects/?limit=2")
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+
+    def test_detail_invalidated_by_update(self, client: TestClient, sample_project_data):
+        """Test an update drops the cached detail of the row"""
+        project_id = client.post("/api/v1/projects/", json=sample_project_data).json()["project_id"]
+        client.get(f"/api/v1/projects/{project_id}")
+        assert client.get(f"/api/v1/projects/{project_id}").headers["X-Cache"] == "HIT"
+
+        client.patch(f"/api/v1/projects/{project_id}", json={"project_name": "Renamed"})
+        response = client.get(f"/api/v1/projects/{project_id}")
+        assert response.headers["X-Cache"] == "MISS"
+        assert response.json()["project_name"] == "Renamed"
+
+    def test_attach_invalidates_both_sides(self, client: TestClient, db_session):
+        """Test attaching an asset drops the cached project and asset details"""
+        project = Project(project_name="Attach target")
+        asset = Asset(filename="logo", cloudinary_public_id="test/logo", asset_type=AssetType.IMAGE)
+        db_session.add_all([project, asset])
+        db_session.commit()
+        project_id, asset_id = project.project_id, asset.asset_id
+
+        assert client.get(f"/api/v1/projects/{project_id}").json()["assets"] == []
+        assert client.get(f"/api/v1/assets/{asset_id}").json()["projects"] == []
+
+        client.post(f"/api/v1/projects/{project_id}/assets/attach", json={"asset_ids": [asset_id]})
+
+        assert len(client.get(f"/api/v1/projects/{project_id}").json()["assets"]) == 1
+        assert len(client.get(f"/api/v1/assets/{asset_id}").json()["projects"]) == 1
+
+    def test_embedded_rows_invalidate_parent(self, client: TestClient, db_session):
+        """Test updating an asset drops details that embed it"""
+        project = Project(project_name="Embedding")
+        asset = Asset(filename="before", cloudinary_public_id="test/embedded", asset_type=AssetType.IMAGE)
+        project.assets.append(asset)
+        db_session.add(project)
+        db_session.commit()
+        project_id, asset_id = project.project_id, asset.asset_id
+
+        client.get(f"/api/v1/projects/{project_id}")
+        client.patch(f"/api/v1/assets/{asset_id}", json={"filename": "after"})
+
+        response = client.get(f"/api/v1/projects/{project_id}")
+        assert response.headers["X-Cache"] == "MISS"
+        assert response.json()["assets"][0]["filename"] == "after"
+
+    def test_disabled(self, client: TestClient, sample_project_data, monkeypatch):
+        """Test nothing is cached with CACHE_ENABLED off"""
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+        client.post("/api/v1/projects/", json=sample_project_data)
+        client.get("/api/v1/projects/")
+        assert "X-Cache" not in client.get("/api/v1/projects/").headers
+
+    def test_stats(self, client: TestClient, sample_project_data):
+        """Test the stats endpoint reports hits and misses"""
+        client.post("/api/v1/projects/", json=sample_project_data)
+        client.get("/api/v1/projects/")
+        client.get("/api/v1/projects/")
+
+        stats = client.get("/api/v1/cache/stats").json()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+        assert client.delete("/api/v1/cache/").status_code == 200
+        assert client.get("/api/v1/cache/stats").json()["hits"] == 0
+
+    def test_blocking_backend_runs_off_the_event_loop(self, client: TestClient, sample_project_data, monkeypatch):
+        """Test lookups and stores of a network backend are not made on the event loop"""
+        calls = []
+
+        class NetworkBackend(MemoryCacheBackend):
+            blocking = True
+
+            def get(self, key):
+                calls.append(("get", self._on_event_loop()))
+                return super().get(key)
+
+            def set(self, key, value, ttl, tags=()):
+                calls.append(("set", self._on_event_loop()))
+                super().set(key, value, ttl, tags)
+
+            @staticmethod
+            def _on_event_loop():
+                try:
+                    asyncio.get_running_loop()
+                    return True
+                except RuntimeError:
+                    return False
+
+        monkeypatch.setattr(response_cache, "backend", NetworkBackend())
+        client.post("/api/v1/projects/", json=sample_project_data)
+        client.get("/api/v1/projects/")
+        assert client.get("/api/v1/projects/").headers["X-Cache"] == "HIT"
+        assert calls == [("get", False), ("set", False), ("get", False)]
+
+    def test_invalidation_on_event_loop_runs_off_it(self):
+        """Test an invalidation reported on the event loop is run in the threadpool and awaited by lookups"""
+        calls = []
+
+        class NetworkBackend(MemoryCacheBackend):
+            blocking = True
+
+            def invalidate(self, tags):
+                time.sleep(0.05)
+                calls.append(("invalidate", threading.get_ident()))
+                super().invalidate(tags)
+
+        cache = ResponseCache(NetworkBackend())
+        request = Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": []})
+
+        async def write_then_read():
+            await cache.store("projects:list", request, b"[]", {"project:list"})
+            # As an AsyncSession service does inside run_sync()
+            cache.invalidate(["project:list"])
+            assert calls == []
+            return await cache.get("projects:list", request)
+
+        assert asyncio.run(write_then_read()) is None
+        assert len(calls) == 1
+        assert calls[0][1] != threading.get_ident()
+
+    def test_recent_writers_skip_the_cache(self, client: TestClient, sample_project_data):
+        """Test clients inside their read-your-writes window are not served cached entries"""
+        client.post("/api/v1/projects/", json=sample_project_data)
+        client.get("/api/v1/projects/")
+        assert client.get("/api/v1/projects/").headers["X-Cache"] == "HIT"
+
+        client.cookies.set(READ_YOUR_WRITES_COOKIE, str(time.time()))
+        response = client.get("/api/v1/projects/")
+        assert response.headers["X-Cache"] == "MISS"
+
+    def test_replica_reads_after_invalidation_are_not_stored(self, monkeypatch):
+        """Test a replica read that may predate the last write is not cached"""
+        monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 5)
+        cache = ResponseCache(MemoryCacheBackend())
+        request = Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": []})
+        request.state.read_replica = True
+
+        cache.invalidate(["project:1"])
+        assert "X-Cache" not in asyncio.run(cache.store("projects:list", request, b"[]", {"project:list"})).headers
+        assert asyncio.run(cache.get("projects:list", request)) is None
+
+        # Once the window has passed
+        cache.last_invalidation -= 5
+        asyncio.run(cache.store("projects:list", request, b"[]", {"project:list"}))
+        assert asyncio.run(cache.get("projects:list", request)) is not None
+
+        # Primary reads are always stored
+        request.state.read_replica = False
+        cache.invalidate(["project:1"])
+        asyncio.run(cache.store("projects:list", request, b"[]", {"project:list"}))
+        assert asyncio.run(cache.get("projects:list", request)) is not None
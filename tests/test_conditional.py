@@ -0,0 +1,114 @@
+"""
+Tests for ETag / Last-Modified validators and 304 responses
+"""
+
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.cache import response_cache
+from app.models import Asset, AssetType, Project
+
+
+def create_project(db_session, name: str = "Conditional") -> Project:
+    project = Project(project_name=name)
+    db_session.add(project)
+    db_session.commit()
+    return project
+
+
+class TestDetailValidators:
+    """Test class for conditional GETs of detail routes"""
+
+    def test_validators_emitted(self, client: TestClient, db_session):
+        """Test detail responses carry a strong ETag and Last-Modified"""
+        project_id = create_project(db_session).project_id
+
+        response = client.get(f"/api/v1/projects/{project_id}")
+        assert response.status_code == 200
+        assert response.headers["ETag"].startswith('"')
+        assert response.headers["Last-Modified"].endswith("GMT")
+
+    def test_if_none_match(self, client: TestClient, db_session, assert_query_budget):
+        """Test a matching ETag yields an empty 304 without loading the row"""
+        project_id = create_project(db_session).project_id
+        etag = client.get(f"/api/v1/projects/{project_id}").headers["ETag"]
+
+        cached = client.get(f"/api/v1/projects/{project_id}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+
+        # Without a cache entry only the version watermark is queried
+        response_cache.clear()
+        response = client.get(f"/api/v1/projects/{project_id}", headers={"If-None-Match": f"W/{etag}"})
+        assert response.status_code == 304
+        assert assert_query_budget(response, 1) == 1
+
+    def test_stale_etag(self, client: TestClient, db_session):
+        """Test a changed row is sent again with a new ETag"""
+        project = create_project(db_session)
+        etag = client.get(f"/api/v1/projects/{project.project_id}").headers["ETag"]
+
+        project.updated_at = datetime.utcnow() + timedelta(minutes=1)
+        db_session.commit()
+        response_cache.clear()
+
+        response = client.get(f"/api/v1/projects/{project.project_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_relationship_changes_etag(self, client: TestClient, db_session):
+        """Test attaching an asset changes the ETag of the project detail"""
+        project = create_project(db_session)
+        asset = Asset(filename="logo", cloudinary_public_id="test/logo", asset_type=AssetType.IMAGE)
+        db_session.add(asset)
+        db_session.commit()
+        project_id, asset_id = project.project_id, asset.asset_id
+
+        etag = client.get(f"/api/v1/projects/{project_id}").headers["ETag"]
+        client.post(f"/api/v1/projects/{project_id}/assets/attach", json={"asset_ids": [asset_id]})
+
+        response = client.get(f"/api/v1/projects/{project_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert len(response.json()["assets"]) == 1
+
+    def test_if_modified_since(self, client: TestClient, db_session):
+        """Test If-Modified-Since is compared against Last-Modified"""
+        project_id = create_project(db_session).project_id
+        last_modified = client.get(f"/api/v1/projects/{project_id}").headers["Last-Modified"]
+
+        response = client.get(f"/api/v1/projects/{project_id}", headers={"If-Modified-Since": last_modified})
+        assert response.status_code == 304
+
+        earlier = "Mon, 01 Jan 2001 00:00:00 GMT"
+        response = client.get(f"/api/v1/projects/{project_id}", headers={"If-Modified-Since": earlier})
+        assert response.status_code == 200
+
+    def test_missing_row(self, client: TestClient, db_session):
+        """Test unknown ids still answer 404"""
+        assert client.get("/api/v1/projects/999", headers={"If-None-Match": "*"}).status_code == 404
+
+
+class TestCollectionValidators:
+    """Test class for conditional GETs of list routes"""
+
+    def test_if_none_match(self, client: TestClient, db_session):
+        """Test list pages answer 304 until the table changes"""
+        create_project(db_session)
+        etag = client.get("/api/v1/projects/").headers["ETag"]
+
+        response_cache.clear()
+        assert client.get("/api/v1/projects/", headers={"If-None-Match": etag}).status_code == 304
+
+        client.post("/api/v1/projects/", json={"project_name": "Another"})
+        response = client.get("/api/v1/projects/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+
+    def test_query_string_changes_etag(self, client: TestClient, db_session):
+        """Test each page of a list has its own ETag"""
+        create_project(db_session)
+        first = client.get("/api/v1/projects/?limit=1").headers["ETag"]
+        second = client.get("/api/v1/projects/?limit=2").headers["ETag"]
+        assert first != second
@@ -0,0 +1,105 @@
+"""
+Tests for signed direct-to-Cloudinary uploads
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models import Asset
+from tests.conftest import CLOUDINARY_TEST_KEY
+
+
+def registration(upload_result: dict, **extra) -> dict:
+    fields = ("public_id", "version", "signature", "resource_type", "format", "bytes", "width", "height")
+    return {**{name: upload_result[name] for name in fields}, **extra}
+
+
+class TestDirectUpload:
+    """Test class for POST /assets/upload/sign and POST /assets/register"""
+
+    def test_signed_upload_flow(self, client: TestClient, db_session, fake_cloudinary):
+        """Test signing, uploading to the fake and registering the result"""
+        params = client.post("/api/v1/assets/upload/sign", json={"asset_type": "IMAGE"}).json()
+        assert params["folder"] == "pixerse/images"
+        assert params["upload_url"].endswith("/image/upload")
+        assert params["expires_at"] == params["timestamp"] + 3600
+        assert params["api_key"] == CLOUDINARY_TEST_KEY
+
+        result = fake_cloudinary.direct_upload(params, b"x" * 50)
+        response = client.post(
+            "/api/v1/assets/register", json=registration(result, original_filename="logo.png", description="Logo")
+        )
+        assert response.status_code == 201
+        asset = response.json()
+        assert asset["cloudinary_public_id"] == result["public_id"]
+        assert asset["cloudinary_url"].startswith("https://")
+        assert asset["cloudinary_url"].endswith(f"/image/upload/v{result['version']}/{result['public_id']}.png")
+        assert asset["mime_type"] == "image/png"
+        assert asset["file_size"] == 50
+        assert asset["original_filename"] == "logo.png"
+        assert db_session.query(Asset).count() == 1
+
+    def test_video_upload(self, client: TestClient, db_session, fake_cloudinary):
+        """Test videos are signed for the video folder and endpoint"""
+        params = client.post("/api/v1/assets/upload/sign", json={"asset_type": "VIDEO"}).json()
+        assert params["folder"] == "pixerse/videos"
+        result = fake_cloudinary.direct_upload(params, b"v" * 10, "mp4")
+        asset = client.post("/api/v1/assets/register", json=registration(result)).json()
+        assert asset["asset_type"] == "VIDEO"
+        assert asset["mime_type"] == "video/mp4"
+
+    def test_every_signature_is_for_a_new_file(self, client: TestClient, db_session):
+        """Test signed parameters name a fresh public_id each time"""
+        first = client.post("/api/v1/assets/upload/sign", json={}).json()
+        second = client.post("/api/v1/assets/upload/sign", json={}).json()
+        assert first["public_id"] != second["public_id"]
+
+    def test_tampered_params_are_refused(self, client: TestClient, db_session, fake_cloudinary):
+        """Test the signature binds the folder"""
+        params = client.post("/api/v1/assets/upload/sign", json={}).json()
+        with pytest.raises(ValueError):
+            fake_cloudinary.direct_upload({**params, "folder": "elsewhere"}, b"x")
+
+    def test_forged_registration(self, client: TestClient, db_session, fake_cloudinary):
+        """Test a registration without Cloudinary's signature is refused"""
+        params = client.post("/api/v1/assets/upload/sign", json={}).json()
+        result = fake_cloudinary.direct_upload(params, b"x")
+        response = client.post(
+            "/api/v1/assets/register", json=registration(result, public_id="pixerse/images/someone-else")
+        )
+        assert response.status_code == 400
+        assert db_session.query(Asset).count() == 0
+
+    def test_uploads_outside_signed_folders_are_refused(self, client: TestClient, db_session, fake_cloudinary):
+        """Test a genuine Cloudinary response for a file elsewhere in the account cannot be registered"""
+        params = client.post("/api/v1/assets/upload/sign", json={}).json()
+        for folder in ("private", "pixerse", "pixerse/images/nested"):
+            result = fake_cloudinary.direct_upload({**params, "folder": folder}, b"x", sign=True)
+            response = client.post("/api/v1/assets/register", json=registration(result))
+            assert response.status_code == 400
+        assert db_session.query(Asset).count() == 0
+
+    def test_resource_type_follows_folder(self, client: TestClient, db_session, fake_cloudinary):
+        """Test the resource type comes from the folder, not from the client"""
+        params = client.post("/api/v1/assets/upload/sign", json={"asset_type": "IMAGE"}).json()
+        result = fake_cloudinary.direct_upload(params, b"x")
+        response = client.post("/api/v1/assets/register", json=registration(result, resource_type="video"))
+        assert response.status_code == 400
+
+        payload = registration(result)
+        del payload["resource_type"]
+        asset = client.post("/api/v1/assets/register", json=payload).json()
+        assert asset["asset_type"] == "IMAGE"
+        assert "/image/upload/" in asset["cloudinary_url"]
+
+    def test_registering_twice(self, client: TestClient, db_session, fake_cloudinary):
+        """Test an upload can only be registered once"""
+        params = client.post("/api/v1/assets/upload/sign", json={}).json()
+        payload = registration(fake_cloudinary.direct_upload(params, b"x"))
+        assert client.post("/api/v1/assets/register", json=payload).status_code == 201
+        assert client.post("/api/v1/assets/register", json=payload).status_code == 400
+
+    def test_youtube_cannot_be_signed(self, client: TestClient, db_session):
+        """Test only uploadable asset types get signed parameters"""
+        response = client.post("/api/v1/assets/upload/sign", json={"asset_type": "YOUTUBE"})
+        assert response.status_code == 400
@@ -0,0 +1,70 @@
+"""
+Tests for the streaming export endpoints
+"""
+
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.models import Asset, AssetType, Project
+from app.services.export_service import ExportService
+
+
+def add_projects(db_session, count: int):
+    db_session.add_all([Project(project_name=f"Project {i}") for i in range(count)])
+    db_session.commit()
+
+
+class TestExport:
+    """Test class for /{entity}/export"""
+
+    def test_ndjson(self, client: TestClient, db_session):
+        """Test one JSON object per line in primary key order"""
+        add_projects(db_session, 3)
+
+        response = client.get("/api/v1/projects/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert 'filename="projects.ndjson"' in response.headers["content-disposition"]
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["project_name"] for line in lines] == ["Project 0", "Project 1", "Project 2"]
+        assert set(lines[0]) == {"project_id", "project_name", "description", "created_at", "updated_at"}
+
+    def test_csv(self, client: TestClient, db_session):
+        """Test a header row followed by one record per row"""
+        db_session.add(Asset(filename="logo", cloudinary_public_id="test/logo", asset_type=AssetType.IMAGE))
+        db_session.commit()
+
+        response = client.get("/api/v1/assets/export?format=csv")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+
+        records = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(records) == 1
+        assert records[0]["filename"] == "logo"
+        assert records[0]["asset_type"] == "IMAGE"
+
+    def test_empty_csv_has_header(self, client: TestClient, db_session):
+        """Test an empty table still exports its header"""
+        response = client.get("/api/v1/members/export?format=csv")
+        assert response.text.splitlines()[0].startswith("member_name,")
+
+    def test_unknown_format(self, client: TestClient, db_session):
+        """Test unsupported formats are rejected"""
+        assert client.get("/api/v1/blogs/export?format=xml").status_code == 422
+
+    def test_batches(self, db_session, monkeypatch):
+        """Test rows are fetched EXPORT_BATCH_SIZE at a time"""
+        monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+        add_projects(db_session, 5)
+
+        batches = list(ExportService.iter_batches(db_session, "project"))
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+
+        chunks = list(ExportService.stream(db_session, "project", "ndjson"))
+        assert len(chunks) == 3
+        assert sum(chunk.count(b"\n") for chunk in chunks) == 5
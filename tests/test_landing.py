@@ -0,0 +1,51 @@
+"""
+Tests for the landing page snapshot endpoint
+"""
+
+from fastapi.testclient import TestClient
+
+from app.services.landing_service import landing_snapshot
+
+
+class TestLanding:
+    """Test class for /api/v1/landing"""
+
+    def test_combined_payload(self, client: TestClient, sample_project_data):
+        """Test every section is present, newest rows first"""
+        client.post("/api/v1/projects/", json=sample_project_data)
+        client.post("/api/v1/projects/", json={"project_name": "Newer"})
+
+        response = client.get("/api/v1/landing/")
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data) == {"projects", "members", "blogs", "assets"}
+        assert [p["project_name"] for p in data["projects"]] == ["Newer", sample_project_data["project_name"]]
+        assert data["members"] == data["blogs"] == data["assets"] == []
+
+    def test_snapshot_hit_runs_no_queries(self, client: TestClient, sample_project_data, assert_query_budget):
+        """Test repeated reads are served from memory"""
+        client.post("/api/v1/projects/", json=sample_project_data)
+        first = client.get("/api/v1/landing/")
+        assert assert_query_budget(first, 4) == 4
+
+        second = client.get("/api/v1/landing/")
+        assert assert_query_budget(second, 0) == 0
+        assert second.content == first.content
+
+    def test_write_rebuilds_only_its_section(self, client: TestClient, sample_project_data, assert_query_budget):
+        """Test a write re-queries the changed section alone"""
+        client.get("/api/v1/landing/")
+        client.post("/api/v1/projects/", json=sample_project_data)
+
+        response = client.get("/api/v1/landing/")
+        assert assert_query_budget(response, 1) == 1
+        assert response.json()["projects"][0]["project_name"] == sample_project_data["project_name"]
+        assert landing_snapshot.rebuilds == 2
+
+    def test_if_none_match(self, client: TestClient, sample_project_data):
+        """Test an unchanged snapshot answers 304"""
+        etag = client.get("/api/v1/landing/").headers["ETag"]
+        assert client.get("/api/v1/landing/", headers={"If-None-Match": etag}).status_code == 304
+
+        client.post("/api/v1/projects/", json=sample_project_data)
+        assert client.get("/api/v1/landing/", headers={"If-None-Match": etag}).status_code == 200
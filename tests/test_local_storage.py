@@ -0,0 +1,206 @@
+"""
+Tests for the storage backends and local file serving
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.config import Settings, settings
+from app.models import Asset, AssetDeletion
+from app.services.asset_deletion_service import AssetDeletionWorker
+from app.services.upload_job_service import UploadWorker
+from app.storage import LocalStorageBackend, get_backend, get_storage, parse_range
+from app.storage.cloudinary_backend import CloudinaryStorageBackend
+from tests.conftest import open_testing_db
+
+
+@pytest.fixture
+def local_storage(monkeypatch, tmp_path):
+    """Switch to the local backend storing under a temporary directory"""
+    def fail(*args, **kwargs):
+        raise AssertionError("the local backend must not call Cloudinary")
+
+    monkeypatch.setattr("cloudinary.uploader.upload", fail)
+    monkeypatch.setattr("cloudinary.api.delete_resources", fail)
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(settings, "STORAGE_LOCAL_ROOT", str(tmp_path / "assets"))
+    monkeypatch.setattr(settings, "UPLOAD_SPOOL_DIR", str(tmp_path / "spool"))
+    get_backend.cache_clear()
+    yield get_storage()
+    get_backend.cache_clear()
+
+
+def upload(client: TestClient, content: bytes = b"0123456789" * 10, name: str = "photo.png", query: str = ""):
+    return client.post(f"/api/v1/assets/upload{query}", files={"file": (name, content, "image/png")})
+
+
+class TestStorageSelection:
+    """Test class for STORAGE_BACKEND"""
+
+    def test_default_is_cloudinary(self):
+        """Test Cloudinary stays the default backend"""
+        assert isinstance(get_storage(), CloudinaryStorageBackend)
+
+    def test_local(self, local_storage, tmp_path):
+        """Test the local backend is built from the settings"""
+        assert isinstance(local_storage, LocalStorageBackend)
+        assert local_storage.root == os.path.realpath(tmp_path / "assets")
+
+    def test_local_backend_does_not_load_cloudinary(self):
+        """Test the local backend and the upload helpers work without the Cloudinary SDK"""
+        code = (
+            "import sys; import app.storage.local, app.services.uploads; "
+            "assert not any(name.startswith('cloudinary') for name in sys.modules)"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "STORAGE_BACKEND": "local"})
+
+    @pytest.mark.parametrize("name", ["CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET"])
+    def test_cloudinary_requires_credentials(self, name):
+        """Test each Cloudinary credential is required by the cloudinary backend only"""
+        with pytest.raises(ValidationError, match=name):
+            Settings(STORAGE_BACKEND="cloudinary", **{name: ""})
+        assert Settings(STORAGE_BACKEND="local", **{name: ""}).STORAGE_BACKEND == "local"
+
+
+class TestLocalStorage:
+    """Test class for uploads, serving and deletion with the local backend"""
+
+    def test_upload_writes_file(self, client: TestClient, db_session, local_storage):
+        """Test an upload is written below the root and served from its URL"""
+        response = upload(client)
+        assert response.status_code == 201
+        asset = response.json()["asset"]
+        assert asset["cloudinary_public_id"].startswith("pixerse/images/")
+        assert asset["cloudinary_public_id"].endswith(".png")
+        assert asset["cloudinary_url"] == f"/api/v1/assets/files/{asset['cloudinary_public_id']}"
+        assert asset["file_size"] == 100
+        with open(local_storage.path_for(asset["cloudinary_public_id"]), "rb") as file:
+            assert file.read() == b"0123456789" * 10
+        # No temporary files are left behind
+        assert os.listdir(os.path.dirname(local_storage.path_for(asset["cloudinary_public_id"]))) == [
+            os.path.basename(asset["cloudinary_public_id"])
+        ]
+
+        served = client.get(asset["cloudinary_url"])
+        assert served.status_code == 200
+        assert served.content == b"0123456789" * 10
+        assert served.headers["content-type"] == "image/png"
+        assert served.headers["accept-ranges"] == "bytes"
+        assert served.headers["x-content-type-options"] == "nosniff"
+        assert "content-disposition" not in served.headers
+
+    def test_scriptable_files_are_downloads(self, client: TestClient, db_session, local_storage):
+        """Test SVG files cannot run scripts on the API origin"""
+        svg = b'<svg xmlns="http://www.w3.org/2000/svg" onload="alert(document.domain)"/>'
+        response = client.post(
+            "/api/v1/assets/upload", files={"file": ("x.svg", svg, "image/svg+xml")}
+        )
+        assert response.status_code == 201
+
+        served = client.get(response.json()["asset"]["cloudinary_url"])
+        assert served.status_code == 200
+        assert served.headers["content-disposition"] == "attachment"
+        assert served.headers["x-content-type-options"] == "nosniff"
+        assert served.headers["content-security-policy"] == "sandbox"
+
+    def test_range_requests(self, client: TestClient, db_session, local_storage):
+        """Test single byte ranges are answered with 206"""
+        url = upload(client).json()["asset"]["cloudinary_url"]
+
+        response = client.get(url, headers={"Range": "bytes=10-19"})
+        assert response.status_code == 206
+        assert response.content == b"0123456789"
+        assert response.headers["content-range"] == "bytes 10-19/100"
+        assert response.headers["content-length"] == "10"
+
+        assert client.get(url, headers={"Range": "bytes=95-"}).content == b"56789"
+        assert client.get(url, headers={"Range": "bytes=-3"}).content == b"789"
+        assert client.get(url, headers={"Range": "bytes=90-500"}).headers["content-range"] == "bytes 90-99/100"
+
+        unsatisfiable = client.get(url, headers={"Range": "bytes=100-"})
+        assert unsatisfiable.status_code == 416
+        assert unsatisfiable.headers["content-range"] == "bytes */100"
+
+        # Several ranges are answered with the whole file
+        assert client.get(url, headers={"Range": "bytes=0-1,5-6"}).status_code == 200
+
+    def test_parse_range(self):
+        """Test Range header parsing edge cases"""
+        assert parse_range(None, 100) is None
+        assert parse_range("bytes=5-2", 100) is None
+        assert parse_range("items=0-1", 100) is None
+        assert parse_range("bytes=-500", 100) == (0, 99)
+        with pytest.raises(ValueError):
+            parse_range("bytes=-0", 100)
+
+    def test_paths_cannot_leave_root(self, client: TestClient, db_session, local_storage, tmp_path):
+        """Test keys resolving outside the storage root are refused"""
+        (tmp_path / "secret.txt").write_text("secret")
+        assert client.get("/api/v1/assets/files/pixerse/..%2F..%2Fsecret.txt").status_code == 404
+        with pytest.raises(HTTPException):
+            local_storage.path_for("../secret.txt")
+        assert client.get("/api/v1/assets/files/pixerse/images/missing.png").status_code == 404
+
+    def test_accel_redirect(self, client: TestClient, db_session, local_storage, monkeypatch):
+        """Test nginx is told to send the file when an accel prefix is configured"""
+        public_id = upload(client).json()["asset"]["cloudinary_public_id"]
+        monkeypatch.setattr(local_storage, "accel_prefix", "/protected")
+        response = client.get(f"/api/v1/assets/files/{public_id}")
+        assert response.headers["x-accel-redirect"] == f"/protected/{public_id}"
+        assert response.headers["content-type"] == "image/png"
+        assert response.content == b""
+
+    def test_deletion_removes_file(self, client: TestClient, db_session, local_storage):
+        """Test deleted assets have their file removed by the outbox worker"""
+        asset = upload(client).json()["asset"]
+        path = local_storage.path_for(asset["cloudinary_public_id"])
+        client.delete(f"/api/v1/assets/{asset['asset_id']}")
+        assert os.path.exists(path)
+
+        assert db_session.query(AssetDeletion).one().backend == "local"
+
+        asyncio.run(AssetDeletionWorker(session_factory=open_testing_db).drain())
+        assert not os.path.exists(path)
+        assert db_session.query(AssetDeletion).count() == 0
+
+    def test_deletions_go_to_their_backend(self, client: TestClient, db_session, local_storage, fake_cloudinary):
+        """Test deleting a Cloudinary asset while the local backend is selected deletes it in Cloudinary"""
+        remote = client.post(
+            "/api/v1/assets/", json={"filename": "remote", "cloudinary_public_id": "pixerse/images/remote"}
+        ).json()
+        local = upload(client).json()["asset"]
+        assert (remote["storage_backend"], local["storage_backend"]) == ("cloudinary", "local")
+
+        client.delete(f"/api/v1/assets/{remote['asset_id']}")
+        client.delete(f"/api/v1/assets/{local['asset_id']}")
+        assert sorted(deletion.backend for deletion in db_session.query(AssetDeletion)) == ["cloudinary", "local"]
+
+        asyncio.run(AssetDeletionWorker(session_factory=open_testing_db).drain())
+        assert [public_ids for public_ids, _, _ in fake_cloudinary.deletions] == [["pixerse/images/remote"]]
+        assert not os.path.exists(local_storage.path_for(local["cloudinary_public_id"]))
+        assert db_session.query(AssetDeletion).count() == 0
+
+    def test_queued_upload(self, client: TestClient, db_session, local_storage):
+        """Test upload jobs store through the local backend as well"""
+        location = upload(client, query="?async=true").headers["location"]
+        asyncio.run(UploadWorker(session_factory=open_testing_db).drain())
+
+        job = client.get(location).json()
+        assert job["status"] == "DONE"
+        public_id = db_session.get(Asset, job["asset_id"]).cloudinary_public_id
+        assert os.path.isfile(local_storage.path_for(public_id))
+
+    def test_direct_upload_needs_cloudinary(self, client: TestClient, db_session, local_storage):
+        """Test signed direct uploads are refused with the local backend"""
+        assert client.post("/api/v1/assets/upload/sign", json={}).status_code == 501
+
+    def test_cloudinary_backend_does_not_serve(self, client: TestClient, db_session):
+        """Test files of the Cloudinary backend are not served by the API"""
+        assert client.get("/api/v1/assets/files/pixerse/images/abc").status_code == 404
@@ -0,0 +1,78 @@
+"""
+Tests for member filters and the faceted member directory
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models import Member
+
+
+@pytest.fixture
+def team(db_session):
+    """Members spread over team types, roles and experience"""
+    rows = [
+        ("Ana", "Development", "Backend", 5),
+        ("Ben", "Development", "Frontend", 2),
+        ("Cai", "Development", "Backend", 2),
+        ("Dee", "Design", "UI", 5),
+        ("Eli", "Design", "UX", 1),
+    ]
+    db_session.add_all([
+        Member(member_name=name, team_type=team_type, role=role, experience=experience)
+        for name, team_type, role, experience in rows
+    ])
+    db_session.commit()
+
+
+class TestMemberFilters:
+    """Test class for filters on /members"""
+
+    def test_filters(self, client: TestClient, team):
+        """Test team type, role and experience range combine"""
+        response = client.get("/api/v1/members/?team_type=Development&min_experience=3")
+        assert [m["member_name"] for m in response.json()] == ["Ana"]
+
+        response = client.get("/api/v1/members/?role=Backend&max_experience=2")
+        assert [m["member_name"] for m in response.json()] == ["Cai"]
+
+    def test_negative_experience_rejected(self, client: TestClient, team):
+        """Test filter values are validated"""
+        assert client.get("/api/v1/members/?min_experience=-1").status_code == 422
+
+
+class TestMemberDirectory:
+    """Test class for /members/directory"""
+
+    def test_unfiltered(self, client: TestClient, team):
+        """Test facets count every member without filters"""
+        data = client.get("/api/v1/members/directory").json()
+        assert data["total"] == 5
+        assert len(data["items"]) == 5
+        assert data["facets"]["team_type"] == {"Development": 3, "Design": 2}
+        assert data["facets"]["experience"] == {"2": 2, "5": 2, "1": 1}
+
+    def test_facets_ignore_own_filter(self, client: TestClient, team):
+        """Test each facet applies the other filters only"""
+        data = client.get("/api/v1/members/directory?team_type=Development&min_experience=2").json()
+        assert data["total"] == 3
+        assert {m["member_name"] for m in data["items"]} == {"Ana", "Ben", "Cai"}
+        # Team type counts still show Design, restricted by experience only
+        assert data["facets"]["team_type"] == {"Development": 3, "Design": 1}
+        assert data["facets"]["role"] == {"Backend": 2, "Frontend": 1}
+        assert data["facets"]["experience"] == {"2": 2, "5": 1}
+
+    def test_paging_and_fields(self, client: TestClient, team):
+        """Test pages carry a cursor and total stays the full match count"""
+        first = client.get("/api/v1/members/directory?limit=2&fields=member_name").json()
+        assert first["items"] == [{"member_name": "Ana"}, {"member_name": "Ben"}]
+        assert first["total"] == 5
+
+        second = client.get(f"/api/v1/members/directory?limit=2&cursor={first['next_cursor']}").json()
+        assert [m["member_name"] for m in second["items"]] == ["Cai", "Dee"]
+
+    def test_single_grouped_facet_query(self, client: TestClient, team, assert_query_budget):
+        """Test the directory costs a fixed number of queries"""
+        response = client.get("/api/v1/members/directory?role=UI")
+        # Version watermark, page, facets
+        assert assert_query_budget(response, 3) == 3
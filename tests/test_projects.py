@@ -5,6 +5,7 @@ Tests for Project API endpoints
 import pytest
 from fastapi.testclient import TestClient
 from app.models.project import Project
+from app.services.project_service import ProjectService
 
 
 class TestProjectAPI:
@@ -117,3 +118,54 @@ class TestProjectAPI:
         
         data = response.json()
         assert len(data) == 2
+
+    def test_projects_cursor_pagination(self, client: TestClient):
+        """Test walking all projects with X-Next-Cursor"""
+        for i in range(5):
+            client.post("/api/v1/projects/", json={"project_name": f"Project {i}"})
+
+        names = []
+        response = client.get("/api/v1/projects/?limit=2")
+        while True:
+            assert response.status_code == 200
+            names.extend(p["project_name"] for p in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            # Rows created between pages must not shift the remaining pages
+            client.post("/api/v1/projects/", json={"project_name": f"Late {len(names)}"})
+            response = client.get(f"/api/v1/projects/?limit=2&cursor={cursor}")
+
+        assert names[:5] == [f"Project {i}" for i in range(5)]
+        assert len(names) == len(set(names))
+
+    def test_projects_invalid_cursor(self, client: TestClient):
+        """Test a malformed cursor is rejected"""
+        response = client.get("/api/v1/projects/?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+    def test_projects_sparse_fields(self, client: TestClient, sample_project_data):
+        """Test ?fields= returns only the requested fields"""
+        client.post("/api/v1/projects/", json=sample_project_data)
+
+        response = client.get("/api/v1/projects/?fields=project_name,created_at")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert set(data[0]) == {"project_name", "created_at"}
+        assert data[0]["project_name"] == sample_project_data["project_name"]
+
+    def test_projects_sparse_fields_skip_unloaded_columns(self, db_session):
+        """Test columns outside the fieldset are not selected"""
+        db_session.add(Project(project_name="Loaded", description="Not loaded"))
+        db_session.commit()
+        db_session.expunge_all()
+
+        project = ProjectService.get_projects(db_session, fields=["project_name"])[0]
+        assert "description" not in project.__dict__
+        assert project.project_name == "Loaded"
+
+    def test_projects_unknown_field(self, client: TestClient):
+        """Test unknown fields are rejected"""
+        response = client.get("/api/v1/projects/?fields=project_name,password")
+        assert response.status_code == 400
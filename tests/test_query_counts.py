@@ -0,0 +1,141 @@
+"""
+Tests for per-request query counting and detail endpoint query budgets
+"""
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.middleware.query_counter import QueryCounterMiddleware, statement_shape
+from app.models import Project, Member, Blog, Asset, AssetType
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def populated_project(db_session):
+    """A project with several members, blogs and assets linked together"""
+    def build(size: int) -> Project:
+        project = Project(project_name=f"Project with {size}")
+        db_session.add(project)
+        db_session.flush()
+
+        members = [
+            Member(member_name=f"Member {i}", project=project, team_type="Dev", role="Engineer", experience=i)
+            for i in range(size)
+        ]
+        assets = [
+            Asset(filename=f"asset_{size}_{i}", cloudinary_public_id=f"test/{size}/{i}", asset_type=AssetType.IMAGE)
+            for i in range(size)
+        ]
+        blogs = [
+            Blog(title=f"Blog {i}", content="Body", project=project, author=members[i % len(members)])
+            for i in range(size)
+        ]
+        project.assets.extend(assets)
+        for member, blog in zip(members, blogs):
+            member.assets.extend(assets)
+            blog.assets.extend(assets)
+        db_session.add_all(members + assets + blogs)
+        db_session.commit()
+        return project
+
+    return build
+
+
+# Version watermark for the ETag, the detail row, and one SELECT ... IN per collection
+DETAIL_QUERY_BUDGET = 5
+
+
+class TestDetailQueryCounts:
+    """Detail endpoints load their relationships with a constant number of queries"""
+
+    @pytest.mark.parametrize("size", [1, 5])
+    def test_project_detail(self, client: TestClient, populated_project, assert_query_budget, size):
+        project_id = populated_project(size).project_id
+
+        response = client.get(f"/api/v1/projects/{project_id}")
+        assert response.status_code == 200
+        assert len(response.json()["assets"]) == size
+        assert 0 < assert_query_budget(response, DETAIL_QUERY_BUDGET)
+
+    @pytest.mark.parametrize("size", [1, 5])
+    def test_member_detail(self, client: TestClient, populated_project, assert_query_budget, size):
+        member_id = populated_project(size).members[0].member_id
+
+        response = client.get(f"/api/v1/members/{member_id}")
+        assert response.status_code == 200
+        assert response.json()["project"] is not None
+        assert 0 < assert_query_budget(response, DETAIL_QUERY_BUDGET)
+
+    @pytest.mark.parametrize("size", [1, 5])
+    def test_blog_detail(self, client: TestClient, populated_project, assert_query_budget, size):
+        blog_id = populated_project(size).blogs[0].blog_id
+
+        response = client.get(f"/api/v1/blogs/{blog_id}")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["author"] is not None
+        assert len(data["assets"]) == size
+        # Version watermark, then project and author are joined into the blog query
+        assert 0 < assert_query_budget(response, 3)
+
+    @pytest.mark.parametrize("size", [1, 5])
+    def test_asset_detail(self, client: TestClient, populated_project, assert_query_budget, size):
+        asset_id = populated_project(size).assets[0].asset_id
+
+        response = client.get(f"/api/v1/assets/{asset_id}")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["members"]) == size
+        assert 0 < assert_query_budget(response, DETAIL_QUERY_BUDGET)
+
+
+@pytest.fixture
+def counting_app(db_session):
+    """Minimal app running a configurable number of identical queries"""
+    app = FastAPI()
+    app.add_middleware(QueryCounterMiddleware)
+
+    @app.get("/queries/{n}")
+    def run_queries(n: int):
+        with TestingSessionLocal() as db:
+            for project_id in range(n):
+                db.execute(select(Project).where(Project.project_id == project_id)).first()
+        return {"ran": n}
+
+    return TestClient(app)
+
+
+class TestQueryCounterMiddleware:
+    """Test class for QueryCounterMiddleware"""
+
+    def test_headers_report_statements(self, counting_app: TestClient, monkeypatch):
+        """Test X-DB-Queries and X-DB-Time are set in debug mode"""
+        monkeypatch.setattr("app.middleware.query_counter.settings.DEBUG", True)
+        response = counting_app.get("/queries/3")
+        assert response.headers["X-DB-Queries"] == "3"
+        assert float(response.headers["X-DB-Time"]) >= 0
+
+    def test_headers_hidden_outside_debug(self, counting_app: TestClient, monkeypatch):
+        """Test the headers are not exposed in production"""
+        monkeypatch.setattr("app.middleware.query_counter.settings.DEBUG", False)
+        response = counting_app.get("/queries/3")
+        assert "X-DB-Queries" not in response.headers
+
+    def test_repeated_statement_warning(self, counting_app: TestClient, monkeypatch, caplog):
+        """Test a statement repeated past the threshold is reported"""
+        monkeypatch.setattr("app.middleware.query_counter.settings.QUERY_REPEAT_THRESHOLD", 3)
+        with caplog.at_level(logging.WARNING, logger="app.middleware.query_counter"):
+            counting_app.get("/queries/3")
+            assert not caplog.records
+            counting_app.get("/queries/4")
+        assert "Possible N+1 on GET /queries/4" in caplog.text
+
+    def test_statement_shape(self):
+        """Test IN lists and whitespace do not create distinct shapes"""
+        first = statement_shape("SELECT * FROM assets\nWHERE asset_id IN (?, ?)")
+        second = statement_shape("SELECT * FROM assets WHERE asset_id IN (?, ?, ?)")
+        assert first == second == "SELECT * FROM assets WHERE asset_id IN (...)"
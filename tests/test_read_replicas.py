@@ -0,0 +1,125 @@
+"""
+Tests for read-replica routing
+"""
+
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+from app.database import base
+from app.database.base import Base, RoutingSession, READ_YOUR_WRITES_COOKIE
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.models.project import Project
+
+
+def make_request(cookies: str = "") -> Request:
+    headers = [(b"cookie", cookies.encode())] if cookies else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.fixture
+def primary_and_replica():
+    """Two independent in-memory databases standing in for primary and replica"""
+    engines = [
+        create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        for _ in range(2)
+    ]
+    for engine in engines:
+        Base.metadata.create_all(bind=engine)
+    yield engines
+    for engine in engines:
+        Base.metadata.drop_all(bind=engine)
+
+
+class TestRoutingSession:
+    """Test class for RoutingSession binds"""
+
+    def test_reads_go_to_assigned_replica(self, primary_and_replica):
+        """Test queries use the replica in session info"""
+        primary, replica = primary_and_replica
+        with sessionmaker(bind=replica)() as db:
+            db.add(Project(project_name="Replica only"))
+            db.commit()
+
+        Session = sessionmaker(class_=RoutingSession, bind=primary)
+        with Session() as db:
+            assert db.query(Project).count() == 0
+        with Session() as db:
+            db.info["replica"] = replica
+            assert [p.project_name for p in db.query(Project).all()] == ["Replica only"]
+
+    def test_flushes_go_to_primary(self, primary_and_replica):
+        """Test writes from a replica-routed session land on the primary"""
+        primary, replica = primary_and_replica
+        Session = sessionmaker(class_=RoutingSession, bind=primary)
+        with Session() as db:
+            db.info["replica"] = replica
+            db.add(Project(project_name="Written"))
+            db.commit()
+
+        with sessionmaker(bind=primary)() as db:
+            assert db.query(Project).count() == 1
+        with sessionmaker(bind=replica)() as db:
+            assert db.query(Project).count() == 0
+
+
+class TestChooseReplica:
+    """Test class for replica selection"""
+
+    def test_primary_without_replicas(self, monkeypatch):
+        """Test reads use the primary when no replica is configured"""
+        monkeypatch.setattr(base, "replica_engines", [])
+        assert base.choose_replica(make_request()) is None
+
+    def test_round_robin(self, monkeypatch):
+        """Test replicas are used in turn"""
+        monkeypatch.setattr(base, "replica_engines", ["a", "b", "c"])
+        picked = [base.choose_replica(make_request()) for _ in range(6)]
+        assert sorted(picked) == [0, 0, 1, 1, 2, 2]
+        assert picked[:3] == picked[3:]
+
+    def test_read_your_writes_window(self, monkeypatch):
+        """Test a client that just wrote is kept on the primary"""
+        monkeypatch.setattr(base, "replica_engines", ["a", "b"])
+        recent = make_request(f"{READ_YOUR_WRITES_COOKIE}={time.time()}")
+        assert base.choose_replica(recent) is None
+
+        expired = make_request(f"{READ_YOUR_WRITES_COOKIE}={time.time() - 3600}")
+        assert base.choose_replica(expired) is not None
+
+        garbage = make_request(f"{READ_YOUR_WRITES_COOKIE}=not-a-time")
+        assert base.choose_replica(garbage) is not None
+
+
+class TestReadYourWritesCookie:
+    """Test class for the cookie opening the read-your-writes window"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(base, "replica_engines", ["a"])
+        app = FastAPI()
+        app.add_middleware(ReadYourWritesMiddleware)
+
+        @app.api_route("/items", methods=["GET", "POST"])
+        async def items(db=Depends(base.get_db)):
+            # Endpoints returning their own Response still get the cookie
+            return JSONResponse({}, status_code=202)
+
+        return TestClient(app)
+
+    def test_write_sets_cookie(self, client):
+        """Test a write through get_db opens the window"""
+        response = client.post("/items")
+        assert response.status_code == 202
+        assert float(response.cookies[READ_YOUR_WRITES_COOKIE]) <= time.time()
+
+    def test_read_sets_no_cookie(self, client):
+        """Test safe methods leave the window alone"""
+        assert READ_YOUR_WRITES_COOKIE not in client.get("/items").cookies
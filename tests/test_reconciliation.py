@@ -0,0 +1,179 @@
+"""
+Tests for the Cloudinary reconciliation
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models import Asset, AssetDeletion, Project
+from app.services.reconciliation_service import (
+    ReconciliationService,
+    RemoteFile,
+    iter_remote_files,
+    merge_orphans
+)
+from tests.conftest import create_assets
+
+# Before the grace period, of remote files and asset rows alike
+CREATED_AT = datetime.now(timezone.utc) - timedelta(days=1)
+OLD = CREATED_AT.isoformat()
+
+
+class FakeSearch:
+    """Stand-in for cloudinary.Search serving a stored listing page by page"""
+
+    resources = []
+    requests = []
+
+    def __init__(self):
+        self.options = {}
+
+    def expression(self, value):
+        self.options["expression"] = value
+        return self
+
+    def sort_by(self, field, direction):
+        self.options["sort_by"] = (field, direction)
+        return self
+
+    def max_results(self, value):
+        self.options["max_results"] = value
+        return self
+
+    def next_cursor(self, value):
+        self.options["next_cursor"] = value
+        return self
+
+    def execute(self):
+        FakeSearch.requests.append(self.options)
+        folder = self.options["expression"].removeprefix("folder:").removesuffix("*")
+        matching = sorted(
+            (resource for resource in FakeSearch.resources if resource["public_id"].startswith(folder)),
+            key=lambda resource: resource["public_id"]
+        )
+        start = int(self.options.get("next_cursor", 0))
+        end = start + self.options["max_results"]
+        page = {"resources": matching[start:end]}
+        if end < len(matching):
+            page["next_cursor"] = str(end)
+        return page
+
+
+@pytest.fixture
+def fake_search():
+    FakeSearch.resources = []
+    FakeSearch.requests = []
+    return FakeSearch
+
+
+def remote(*public_ids, created_at=OLD, resource_type="image"):
+    return [
+        {"public_id": public_id, "resource_type": resource_type, "created_at": created_at}
+        for public_id in public_ids
+    ]
+
+
+def reconcile(db_session, **options):
+    found = []
+    counts = ReconciliationService.reconcile(
+        db_session, iter_remote_files(page_size=2, search=FakeSearch),
+        report=lambda file, row: found.append(file.public_id if file else row.asset_id),
+        **options
+    )
+    return counts, found
+
+
+class TestReconciliation:
+    """Test class for ReconciliationService"""
+
+    def test_merge(self):
+        """Test the merge yields what only one side has"""
+        files = [RemoteFile(public_id, "image", datetime.now(timezone.utc)) for public_id in ("a", "b", "d")]
+        rows = [Asset(asset_id=i, cloudinary_public_id=public_id) for i, public_id in enumerate(("b", "c", "d", "e"))]
+        assert [
+            (file.public_id if file else None, row.cloudinary_public_id if row else None)
+            for file, row in merge_orphans(files, rows)
+        ] == [("a", None), (None, "c"), (None, "e")]
+
+    def test_unsorted_stream_is_refused(self):
+        """Test an out of order stream raises instead of reporting false orphans"""
+        files = [RemoteFile(public_id, "image", datetime.now(timezone.utc)) for public_id in ("b", "a")]
+        with pytest.raises(ValueError):
+            list(merge_orphans(files, []))
+
+    def test_report(self, db_session, fake_search):
+        """Test orphans on both sides are reported and nothing is changed"""
+        fake_search.resources = remote("pixerse/images/a", "pixerse/images/b", "pixerse/images/c", "pixerse/videos/x")
+        asset_ids = create_assets(
+            db_session, "pixerse/images/b", "pixerse/images/c", "pixerse/images/gone", "other/kept",
+            created_at=CREATED_AT
+        )
+
+        counts, found = reconcile(db_session)
+        assert counts == {"orphaned_files": 2, "missing_files": 1}
+        assert found == ["pixerse/images/a", asset_ids[2], "pixerse/videos/x"]
+        assert db_session.query(Asset).count() == 4
+        assert db_session.query(AssetDeletion).count() == 0
+        # The listing was fetched in pages, sorted by public_id
+        assert len(fake_search.requests) == 2
+        assert fake_search.requests[0]["sort_by"] == ("public_id", "asc")
+        assert fake_search.requests[0]["expression"] == "folder:pixerse/*"
+
+    def test_clean(self, db_session, fake_search):
+        """Test cleaning queues orphaned files and deletes assets without a file, in batches"""
+        fake_search.resources = (
+            remote("pixerse/images/a", "pixerse/images/b") + remote("pixerse/videos/x", resource_type="video")
+        )
+        gone_ids = create_assets(
+            db_session, "pixerse/images/gone_1", "pixerse/images/gone_2", "pixerse/images/gone_3",
+            created_at=CREATED_AT
+        )
+        project = Project(project_name="Linked")
+        project.assets = [db_session.get(Asset, gone_ids[0])]
+        db_session.add(project)
+        db_session.commit()
+
+        counts, _ = reconcile(db_session, clean=True, batch_size=2)
+        assert counts == {"orphaned_files": 3, "missing_files": 3}
+        assert db_session.query(Asset).count() == 0
+        db_session.expire_all()
+        assert db_session.get(Project, project.project_id).assets == []
+        assert sorted(
+            (deletion.public_id, deletion.resource_type) for deletion in db_session.query(AssetDeletion)
+        ) == [("pixerse/images/a", "image"), ("pixerse/images/b", "image"), ("pixerse/videos/x", "video")]
+        assert {deletion.backend for deletion in db_session.query(AssetDeletion)} == {"cloudinary"}
+
+    def test_recent_items_are_left_alone(self, db_session, fake_search):
+        """Test files and assets younger than min_age are not treated as orphans"""
+        fake_search.resources = remote("pixerse/images/new", created_at=datetime.now(timezone.utc).isoformat())
+        db_session.add(Asset(filename="new", cloudinary_public_id="pixerse/images/uploading"))
+        db_session.commit()
+
+        counts, found = reconcile(db_session, clean=True)
+        assert counts == {"orphaned_files": 0, "missing_files": 0}
+        assert found == []
+        assert db_session.query(Asset).count() == 1
+
+    def test_assets_are_paged(self, db_session, fake_search):
+        """Test the asset side is read in keyset pages"""
+        public_ids = [f"pixerse/images/{i:03}" for i in range(25)]
+        fake_search.resources = remote(*public_ids[::2])
+        create_assets(db_session, *public_ids, created_at=CREATED_AT)
+
+        rows = list(ReconciliationService.iter_assets(db_session, page_size=10))
+        assert [row.cloudinary_public_id for row in rows] == public_ids
+        counts, _ = reconcile(db_session)
+        assert counts == {"orphaned_files": 0, "missing_files": 12}
+
+    def test_local_assets_are_ignored(self, db_session, fake_search):
+        """Test files of the local backend are not reported as missing from Cloudinary"""
+        create_assets(db_session, "pixerse/images/local", "pixerse/images/remote", created_at=CREATED_AT)
+        db_session.query(Asset).filter(Asset.cloudinary_public_id == "pixerse/images/local").update(
+            {"storage_backend": "local"}
+        )
+        db_session.commit()
+
+        counts, found = reconcile(db_session, clean=True)
+        assert counts == {"orphaned_files": 0, "missing_files": 1}
+        assert [row.cloudinary_public_id for row in db_session.query(Asset)] == ["pixerse/images/local"]
@@ -0,0 +1,99 @@
+"""
+Tests for the in-memory typeahead index and /search/suggest
+"""
+
+from fastapi.testclient import TestClient
+
+from app.models import Asset, AssetType, Blog, Member, Project
+from app.services.suggest_service import index_keys, suggest_index
+
+
+def seed(db_session):
+    project = Project(project_name="Pixel Garden")
+    db_session.add(project)
+    db_session.commit()
+    member = Member(member_name="Pia Novak", team_type="Design", role="UI", experience=3)
+    db_session.add(member)
+    db_session.commit()
+    db_session.add_all([
+        Blog(project_id=project.project_id, author_id=member.member_id, title="Intro to Pixel Art", content="..."),
+        Asset(filename="pixel_logo.png", cloudinary_public_id="test/pixel_logo", asset_type=AssetType.IMAGE),
+    ])
+    db_session.commit()
+    return project
+
+
+def labels(response):
+    return [(s["entity"], s["label"]) for s in response.json()["suggestions"]]
+
+
+class TestIndexKeys:
+    """Test class for the keys a label is indexed under"""
+
+    def test_word_suffixes(self):
+        """Test every word starts a key"""
+        assert index_keys("Intro to  FastAPI") == ["intro to fastapi", "to fastapi", "fastapi"]
+
+    def test_bounded(self, monkeypatch):
+        """Test keys are capped in number and length"""
+        from app.config import settings
+        monkeypatch.setattr(settings, "SUGGEST_MAX_WORDS", 2)
+        monkeypatch.setattr(settings, "SUGGEST_KEY_LENGTH", 10)
+        assert index_keys("one two three four") == ["one two th", "two th"]
+
+
+class TestSuggest:
+    """Test class for /search/suggest"""
+
+    def test_prefix_across_entities(self, client: TestClient, db_session):
+        """Test label starts rank before later words, case-insensitively"""
+        seed(db_session)
+        response = client.get("/api/v1/search/suggest?q=PI")
+        assert response.status_code == 200
+        assert labels(response) == [
+            ("member", "Pia Novak"),
+            ("project", "Pixel Garden"),
+            ("asset", "pixel_logo.png"),
+            ("blog", "Intro to Pixel Art"),
+        ]
+
+    def test_entity_filter_and_limit(self, client: TestClient, db_session):
+        """Test results can be restricted and capped"""
+        seed(db_session)
+        response = client.get("/api/v1/search/suggest?q=pix&entity=blog&entity=asset&limit=1")
+        assert labels(response) == [("asset", "pixel_logo.png")]
+        assert client.get("/api/v1/search/suggest?q=pix&entity=user").status_code == 422
+
+    def test_label_starts_are_not_crowded_out(self, client: TestClient, db_session):
+        """Test a later-word match sorting first by key does not take the place of a label start"""
+        db_session.add_all([Project(project_name="Zebra Apple"), Project(project_name="Azure")])
+        db_session.commit()
+        assert labels(client.get("/api/v1/search/suggest?q=a&limit=1")) == [("project", "Azure")]
+        assert labels(client.get("/api/v1/search/suggest?q=a&limit=2")) == [
+            ("project", "Azure"), ("project", "Zebra Apple")
+        ]
+
+    def test_lookups_skip_database(self, client: TestClient, db_session, assert_query_budget):
+        """Test only the first call loads the index"""
+        seed(db_session)
+        client.get("/api/v1/search/suggest?q=p")
+        response = client.get("/api/v1/search/suggest?q=pix")
+        assert assert_query_budget(response, 0) == 0
+        assert suggest_index.loads == 4
+
+    def test_incremental_updates(self, client: TestClient, db_session):
+        """Test writes through the API update the index without a full reload"""
+        project = seed(db_session)
+        client.get("/api/v1/search/suggest?q=p")
+
+        client.patch(f"/api/v1/projects/{project.project_id}", json={"project_name": "Quartz Garden"})
+        client.post("/api/v1/projects/", json={"project_name": "Pixie Dust"})
+
+        response = client.get("/api/v1/search/suggest?q=pix&entity=project")
+        assert labels(response) == [("project", "Pixie Dust")]
+        response = client.get("/api/v1/search/suggest?q=garden")
+        assert labels(response) == [("project", "Quartz Garden")]
+
+        client.delete(f"/api/v1/projects/{project.project_id}")
+        assert labels(client.get("/api/v1/search/suggest?q=quartz")) == []
+        assert suggest_index.loads == 4
@@ -0,0 +1,243 @@
+"""
+Tests for queued uploads and the upload workers
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.models import Asset, AssetDeletion, UploadJob, UploadJobStatus
+from app.services.upload_job_service import UploadJobService, UploadWorker
+from tests.conftest import open_testing_db
+
+
+@pytest.fixture(autouse=True)
+def queue_settings(monkeypatch, tmp_path):
+    """Spool into the test's directory, retry after 30s, up to 3 attempts"""
+    monkeypatch.setattr(settings, "UPLOAD_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "UPLOAD_JOB_RETRY_SECONDS", 30)
+    monkeypatch.setattr(settings, "UPLOAD_JOB_MAX_ATTEMPTS", 3)
+
+
+@pytest.fixture
+def worker():
+    return UploadWorker(session_factory=open_testing_db)
+
+
+def make_due(db_session, job_id):
+    """Skip the retry backoff of a job"""
+    db_session.query(UploadJob).filter(UploadJob.job_id == job_id).update({"run_after": None})
+    db_session.commit()
+
+
+class TestUploadJobs:
+    """Test class for POST /assets/upload?async=true and the upload workers"""
+
+    def test_async_upload_is_queued(self, client: TestClient, db_session, fake_cloudinary, tmp_path):
+        """Test the upload is spooled and answered with a job before reaching Cloudinary"""
+        calls = fake_cloudinary.uploads
+        response = client.post(
+            "/api/v1/assets/upload?async=true", files={"file": ("photo.png", b"x" * 50, "image/png")}
+        )
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "QUEUED"
+        assert response.headers["location"] == f"/api/v1/assets/jobs/{job['job_id']}"
+        assert calls == []
+        assert [path.read_bytes() for path in tmp_path.iterdir()] == [b"x" * 50]
+
+        polled = client.get(response.headers["location"])
+        assert polled.status_code == 200
+        assert polled.json()["status"] == "QUEUED"
+
+    def test_unsupported_file_is_refused_upfront(self, client: TestClient, db_session, fake_cloudinary, tmp_path):
+        """Test validation happens before a job is created"""
+        response = client.post(
+            "/api/v1/assets/upload?async=true", files={"file": ("notes.exe", b"x", "application/x-msdownload")}
+        )
+        assert response.status_code == 415
+        assert db_session.query(UploadJob).count() == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_worker_completes_job(self, client: TestClient, db_session, fake_cloudinary, worker, tmp_path):
+        """Test a processed job creates its asset and drops the spooled file"""
+        response = client.post(
+            "/api/v1/assets/upload?async=true", files={"file": ("photo.png", b"x" * 50, "image/png")}
+        )
+        assert asyncio.run(worker.drain()) == 1
+
+        job = client.get(response.headers["location"]).json()
+        assert job["status"] == "DONE"
+        assert job["attempts"] == 1
+        asset = client.get(f"/api/v1/assets/{job['asset_id']}").json()
+        assert asset["cloudinary_public_id"] == "pixerse/images/photo_abc"
+        assert [body for _, body, _ in fake_cloudinary.uploads] == [b"x" * 50]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failed_attempt_is_retried_with_backoff(self, client: TestClient, db_session, fake_cloudinary, worker):
+        """Test a failed attempt is queued again after an exponentially growing delay"""
+        calls = fake_cloudinary.uploads
+        fake_cloudinary.upload_failures = 2
+        response = client.post(
+            "/api/v1/assets/upload?async=true", files={"file": ("photo.png", b"x" * 50, "image/png")}
+        )
+        job_id = response.json()["job_id"]
+
+        before = datetime.now(timezone.utc).replace(tzinfo=None)
+        assert asyncio.run(worker.drain()) == 1
+        db_job = db_session.get(UploadJob, job_id)
+        assert db_job.status == UploadJobStatus.QUEUED
+        assert "Server error" in db_job.error
+        assert db_job.run_after.replace(tzinfo=None) >= before + timedelta(seconds=30)
+        # Not claimable before the backoff has passed
+        assert asyncio.run(worker.drain()) == 0
+
+        make_due(db_session, job_id)
+        asyncio.run(worker.drain())
+        db_session.expire_all()
+        db_job = db_session.get(UploadJob, job_id)
+        assert db_job.attempts == 2
+        assert db_job.run_after.replace(tzinfo=None) >= before + timedelta(seconds=60)
+
+        make_due(db_session, job_id)
+        asyncio.run(worker.drain())
+        db_session.expire_all()
+        db_job = db_session.get(UploadJob, job_id)
+        assert db_job.status == UploadJobStatus.DONE
+        assert db_job.error is None
+        assert len(calls) == 3
+        assert db_session.query(Asset).count() == 1
+
+    def test_job_fails_after_max_attempts(self, client: TestClient, db_session, fake_cloudinary, worker, tmp_path):
+        """Test a job is given up once UPLOAD_JOB_MAX_ATTEMPTS is reached"""
+        fake_cloudinary.upload_failures = 10
+        response = client.post(
+            "/api/v1/assets/upload?async=true", files={"file": ("photo.png", b"x" * 50, "image/png")}
+        )
+        job_id = response.json()["job_id"]
+        for _ in range(3):
+            make_due(db_session, job_id)
+            asyncio.run(worker.drain())
+
+        job = client.get(f"/api/v1/assets/jobs/{job_id}").json()
+        assert job["status"] == "FAILED"
+        assert job["attempts"] == 3
+        assert job["asset_id"] is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_missing_spool_file_fails_permanently(self, client: TestClient, db_session, fake_cloudinary, worker):
+        """Test a job whose spooled file is gone is not retried"""
+        response = client.post(
+            "/api/v1/assets/upload?async=true", files={"file": ("photo.png", b"x" * 50, "image/png")}
+        )
+        job_id = response.json()["job_id"]
+        os.remove(db_session.get(UploadJob, job_id).spool_path)
+
+        asyncio.run(worker.drain())
+        db_session.expire_all()
+        db_job = db_session.get(UploadJob, job_id)
+        assert db_job.status == UploadJobStatus.FAILED
+        assert db_job.attempts == 1
+
+    def test_stale_running_job_is_reclaimed(self, client: TestClient, db_session, fake_cloudinary, worker):
+        """Test a job left RUNNING by a dead worker is picked up again"""
+        response = client.post(
+            "/api/v1/assets/upload?async=true", files={"file": ("photo.png", b"x" * 50, "image/png")}
+        )
+        job_id = response.json()["job_id"]
+        claimed = UploadJobService.claim_next_job(db_session)
+        assert claimed.job_id == job_id
+        assert UploadJobService.claim_next_job(db_session) is None
+
+        stale = datetime.now(timezone.utc) - timedelta(seconds=settings.UPLOAD_JOB_STALE_SECONDS + 1)
+        db_session.query(UploadJob).filter(UploadJob.job_id == job_id).update({"started_at": stale})
+        db_session.commit()
+
+        assert asyncio.run(worker.drain()) == 1
+        db_session.expire_all()
+        db_job = db_session.get(UploadJob, job_id)
+        assert db_job.status == UploadJobStatus.DONE
+        assert db_job.attempts == 2
+
+    def test_exhausted_stale_job_fails(self, client: TestClient, db_session, fake_cloudinary, worker, tmp_path):
+        """Test a job left RUNNING on its last attempt is failed instead of reclaimed"""
+        calls = fake_cloudinary.uploads
+        response = client.post(
+            "/api/v1/assets/upload?async=true", files={"file": ("photo.png", b"x" * 50, "image/png")}
+        )
+        job_id = response.json()["job_id"]
+        UploadJobService.claim_next_job(db_session)
+
+        stale = datetime.now(timezone.utc) - timedelta(seconds=settings.UPLOAD_JOB_STALE_SECONDS + 1)
+        db_session.query(UploadJob).filter(UploadJob.job_id == job_id).update(
+            {"started_at": stale, "attempts": settings.UPLOAD_JOB_MAX_ATTEMPTS}
+        )
+        db_session.commit()
+
+        assert asyncio.run(worker.drain()) == 0
+        db_session.expire_all()
+        db_job = db_session.get(UploadJob, job_id)
+        assert db_job.status == UploadJobStatus.FAILED
+        assert db_job.attempts == settings.UPLOAD_JOB_MAX_ATTEMPTS
+        assert calls == []
+        assert list(tmp_path.iterdir()) == []
+
+    def test_lost_claim_drops_result(self, client: TestClient, db_session, fake_cloudinary, worker, tmp_path):
+        """Test a worker whose job was reclaimed meanwhile neither records its upload nor its failure"""
+        response = client.post(
+            "/api/v1/assets/upload?async=true", files={"file": ("photo.png", b"x" * 50, "image/png")}
+        )
+        job_id = response.json()["job_id"]
+        first = UploadJobService.claim_next_job(db_session)
+        stale = datetime.now(timezone.utc) - timedelta(seconds=settings.UPLOAD_JOB_STALE_SECONDS + 1)
+        db_session.query(UploadJob).filter(UploadJob.job_id == job_id).update({"started_at": stale})
+        db_session.commit()
+        second = UploadJobService.claim_next_job(db_session)
+        assert second.job_id == job_id
+
+        asyncio.run(worker.process(first))
+        db_session.expire_all()
+        db_job = db_session.get(UploadJob, job_id)
+        assert db_job.status == UploadJobStatus.RUNNING
+        assert db_job.asset_id is None
+        assert db_session.query(Asset).count() == 0
+        assert [d.public_id for d in db_session.query(AssetDeletion)] == ["pixerse/images/photo_abc"]
+        assert len(list(tmp_path.iterdir())) == 1
+
+        assert UploadJobService.fail_job(db_session, job_id, first.started_at, first.attempts, "Late") is None
+        db_session.expire_all()
+        assert db_session.get(UploadJob, job_id).error is None
+
+        asyncio.run(worker.process(second))
+        db_session.expire_all()
+        db_job = db_session.get(UploadJob, job_id)
+        assert db_job.status == UploadJobStatus.DONE
+        assert db_session.query(Asset).count() == 1
+        assert list(tmp_path.iterdir()) == []
+
+    def test_identical_jobs_are_uploaded_once(self, client: TestClient, db_session, fake_cloudinary, worker, tmp_path):
+        """Test queued files with the same content share one upload and asset"""
+        calls = fake_cloudinary.uploads
+        locations = [
+            client.post(
+                "/api/v1/assets/upload?async=true", files={"file": (name, b"x" * 50, "image/png")}
+            ).headers["location"]
+            for name in ("logo.png", "logo-copy.png")
+        ]
+        assert asyncio.run(worker.drain()) == 2
+
+        jobs = [client.get(location).json() for location in locations]
+        assert [job["status"] for job in jobs] == ["DONE", "DONE"]
+        assert jobs[0]["asset_id"] == jobs[1]["asset_id"]
+        assert len(calls) == 1
+        assert db_session.query(Asset).count() == 1
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unknown_job(self, client: TestClient, db_session):
+        """Test polling a job that does not exist"""
+        response = client.get("/api/v1/assets/jobs/999")
+        assert response.status_code == 404
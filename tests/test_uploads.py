@@ -0,0 +1,154 @@
+"""
+Tests for streamed uploads and MAX_UPLOAD_SIZE
+"""
+
+import hashlib
+import io
+
+import pytest
+import urllib3
+from cloudinary.exceptions import Error as CloudinaryError
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.models import Asset, AssetDeletion
+from app.services.uploads import HashingReader
+
+
+@pytest.fixture(autouse=True)
+def upload_limits(monkeypatch):
+    """Small limits, so chunked and oversized uploads take a few bytes"""
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 1000)
+    monkeypatch.setattr(settings, "UPLOAD_CHUNKED_THRESHOLD", 100)
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 200)
+
+
+class TestUploads:
+    """Test class for POST /assets/upload"""
+
+    def test_small_upload(self, client: TestClient, db_session, fake_cloudinary):
+        """Test small files are sent as a stream in one request"""
+        response = client.post("/api/v1/assets/upload", files={"file": ("photo.png", b"x" * 50, "image/png")})
+        assert response.status_code == 201
+        assert response.json()["asset"]["cloudinary_public_id"] == "pixerse/images/photo_abc"
+        assert [(kind, body) for kind, body, _ in fake_cloudinary.uploads] == [("upload", b"x" * 50)]
+        assert db_session.query(Asset).count() == 1
+
+    def test_large_upload_is_chunked(self, client: TestClient, db_session, fake_cloudinary):
+        """Test files over UPLOAD_CHUNKED_THRESHOLD use the chunked upload"""
+        response = client.post("/api/v1/assets/upload", files={"file": ("clip.mp4", b"v" * 500, "video/mp4")})
+        assert response.status_code == 201
+        kind, body, options = fake_cloudinary.uploads[0]
+        assert kind == "upload_large"
+        assert len(body) == 500
+        assert options["chunk_size"] == 200
+        assert response.json()["asset"]["asset_type"] == "VIDEO"
+
+    def test_default_sizes_allow_chunked_uploads(self):
+        """Test the shipped defaults send the largest accepted uploads in chunks"""
+        defaults = {name: field.default for name, field in type(settings).model_fields.items()}
+        assert defaults["UPLOAD_CHUNKED_THRESHOLD"] < defaults["MAX_UPLOAD_SIZE"]
+        assert defaults["UPLOAD_CHUNK_SIZE"] >= 5 * 1024 * 1024
+
+    def test_oversized_file(self, client: TestClient, db_session, fake_cloudinary):
+        """Test files over MAX_UPLOAD_SIZE are refused"""
+        response = client.post("/api/v1/assets/upload", files={"file": ("big.png", b"x" * 1001, "image/png")})
+        assert response.status_code == 413
+        assert fake_cloudinary.uploads == []
+
+    def test_oversized_body_stops_streaming(self, client: TestClient, db_session, fake_cloudinary):
+        """Test a body without Content-Length is cut off once it crosses the limit"""
+        def body():
+            yield b"--boundary\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.png\"\r\n\r\n"
+            for _ in range(100):
+                yield b"x" * 10_000
+
+        response = client.post(
+            "/api/v1/assets/upload",
+            content=body(),
+            headers={"Content-Type": "multipart/form-data; boundary=boundary"}
+        )
+        assert response.status_code == 413
+        assert fake_cloudinary.uploads == []
+
+    def test_declared_length_refused_upfront(self, client: TestClient, db_session, fake_cloudinary):
+        """Test a Content-Length over the limit is refused before reading"""
+        response = client.post(
+            "/api/v1/assets/upload",
+            content=b"x" * 200_000,
+            headers={"Content-Type": "multipart/form-data; boundary=boundary"}
+        )
+        assert response.status_code == 413
+
+    def test_unsupported_type(self, client: TestClient, db_session, fake_cloudinary):
+        """Test files assets cannot represent are refused"""
+        response = client.post("/api/v1/assets/upload", files={"file": ("notes.pdf", b"%PDF", "application/pdf")})
+        assert response.status_code == 415
+
+
+class TestUploadDeduplication:
+    """Test class for content-hash deduplication of uploads"""
+
+    def test_identical_file_returns_existing_asset(self, client: TestClient, db_session, fake_cloudinary):
+        """Test a file with known content returns the existing asset and its new copy is deleted"""
+        first = client.post("/api/v1/assets/upload", files={"file": ("logo.png", b"x" * 50, "image/png")})
+        assert first.status_code == 201
+        assert first.json()["asset"]["content_hash"] == hashlib.sha256(b"x" * 50).hexdigest()
+
+        second = client.post("/api/v1/assets/upload", files={"file": ("logo-copy.png", b"x" * 50, "image/png")})
+        assert second.status_code == 200
+        assert second.json()["message"] == "File already uploaded"
+        assert second.json()["asset"]["asset_id"] == first.json()["asset"]["asset_id"]
+        assert db_session.query(Asset).count() == 1
+        deletions = db_session.query(AssetDeletion).all()
+        assert [(d.public_id, d.backend) for d in deletions] == [("pixerse/images/logo-copy_abc", "cloudinary")]
+
+    def test_chunked_upload_is_hashed(self, client: TestClient, db_session, fake_cloudinary):
+        """Test the hash is taken while the SDK reads a chunked upload"""
+        response = client.post("/api/v1/assets/upload", files={"file": ("clip.mp4", b"v" * 500, "video/mp4")})
+        assert response.json()["asset"]["content_hash"] == hashlib.sha256(b"v" * 500).hexdigest()
+
+    def test_reread_bytes_are_hashed_once(self):
+        """Test reading a file again after a seek leaves the hash unchanged"""
+        reader = HashingReader(io.BytesIO(b"abcdef"))
+        reader.read(4)
+        reader.seek(2)
+        reader.read()
+        assert reader.hexdigest() == hashlib.sha256(b"abcdef").hexdigest()
+
+    def test_different_content_is_uploaded(self, client: TestClient, db_session, fake_cloudinary):
+        """Test files differing in content are both stored"""
+        client.post("/api/v1/assets/upload", files={"file": ("a.png", b"x" * 50, "image/png")})
+        response = client.post("/api/v1/assets/upload", files={"file": ("b.png", b"y" * 50, "image/png")})
+        assert response.status_code == 201
+        assert len(fake_cloudinary.uploads) == 2
+
+    def test_refused_file_is_not_matched(self, client: TestClient, db_session, fake_cloudinary):
+        """Test validation still applies to content that was uploaded before"""
+        client.post("/api/v1/assets/upload", files={"file": ("a.png", b"x" * 50, "image/png")})
+        response = client.post("/api/v1/assets/upload", files={"file": ("a.pdf", b"x" * 50, "application/pdf")})
+        assert response.status_code == 415
+
+
+class TestCloudinaryCalls:
+    """Test class for running the blocking SDK off the event loop"""
+
+    def test_upload_runs_in_cloudinary_pool(self, client: TestClient, db_session, fake_cloudinary):
+        """Test SDK calls run in the dedicated pool with the configured timeout"""
+        client.post("/api/v1/assets/upload", files={"file": ("photo.png", b"x", "image/png")})
+        _, _, options = fake_cloudinary.uploads[0]
+        assert options["thread"].startswith("cloudinary")
+        assert options["timeout"] == settings.CLOUDINARY_TIMEOUT_SECONDS
+
+    def test_upload_timeout(self, client: TestClient, db_session, monkeypatch):
+        """Test a Cloudinary timeout answers 504"""
+        def slow_upload(file, **options):
+            try:
+                raise urllib3.exceptions.ReadTimeoutError(None, "/upload", "Read timed out")
+            except urllib3.exceptions.HTTPError as e:
+                raise CloudinaryError(f"Unexpected error - {e!r}")
+
+        monkeypatch.setattr("cloudinary.uploader.upload", slow_upload)
+        response = client.post("/api/v1/assets/upload", files={"file": ("photo.png", b"x", "image/png")})
+        assert response.status_code == 504
+        assert db_session.query(Asset).count() == 0